@@ -4,13 +4,62 @@ import time
 import re
 import json
 import random
-from bs4 import BeautifulSoup
-import cloudscraper  # pip install cloudscraper
+import math
+import heapq
+import queue
+import functools
+import os
+import atexit
+import signal
+import sqlite3
+import gzip
+import codecs
+import array
+import asyncio
+import sys
+import threading
+import bisect
+import logging
+import logging.handlers
+import io
+import hashlib
+import importlib
+import importlib.util
+import subprocess
+import shutil
+import tempfile
+import argparse
+import csv
+import contextlib
+import tracemalloc
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 try:
     import winsound
 except ImportError:
     winsound = None
 
+# Heavy dependencies are imported on first use so short-lived commands start fast:
+#   cloudscraper (pip install cloudscraper) and bs4 (pip install beautifulsoup4) - scraping fallbacks
+#   selectolax, lxml - optional faster scraping parsers
+#   numpy - optional faster price history and batch evaluation
+@functools.lru_cache(maxsize=None)
+def _optional_module(name):
+    """Import a module on first use, returning None when it is not installed"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+def _module_available(name):
+    """Check whether a module is installed without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
 # Configuration - ADD YOUR API KEYS HERE
 API_KEYS = {
     'skinport': None,  # Get from https://skinport.com/api
@@ -60,21 +109,1269 @@ def get_headers():
         'Sec-Fetch-Site': 'cross-site'
     }
 
-# Rate limiting system
+# Leveled logging - messages are only formatted when their level is enabled
+LOGGING_SETTINGS = {
+    'level': 'INFO',   # DEBUG adds raw responses and per-attempt detail
+    'quiet': False,    # Production mode - warnings, errors and deal alerts only
+    'queued': True,    # Format and write records on a background thread
+    'file': None       # Also log to this file, with timestamps
+}
+
+DEAL = 35  # Between WARNING and ERROR, so deal alerts survive quiet mode
+logging.addLevelName(DEAL, 'DEAL')
+
+logger = logging.getLogger('arbitrage')
+logger.propagate = False
+_log_listener = None
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves message formatting to the listener thread"""
+    
+    def prepare(self, record):
+        return record
+
+def stop_logging():
+    """Drain queued records and stop the background log writer"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+def setup_logging(level=None, quiet=None, queued=None, log_file=None):
+    """Configure the bot's logger from LOGGING_SETTINGS, overriding any of them"""
+    global _log_listener
+    quiet = LOGGING_SETTINGS['quiet'] if quiet is None else quiet
+    queued = LOGGING_SETTINGS['queued'] if queued is None else queued
+    log_file = log_file or LOGGING_SETTINGS['file']
+    level = 'WARNING' if quiet else (level or LOGGING_SETTINGS['level'])
+    
+    stop_logging()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(message)s'))
+    handlers = [console]
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(threadName)s] %(message)s'))
+        handlers.append(file_handler)
+    
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    if queued:
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(_DeferredQueueHandler(log_queue))
+        _log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+        _log_listener.start()
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
+
+# Plain synchronous console output until the bot configures logging itself
+setup_logging(queued=False)
+atexit.register(stop_logging)
+
+# Metrics - per-platform request latency and outcomes, exported Prometheus-style
+METRICS_SETTINGS = {
+    'enabled': True,
+    'latency_buckets': (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    'export_path': 'arbitrage_metrics.prom',  # Rewritten at the end of every cycle
+    'http_host': '127.0.0.1',
+    'http_port': None  # Serve the metrics at http://<host>:<port>/metrics when set
+}
+
+METRIC_DEFINITIONS = {
+    'arbitrage_http_request_duration_seconds': ('histogram', 'HTTP request latency by platform'),
+    'arbitrage_http_requests_total': ('counter', 'HTTP requests by platform and status code'),
+    'arbitrage_http_cache_hits_total': ('counter', 'Requests answered from the HTTP cache'),
+    'arbitrage_fetch_duration_seconds': ('histogram', 'Fetcher latency including retries and rate limiting'),
+    'arbitrage_fetch_results_total': ('counter', 'Fetcher calls by outcome'),
+    'arbitrage_retries_total': ('counter', 'Fallback attempts after the first request by platform'),
+    'arbitrage_hedges_total': ('counter', 'Hedged requests started while an earlier one was still running'),
+    'arbitrage_rate_limit_sleep_seconds_total': ('counter', 'Seconds spent waiting on rate limits'),
+    'arbitrage_rate_limit_waits_total': ('counter', 'Requests that had to wait on a rate limit'),
+    'arbitrage_parse_failures_total': ('counter', 'Responses or items that could not be parsed')
+}
+
+_metric_counters = {}
+_metric_histograms = {}
+_metrics_lock = threading.Lock()
+
+def increment_metric(name, amount=1, **labels):
+    """Add to a labelled counter"""
+    if not METRICS_SETTINGS.get('enabled'):
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _metrics_lock:
+        _metric_counters[key] = _metric_counters.get(key, 0) + amount
+
+def observe_metric(name, value, **labels):
+    """Record one observation in a labelled latency histogram"""
+    if not METRICS_SETTINGS.get('enabled'):
+        return
+    key = (name, tuple(sorted(labels.items())))
+    buckets = METRICS_SETTINGS['latency_buckets']
+    with _metrics_lock:
+        histogram = _metric_histograms.get(key)
+        if histogram is None:
+            histogram = {'buckets': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0}
+            _metric_histograms[key] = histogram
+        histogram['buckets'][bisect.bisect_left(buckets, value)] += 1
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+# Errors seen by the current thread's lookup, so "not listed" is not mistaken for a failure
+_request_outcomes = threading.local()
+
+def _note_request_error():
+    """Count a transport, HTTP or decode error against the current thread's lookup"""
+    outcomes = getattr(_request_outcomes, 'current', None)
+    if outcomes is not None:
+        outcomes['errors'] += 1
+
+def record_request_metrics(platform, duration, status):
+    """Record an HTTP request's latency and status code"""
+    # 404 is how several sources say they do not list a skin
+    if status == 'error' or status >= 400 and status != 404:
+        _note_request_error()
+    observe_metric('arbitrage_http_request_duration_seconds', duration, platform=platform)
+    increment_metric('arbitrage_http_requests_total', platform=platform, status=str(status))
+
+def record_retry(platform):
+    """Count a fallback attempt after a platform's first request"""
+    increment_metric('arbitrage_retries_total', platform=platform)
+
+def record_parse_failure(platform):
+    """Count a response or item that could not be parsed"""
+    _note_request_error()
+    increment_metric('arbitrage_parse_failures_total', platform=platform)
+
+def parse_json_response(platform, response):
+    """Decode a JSON response body, counting decode errors as parse failures"""
+    try:
+        return response.json()
+    except ValueError:
+        record_parse_failure(platform)
+        raise
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_SKIPPABLE = ' \t\n\r,'
+_JSON_ELEMENT_ENDS = _JSON_SKIPPABLE + ']'
+
+def iter_json_array(chunks, extract=None):
+    """Yield the elements of a top-level JSON array as byte chunks arrive
+
+    A response that turns out to be an object is decoded whole and handed to extract().
+    """
+    chunks = iter(chunks)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    buffer = ''
+    pos = 0
+    in_array = False
+    
+    for chunk in chunks:
+        buffer = buffer[pos:] + decoder.decode(chunk)
+        pos = 0
+        
+        if not in_array:
+            stripped = buffer.lstrip()
+            if not stripped:
+                continue
+            if stripped[0] != '[':
+                # Not an array - nothing to stream, so fall back to one full decode
+                text = buffer + ''.join(decoder.decode(rest) for rest in chunks) + decoder.decode(b'', final=True)
+                data = json.loads(text)
+                yield from (extract(data) if extract else [data])
+                return
+            pos = len(buffer) - len(stripped) + 1
+            in_array = True
+        
+        while True:
+            while pos < len(buffer) and buffer[pos] in _JSON_SKIPPABLE:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == ']':
+                return
+            
+            try:
+                item, end = _JSON_DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Element continues in the next chunk
+            if not isinstance(item, (dict, list, str)) and (end == len(buffer) or buffer[end] not in _JSON_ELEMENT_ENDS):
+                break  # A bare number or literal may still be cut short, as in "-4500." + "0"
+            
+            yield item
+            pos = end
+    
+    raise ValueError("JSON array ended before its closing bracket")
+
+def iter_json_response_items(platform, response, chunk_size=65536, extract=None):
+    """Stream the items of a JSON array response, counting decode errors as parse failures"""
+    try:
+        yield from iter_json_array(response.iter_content(chunk_size), extract)
+    except ValueError:
+        record_parse_failure(platform)
+        raise
+    finally:
+        response.close()
+
+def instrument_fetcher(func):
+    """Decorator recording a fetcher's latency and whether it returned anything"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = func(*args, **kwargs)
+            outcome = 'ok' if result else 'empty'
+            return result
+        finally:
+            observe_metric('arbitrage_fetch_duration_seconds', time.perf_counter() - start, fetcher=func.__name__)
+            increment_metric('arbitrage_fetch_results_total', fetcher=func.__name__, outcome=outcome)
+    return wrapper
+
+def _format_metric_labels(labels):
+    """Prometheus label set for a sorted label tuple"""
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+def render_metrics():
+    """Every metric in the Prometheus text exposition format"""
+    with _metrics_lock:
+        counters = sorted(_metric_counters.items())
+        histograms = sorted((key, dict(value, buckets=list(value['buckets']))) for key, value in _metric_histograms.items())
+    
+    bounds = [str(bound) for bound in METRICS_SETTINGS['latency_buckets']] + ['+Inf']
+    lines = []
+    for name, (kind, help_text) in METRIC_DEFINITIONS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        
+        if kind == 'counter':
+            for (metric, labels), value in counters:
+                if metric == name:
+                    lines.append(f"{name}{_format_metric_labels(labels)} {value}")
+            continue
+        
+        for (metric, labels), histogram in histograms:
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(bounds, histogram['buckets']):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_metric_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_metric_labels(labels)} {histogram['sum']:.6f}")
+            lines.append(f"{name}_count{_format_metric_labels(labels)} {histogram['count']}")
+    
+    return '\n'.join(lines) + '\n'
+
+def write_metrics_file(path=None):
+    """Write the current metrics to a text file, atomically"""
+    path = path or METRICS_SETTINGS['export_path']
+    if not METRICS_SETTINGS.get('enabled') or not path:
+        return
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(render_metrics())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("⚠️ Could not write metrics: %s", e)
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves render_metrics() at /metrics"""
+    
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_metrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+_metrics_server = None
+
+def start_metrics_server(port=None):
+    """Start the /metrics endpoint in a background thread when a port is configured"""
+    global _metrics_server
+    port = port or METRICS_SETTINGS['http_port']
+    if _metrics_server is not None or not port:
+        return _metrics_server
+    
+    try:
+        _metrics_server = ThreadingHTTPServer((METRICS_SETTINGS['http_host'], port), _MetricsRequestHandler)
+    except OSError as e:
+        logger.warning("⚠️ Could not start metrics server on port %s: %s", port, e)
+        return None
+    
+    threading.Thread(target=_metrics_server.serve_forever, daemon=True).start()
+    logger.info("📈 Metrics at http://%s:%s/metrics", METRICS_SETTINGS['http_host'], port)
+    return _metrics_server
+
+def display_metrics_summary():
+    """Show which platforms the request and rate-limit time went to"""
+    with _metrics_lock:
+        request_time = {dict(labels)['platform']: (hist['sum'], hist['count'])
+                        for (name, labels), hist in _metric_histograms.items()
+                        if name == 'arbitrage_http_request_duration_seconds'}
+        sleep_time = {dict(labels)['platform']: value
+                      for (name, labels), value in _metric_counters.items()
+                      if name == 'arbitrage_rate_limit_sleep_seconds_total'}
+    
+    if not request_time and not sleep_time:
+        return
+    
+    print("⏱️ Time by platform:")
+    platforms = set(request_time) | set(sleep_time)
+    for platform in sorted(platforms, key=lambda p: -(request_time.get(p, (0, 0))[0] + sleep_time.get(p, 0))):
+        total, count = request_time.get(platform, (0.0, 0))
+        mean_ms = total / count * 1000 if count else 0
+        print(f"   {platform:<14} {total:7.1f}s in {count} requests ({mean_ms:.0f} ms avg), "
+              f"{sleep_time.get(platform, 0):.1f}s rate limited")
+
+# Concurrent execution settings
+CONCURRENCY_SETTINGS = {
+    'enabled': True,   # Query all listing platforms for a skin at the same time
+    'max_workers': 4   # Worker threads used for the per-skin platform fan-out
+}
+
+# Rate limiting system - token bucket per platform
+RATE_LIMIT_SETTINGS = {
+    'enabled': True,
+    'jitter': (0.5, 1.5),  # Random extra wait (seconds) when a caller has to queue
+    'default_interval': 2.0,  # Seconds between requests to platforms not listed below
+    'intervals': {            # Seconds between requests, per platform
+        'steam': 2.0,
+        'steam_simple': 3.0,
+        'steamapis': 2.0,
+        'steamlytics': 3.0,
+        'pricempire': 2.0,
+        'csgostash': 2.0,
+        'buff163': 3.0,
+        'buff163_scraping': 5.0,
+        'skinport': 3.0,
+        'skinport_catalogue': 10.0,  # Conservative - the catalogue is one large download
+        'skinport_web': 5.0,
+        'csfloat': 2.0,
+        'bitskins': 2.0,
+        'dmarket': 2.0
+    },
+    'bursts': {            # Requests a platform may send back to back (default 1)
+        'csfloat': 2,
+        'dmarket': 2,
+        'bitskins': 2
+    }
+}
+
 last_request_times = {}
+_rate_limit_buckets = {}
+_rate_limit_lock = threading.Lock()
+
+def get_rate_limit_interval(platform):
+    """Seconds between requests to a platform, from RATE_LIMIT_SETTINGS"""
+    return RATE_LIMIT_SETTINGS['intervals'].get(platform, RATE_LIMIT_SETTINGS['default_interval'])
+
+def _reserve_rate_limit_slot(platform, burst=None):
+    """Take a token from the platform's bucket and return the seconds until it is usable"""
+    min_delay = get_rate_limit_interval(platform)
+    if not RATE_LIMIT_SETTINGS.get('enabled') or min_delay <= 0:
+        return 0.0
+    
+    capacity = burst or RATE_LIMIT_SETTINGS['bursts'].get(platform, 1)
+    refill_rate = 1.0 / min_delay
+    
+    # Only the bookkeeping happens under the lock - callers sleep outside it,
+    # so a queue on one platform never blocks another
+    with _rate_limit_lock:
+        now = time.monotonic()
+        bucket = _rate_limit_buckets.get(platform)
+        if bucket is None:
+            bucket = {'tokens': float(capacity), 'updated': now}
+            _rate_limit_buckets[platform] = bucket
+        else:
+            elapsed = now - bucket['updated']
+            bucket['tokens'] = min(float(capacity), bucket['tokens'] + elapsed * refill_rate)
+            bucket['updated'] = now
+        
+        bucket['capacity'] = capacity
+        bucket['refill_rate'] = refill_rate
+        
+        # Negative tokens are slots already promised to earlier callers
+        bucket['tokens'] -= 1
+        wait = -bucket['tokens'] / refill_rate if bucket['tokens'] < 0 else 0.0
+        last_request_times[platform] = time.time() + wait
+    
+    return wait
+
+def _rate_limit_sleep_time(platform, burst=None):
+    """Reserve a slot and add jitter when the caller has to wait for it"""
+    wait = _reserve_rate_limit_slot(platform, burst)
+    if wait <= 0:
+        return 0.0
+    
+    sleep_time = wait + random.uniform(*RATE_LIMIT_SETTINGS['jitter'])
+    logger.info("    ⏳ Rate limiting %s: waiting %.1fs", platform, sleep_time)
+    increment_metric('arbitrage_rate_limit_sleep_seconds_total', sleep_time, platform=platform)
+    increment_metric('arbitrage_rate_limit_waits_total', platform=platform)
+    return sleep_time
+
+def rate_limit_request(platform, burst=None):
+    """Rate limit requests to avoid getting blocked, at the platform's configured interval"""
+    sleep_time = _rate_limit_sleep_time(platform, burst)
+    if sleep_time:
+        _fetch_sleep(sleep_time)
+
+# Cancellation context for fetchers running on the asyncio engine
+class FetchCancelled(requests.exceptions.RequestException):
+    """Raised inside a fetcher once its async task was cancelled or timed out"""
 
-def rate_limit_request(platform, min_delay=2.0):
-    """Rate limit requests to avoid getting blocked"""
-    current_time = time.time()
-    last_time = last_request_times.get(platform, 0)
-    elapsed = current_time - last_time
+_fetch_context = threading.local()
+
+def _check_fetch_cancelled():
+    """Stop the current fetch if its async task has been cancelled"""
+    cancel_event = getattr(_fetch_context, 'cancel_event', None)
+    if cancel_event is not None and cancel_event.is_set():
+        raise FetchCancelled("fetch cancelled")
+
+def _request_timeout(timeout):
+    """Clamp a request timeout to the deadline of the current async fetch"""
+    _check_fetch_cancelled()
+    deadline = getattr(_fetch_context, 'deadline', None)
+    if deadline is None:
+        return timeout
     
-    if elapsed < min_delay:
-        sleep_time = min_delay - elapsed + random.uniform(0.5, 1.5)
-        print(f"    ⏳ Rate limiting {platform}: waiting {sleep_time:.1f}s")
-        time.sleep(sleep_time)
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise FetchCancelled("fetch deadline exceeded")
+    return min(timeout, remaining) if timeout else remaining
+
+def _fetch_sleep(seconds):
+    """Sleep, waking up early if the current async fetch is cancelled or runs out of time"""
+    deadline = getattr(_fetch_context, 'deadline', None)
+    if deadline is not None and time.monotonic() + seconds > deadline:
+        # Waiting past the deadline would only delay the inevitable cancellation
+        seconds = max(0.0, deadline - time.monotonic())
+    else:
+        deadline = None
     
-    last_request_times[platform] = time.time()
+    cancel_event = getattr(_fetch_context, 'cancel_event', None)
+    if cancel_event is None:
+        time.sleep(seconds)
+    elif cancel_event.wait(seconds):
+        raise FetchCancelled("fetch cancelled")
+    if deadline is not None:
+        raise FetchCancelled("fetch deadline exceeded")
+
+# Hedged requests for fallback chains
+HEDGE_SETTINGS = {
+    'enabled': True,
+    'delay': 3.0,     # Seconds to wait on a candidate before also starting the next one
+    'max_workers': 16  # Candidates running at once across every hedged chain
+}
+
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+def _get_hedge_executor():
+    """Get the worker pool shared by all hedged chains"""
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=HEDGE_SETTINGS['max_workers'],
+                thread_name_prefix='hedge'
+            )
+        return _hedge_executor
+
+def _run_hedge_candidate(index, candidate, results, cancel_event, deadline):
+    """Run one candidate of a hedged chain and report its result"""
+    # A candidate queued behind a busy pool may already have lost
+    if cancel_event.is_set():
+        results.put((index, None))
+        return
+    
+    _fetch_context.cancel_event = cancel_event
+    _fetch_context.deadline = deadline
+    _fetch_context.hedging = True
+    try:
+        result = candidate()
+    except FetchCancelled:
+        result = None
+    except Exception as e:
+        logger.debug("    Hedged candidate %s error: %s", index + 1, e)
+        result = None
+    finally:
+        _fetch_context.cancel_event = None
+        _fetch_context.deadline = None
+        _fetch_context.hedging = False
+    results.put((index, result))
+
+def hedged_first(candidates, delay=None, is_valid=bool, platform=None):
+    """Return the first valid result, starting the next candidate whenever the current one is slow"""
+    if delay is None:
+        delay = HEDGE_SETTINGS['delay']
+    
+    parent_cancel = getattr(_fetch_context, 'cancel_event', None)
+    deadline = getattr(_fetch_context, 'deadline', None)
+    results = queue.Queue()
+    cancel_events = []
+    
+    def start_next():
+        cancel_event = threading.Event()
+        cancel_events.append(cancel_event)
+        _get_hedge_executor().submit(
+            _run_hedge_candidate,
+            len(cancel_events) - 1, candidates[len(cancel_events) - 1], results, cancel_event, deadline
+        )
+    
+    winner = None
+    finished = 0
+    start_next()
+    hedge_at = time.monotonic() + delay
+    
+    try:
+        while finished < len(cancel_events):
+            if parent_cancel is not None and parent_cancel.is_set():
+                raise FetchCancelled("fetch cancelled")
+            
+            # Wake up to hedge, or at least every half second to notice cancellation
+            wait = 0.5
+            if len(cancel_events) < len(candidates):
+                wait = min(wait, max(0.0, hedge_at - time.monotonic()))
+            
+            try:
+                _, result = results.get(timeout=wait)
+            except queue.Empty:
+                if len(cancel_events) < len(candidates) and time.monotonic() >= hedge_at:
+                    if platform:
+                        increment_metric('arbitrage_hedges_total', platform=platform)
+                    start_next()
+                    hedge_at = time.monotonic() + delay
+                continue
+            
+            finished += 1
+            if is_valid(result):
+                winner = result
+                break
+            
+            # A fast miss moves straight on to the next candidate
+            if len(cancel_events) < len(candidates):
+                if platform:
+                    record_retry(platform)
+                start_next()
+                hedge_at = time.monotonic() + delay
+    finally:
+        # Losers stop at their next request, sleep or rate limit check
+        for cancel_event in cancel_events:
+            cancel_event.set()
+    
+    return winner
+
+def run_fallback_chain(candidates, is_valid=bool, platform=None):
+    """Try candidates in order until one is valid, hedging slow ones when enabled
+
+    Moving on after a failed candidate counts as a retry for platform, starting one
+    early because the previous is slow counts as a hedge.
+    """
+    # Chains nested inside a hedge candidate run in place, so they never wait on the pool they occupy
+    if HEDGE_SETTINGS.get('enabled') and len(candidates) > 1 and not getattr(_fetch_context, 'hedging', False):
+        return hedged_first(candidates, is_valid=is_valid, platform=platform)
+    
+    for attempt, candidate in enumerate(candidates):
+        if attempt and platform:
+            record_retry(platform)
+        result = candidate()
+        if is_valid(result):
+            return result
+    return None
+
+# Pooled HTTP sessions, one per platform
+HTTP_POOL_SETTINGS = {
+    'pool_connections': 4,   # Distinct hosts kept per platform session
+    'pool_maxsize': 10,      # Keep-alive connections kept per host
+    'platform_pool_sizes': {
+        'skinport': 4,
+        'status': 2
+    }
+}
+
+_http_sessions = {}
+_http_sessions_lock = threading.Lock()
+
+# Transport adapter mounted on every new session instead of the network (offline benchmarks)
+_transport_override = None
+
+def _mount_transport_override(session):
+    """Route a session through the transport override when one is installed"""
+    if _transport_override is not None:
+        session.mount('https://', _transport_override)
+        session.mount('http://', _transport_override)
+
+def get_http_session(platform):
+    """Get the shared keep-alive session for a platform"""
+    with _http_sessions_lock:
+        session = _http_sessions.get(platform)
+        if session is None:
+            pool_maxsize = HTTP_POOL_SETTINGS['platform_pool_sizes'].get(
+                platform, HTTP_POOL_SETTINGS['pool_maxsize']
+            )
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=HTTP_POOL_SETTINGS['pool_connections'],
+                pool_maxsize=pool_maxsize
+            )
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _mount_transport_override(session)
+            _http_sessions[platform] = session
+        return session
+
+# HTTP response cache with ETag / Last-Modified revalidation
+HTTP_CACHE_SETTINGS = {
+    'enabled': True,
+    'max_entries': 2000,               # Least recently used responses are dropped beyond this
+    'max_bytes': 64 * 1024 * 1024,     # ...or once their bodies add up to more than this
+    'max_entry_bytes': 4 * 1024 * 1024  # Larger bodies are never cached
+}
+
+_http_response_cache = OrderedDict()
+_http_cache_size = {'bytes': 0}
+_http_response_cache_lock = threading.Lock()
+
+class CachedResponse:
+    """Stands in for a requests.Response when the body comes from the HTTP cache"""
+    __slots__ = ('status_code', 'url', 'headers', '_entry')
+    
+    from_cache = True
+    
+    def __init__(self, url, entry):
+        self.status_code = 200
+        self.url = url
+        self.headers = entry['headers']
+        self._entry = entry
+    
+    @property
+    def content(self):
+        return self._entry['content']
+    
+    @property
+    def text(self):
+        return self._entry['content'].decode(self._entry['encoding'] or 'utf-8', errors='replace')
+    
+    def json(self):
+        # Only the body is cached, so every hit gets its own parsed copy
+        return json.loads(self.text)
+    
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        content = self._entry['content']
+        chunk_size = chunk_size or len(content) or 1
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+    
+    def close(self):
+        pass
+
+def _http_cache_key(url, params):
+    """Cache key for a GET request"""
+    if isinstance(params, dict):
+        params = sorted((str(k), str(v)) for k, v in params.items())
+    return url, repr(params)
+
+def _cache_freshness(headers):
+    """Seconds a response may be served without revalidation, or None if it must not be stored"""
+    cache_control = headers.get('Cache-Control', '').lower()
+    if 'no-store' in cache_control:
+        return None
+    if 'no-cache' in cache_control:
+        return 0
+    
+    match = re.search(r'max-age=(\d+)', cache_control)
+    if not match:
+        return 0
+    
+    try:
+        age = int(headers.get('Age', 0))
+    except ValueError:
+        age = 0
+    return max(0, int(match.group(1)) - age)
+
+def _store_http_response(key, response):
+    """Remember a 200 response that carries validators or a max-age"""
+    freshness = _cache_freshness(response.headers)
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if freshness is None or not (etag or last_modified or freshness):
+        return
+    if len(response.content) > HTTP_CACHE_SETTINGS['max_entry_bytes']:
+        return
+    
+    entry = {
+        'content': response.content,
+        'encoding': response.encoding,
+        'headers': dict(response.headers),
+        'etag': etag,
+        'last_modified': last_modified,
+        'expires_at': time.time() + freshness
+    }
+    with _http_response_cache_lock:
+        previous = _http_response_cache.pop(key, None)
+        if previous is not None:
+            _http_cache_size['bytes'] -= len(previous['content'])
+        _http_response_cache[key] = entry
+        _http_cache_size['bytes'] += len(entry['content'])
+        while (len(_http_response_cache) > HTTP_CACHE_SETTINGS['max_entries'] or
+               _http_cache_size['bytes'] > HTTP_CACHE_SETTINGS['max_bytes']):
+            _, evicted = _http_response_cache.popitem(last=False)
+            _http_cache_size['bytes'] -= len(evicted['content'])
+
+def clear_http_cache():
+    """Forget every cached HTTP response"""
+    with _http_response_cache_lock:
+        _http_response_cache.clear()
+        _http_cache_size['bytes'] = 0
+
+def _timed_get(platform, session, url, **kwargs):
+    """GET through a session, recording latency and status for the platform"""
+    start = time.perf_counter()
+    try:
+        response = session.get(url, **kwargs)
+    except requests.exceptions.RequestException:
+        record_request_metrics(platform, time.perf_counter() - start, 'error')
+        raise
+    record_request_metrics(platform, time.perf_counter() - start, response.status_code)
+    return response
+
+def http_get(platform, url, **kwargs):
+    """GET a URL through the platform's pooled session, revalidating cached responses"""
+    kwargs['timeout'] = _request_timeout(kwargs.get('timeout'))
+    session = get_http_session(platform)
+    
+    if not HTTP_CACHE_SETTINGS.get('enabled') or kwargs.get('stream'):
+        return _timed_get(platform, session, url, **kwargs)
+    
+    key = _http_cache_key(url, kwargs.get('params'))
+    with _http_response_cache_lock:
+        entry = _http_response_cache.get(key)
+        if entry is not None:
+            _http_response_cache.move_to_end(key)
+    
+    if entry is not None:
+        # Still fresh under max-age - no request needed at all
+        if entry['expires_at'] > time.time():
+            increment_metric('arbitrage_http_cache_hits_total', platform=platform, kind='fresh')
+            return CachedResponse(url, entry)
+        
+        headers = dict(kwargs.get('headers') or {})
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        kwargs['headers'] = headers
+    
+    response = _timed_get(platform, session, url, **kwargs)
+    
+    if response.status_code == 304 and entry is not None:
+        freshness = _cache_freshness(response.headers)
+        entry['expires_at'] = time.time() + (freshness or 0)
+        increment_metric('arbitrage_http_cache_hits_total', platform=platform, kind='revalidated')
+        return CachedResponse(url, entry)
+    
+    if response.status_code == 200:
+        _store_http_response(key, response)
+    
+    return response
+
+def close_http_sessions():
+    """Close every pooled session and its connections"""
+    with _http_sessions_lock:
+        for session in _http_sessions.values():
+            session.close()
+        _http_sessions.clear()
+
+# Long-lived CloudFlare scrapers, one per host
+SCRAPER_SETTINGS = {
+    'browser': {'browser': 'chrome', 'platform': 'windows', 'mobile': False},
+    'invalidate_statuses': (403, 429, 503),  # Responses that mean the session is burnt
+    'platforms': {'buff.163.com': 'buff163', 'skinport.com': 'skinport'}  # Metric label for each host
+}
+
+_cloudscrapers = {}
+_cloudscraper_users = {}       # scraper -> requests currently using it
+_retired_cloudscrapers = set()  # Invalidated scrapers closed once their last request finishes
+_cloudscrapers_lock = threading.Lock()
+
+def get_cloudscraper(host, acquire=False):
+    """Get the shared cloudscraper session for a host, creating it on first use
+
+    With acquire=True the caller must hand it back through release_cloudscraper().
+    """
+    with _cloudscrapers_lock:
+        scraper = _cloudscrapers.get(host)
+        if scraper is None:
+            cloudscraper = _optional_module('cloudscraper')
+            if cloudscraper is None:
+                raise ImportError("cloudscraper is required for scraping fallbacks (pip install cloudscraper)")
+            scraper = cloudscraper.create_scraper(browser=SCRAPER_SETTINGS['browser'])
+            _mount_transport_override(scraper)
+            _cloudscrapers[host] = scraper
+        if acquire:
+            _cloudscraper_users[scraper] = _cloudscraper_users.get(scraper, 0) + 1
+        return scraper
+
+def release_cloudscraper(scraper):
+    """Finish using a scraper, closing it if it was invalidated in the meantime"""
+    with _cloudscrapers_lock:
+        users = _cloudscraper_users.get(scraper, 0) - 1
+        if users > 0:
+            _cloudscraper_users[scraper] = users
+            return
+        _cloudscraper_users.pop(scraper, None)
+        if scraper not in _retired_cloudscrapers:
+            return
+        _retired_cloudscrapers.discard(scraper)
+    scraper.close()
+
+def invalidate_cloudscraper(host):
+    """Throw away a host's scraper so the next request solves a fresh challenge"""
+    with _cloudscrapers_lock:
+        scraper = _cloudscrapers.pop(host, None)
+        # Requests still running on it, such as a losing hedge, close it when they finish
+        if scraper is not None and _cloudscraper_users.get(scraper):
+            _retired_cloudscrapers.add(scraper)
+            scraper = None
+    if scraper is not None:
+        scraper.close()
+
+def close_cloudscrapers():
+    """Close every host's scraper"""
+    for host in list(_cloudscrapers):
+        invalidate_cloudscraper(host)
+
+def scraper_get(host, url, **kwargs):
+    """GET a page through the host's scraper, dropping it when it starts failing"""
+    kwargs['timeout'] = _request_timeout(kwargs.get('timeout'))
+    # Labelled like http_get so a platform's API and scraped requests add up
+    platform = SCRAPER_SETTINGS['platforms'].get(host, host)
+    scraper = get_cloudscraper(host, acquire=True)
+    start = time.perf_counter()
+    try:
+        response = scraper.get(url, **kwargs)
+    except Exception:
+        record_request_metrics(platform, time.perf_counter() - start, 'error')
+        invalidate_cloudscraper(host)
+        raise
+    finally:
+        release_cloudscraper(scraper)
+    record_request_metrics(platform, time.perf_counter() - start, response.status_code)
+    
+    if response.status_code in SCRAPER_SETTINGS['invalidate_statuses']:
+        logger.warning("    ⚠️ %s scraper got HTTP %s, resetting session", host, response.status_code)
+        invalidate_cloudscraper(host)
+    
+    return response
+
+# Scraping parser backends - the fastest installed one is picked automatically
+HTML_PARSER_SETTINGS = {
+    'backend': 'auto',  # auto, selectolax, lxml, stream or bs4
+    'chunk_size': 16384,  # Bytes fed to the streaming parsers at a time
+    'fixture_dir': os.path.join('fixtures', 'html'),
+    'save_fixtures': False  # Save every scraped page into fixture_dir for benchmarking
+}
+
+HTML_NODE_LIMITS = {
+    'buff163': 3,  # Price nodes checked on a Buff163 search page
+    'skinport': 5  # Item cards read from a Skinport search page
+}
+
+_PRICE_CLASS_RE = re.compile(r'price|cost', re.I)
+_CARD_CLASS_RE = re.compile(r'item|card|listing', re.I)
+_WEAR_CLASS_RE = re.compile(r'wear|condition', re.I)
+_DOLLAR_TEXT_RE = re.compile(r'\$\d+', re.I)
+_FLOAT_TEXT_RE = re.compile(r'float|wear', re.I)
+_CNY_PRICE_RE = re.compile(r'¥(\d+\.?\d*)')
+_USD_PRICE_RE = re.compile(r'\$(\d+\.?\d*)')
+
+_CLASSED_NODE_SELECTOR = '[class]'
+_VOID_TAGS = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                        'link', 'meta', 'param', 'source', 'track', 'wbr'))
+
+class _ParseLimitReached(Exception):
+    """Raised inside a streaming parser once enough nodes have been collected"""
+
+class _PriceNodeCollector:
+    """Collect Buff163 price texts or Skinport cards from start/end/data parser events"""
+    
+    def __init__(self, mode, limit):
+        self.mode = mode
+        self.limit = limit
+        self.results = []
+        self._pending = 0
+        self._stack = []
+        self._collecting = []
+        self._open_cards = []
+    
+    def start(self, tag, attrs):
+        tag = tag.lower()
+        if self._stack:
+            self._stack[-1]['children'] += 1
+        if tag in _VOID_TAGS:
+            return
+        
+        classes = attrs.get('class') or ''
+        frame = {'tag': tag, 'text': None, 'children': 0, 'card': None, 'result': False}
+        
+        if self.mode == 'buff163':
+            if tag in ('span', 'div') and len(self.results) < self.limit and _PRICE_CLASS_RE.search(classes):
+                frame['text'] = []
+                frame['result'] = True
+                self.results.append(frame)
+                self._pending += 1
+        else:
+            if tag in ('span', 'div') and self._open_cards:
+                frame['text'] = []
+                if _WEAR_CLASS_RE.search(classes):
+                    for card in self._open_cards:
+                        if card['wear'] is None:
+                            card['wear'] = frame
+            
+            if tag in ('div', 'a') and len(self.results) < self.limit and _CARD_CLASS_RE.search(classes):
+                card = {'href': attrs.get('href'), 'price': None, 'float': None, 'wear': None}
+                frame['card'] = card
+                frame['result'] = True
+                self.results.append(card)
+                self._open_cards.append(card)
+                self._pending += 1
+        
+        if frame['text'] is not None:
+            self._collecting.append(frame)
+        self._stack.append(frame)
+    
+    def end(self, tag):
+        tag = tag.lower()
+        if tag in _VOID_TAGS:
+            return
+        
+        # Close everything down to the matching tag, like a browser would
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index]['tag'] == tag:
+                break
+        else:
+            return
+        
+        while len(self._stack) > index:
+            self._close(self._stack.pop())
+        
+        if self._pending == 0 and len(self.results) >= self.limit:
+            raise _ParseLimitReached()
+    
+    def data(self, text):
+        piece = text.strip()
+        if piece:
+            for frame in self._collecting:
+                frame['text'].append(piece)
+    
+    def close(self):
+        # Elements still open at the end of the page close implicitly
+        while self._stack:
+            self._close(self._stack.pop())
+        return self.results
+    
+    def _close(self, frame):
+        if frame['text'] is not None:
+            self._collecting.remove(frame)
+        if frame['result']:
+            self._pending -= 1
+        if frame['card'] is not None:
+            self._open_cards.remove(frame['card'])
+        
+        # Leaf nodes stand in for BeautifulSoup's string= matches
+        if self.mode == 'skinport' and frame['text'] is not None and frame['children'] == 0:
+            text = ''.join(frame['text'])
+            for card in self._open_cards:
+                if card['price'] is None and _DOLLAR_TEXT_RE.search(text):
+                    card['price'] = text
+                if card['float'] is None and _FLOAT_TEXT_RE.search(text):
+                    card['float'] = text
+    
+    def extracted(self):
+        """Results in the shape returned by every parser backend"""
+        if self.mode == 'buff163':
+            return [''.join(frame['text']) for frame in self.results]
+        
+        return [{
+            'href': card['href'],
+            'price': card['price'],
+            'float': card['float'],
+            'wear': ''.join(card['wear']['text']) if card['wear'] else None
+        } for card in self.results]
+
+class _StreamingHTMLParser(HTMLParser):
+    """Standard library tokenizer feeding a _PriceNodeCollector"""
+    
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+    
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+    
+    def handle_startendtag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+        self.collector.end(tag)
+    
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+    
+    def handle_data(self, data):
+        self.collector.data(data)
+
+def _feed_in_chunks(parser, html):
+    """Feed a page to an incremental parser, stopping early once the collector is full"""
+    chunk_size = HTML_PARSER_SETTINGS['chunk_size']
+    try:
+        for start in range(0, len(html), chunk_size):
+            parser.feed(html[start:start + chunk_size])
+        parser.close()
+    except _ParseLimitReached:
+        pass
+
+def _stream_extract(html, mode, limit):
+    """Extract nodes with the standard library streaming parser"""
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    collector = _PriceNodeCollector(mode, limit)
+    _feed_in_chunks(_StreamingHTMLParser(collector), html)
+    collector.close()
+    return collector.extracted()
+
+def _lxml_extract(html, mode, limit):
+    """Extract nodes with lxml's incremental parser driving the same collector"""
+    collector = _PriceNodeCollector(mode, limit)
+    encoding = 'utf-8' if isinstance(html, bytes) else None
+    _feed_in_chunks(_optional_module('lxml.etree').HTMLParser(target=collector, encoding=encoding), html)
+    return collector.extracted()
+
+def _selectolax_descendants(node):
+    """Element descendants of a selectolax node in document order"""
+    for child in node.iter():
+        yield child
+        yield from _selectolax_descendants(child)
+
+def _selectolax_extract(html, mode, limit):
+    """Extract nodes with selectolax using the precompiled class selector"""
+    results = []
+    for node in _optional_module('selectolax.parser').HTMLParser(html).css(_CLASSED_NODE_SELECTOR):
+        classes = node.attributes.get('class') or ''
+        
+        if mode == 'buff163':
+            if node.tag in ('span', 'div') and _PRICE_CLASS_RE.search(classes):
+                results.append(node.text(strip=True))
+        elif node.tag in ('div', 'a') and _CARD_CLASS_RE.search(classes):
+            card = {'href': node.attributes.get('href'), 'price': None, 'float': None, 'wear': None}
+            for child in _selectolax_descendants(node):
+                if child.tag not in ('span', 'div'):
+                    continue
+                if card['wear'] is None and _WEAR_CLASS_RE.search(child.attributes.get('class') or ''):
+                    card['wear'] = child.text(strip=True)
+                if next(child.iter(), None) is None:
+                    text = child.text(strip=True)
+                    if card['price'] is None and _DOLLAR_TEXT_RE.search(text):
+                        card['price'] = text
+                    if card['float'] is None and _FLOAT_TEXT_RE.search(text):
+                        card['float'] = text
+            results.append(card)
+        
+        if len(results) >= limit:
+            break
+    return results
+
+def _bs4_extract(html, mode, limit):
+    """Extract nodes with BeautifulSoup - the original full-page path"""
+    soup = _optional_module('bs4').BeautifulSoup(html, 'html.parser')
+    
+    if mode == 'buff163':
+        return [elem.get_text(strip=True)
+                for elem in soup.find_all(['span', 'div'], class_=_PRICE_CLASS_RE, limit=limit)]
+    
+    cards = []
+    for card in soup.find_all(['div', 'a'], class_=_CARD_CLASS_RE, limit=limit):
+        price_elem = card.find(['span', 'div'], string=_DOLLAR_TEXT_RE)
+        float_elem = card.find(['span', 'div'], string=_FLOAT_TEXT_RE)
+        wear_elem = card.find(['span', 'div'], class_=_WEAR_CLASS_RE)
+        cards.append({
+            'href': card.get('href'),
+            'price': price_elem.get_text(strip=True) if price_elem else None,
+            'float': float_elem.get_text(strip=True) if float_elem else None,
+            'wear': wear_elem.get_text(strip=True) if wear_elem else None
+        })
+    return cards
+
+HTML_PARSER_BACKENDS = {
+    'selectolax': _selectolax_extract,
+    'lxml': _lxml_extract,
+    'stream': _stream_extract,
+    'bs4': _bs4_extract
+}
+
+def available_html_parser_backends():
+    """Parser backends usable in this environment, slowest first"""
+    backends = ['stream']
+    if _module_available('bs4'):
+        backends.insert(0, 'bs4')
+    if _module_available('lxml'):
+        backends.append('lxml')
+    if _module_available('selectolax'):
+        backends.append('selectolax')
+    return backends
+
+def get_html_parser_backend():
+    """Resolve the configured parser backend to one that is installed"""
+    available = available_html_parser_backends()
+    backend = HTML_PARSER_SETTINGS['backend']
+    return backend if backend in available else available[-1]
+
+def extract_html_nodes(html, mode, limit=None, backend=None):
+    """Extract Buff163 price texts or Skinport cards from a scraped page"""
+    limit = limit or HTML_NODE_LIMITS[mode]
+    extract = HTML_PARSER_BACKENDS[backend or get_html_parser_backend()]
+    return extract(html, mode, limit)
+
+def save_html_fixture(mode, html):
+    """Keep a scraped page for the parser benchmark when fixture saving is on"""
+    if not HTML_PARSER_SETTINGS['save_fixtures']:
+        return
+    try:
+        fixture_dir = HTML_PARSER_SETTINGS['fixture_dir']
+        os.makedirs(fixture_dir, exist_ok=True)
+        path = os.path.join(fixture_dir, f"{mode}_{int(time.time() * 1000)}.html")
+        with open(path, 'wb') as f:
+            f.write(html if isinstance(html, bytes) else html.encode('utf-8'))
+    except OSError as e:
+        logger.warning("⚠️ Could not save HTML fixture: %s", e)
+
+def _generate_html_fixture(mode, cards=300):
+    """Build a page shaped like a marketplace search result when no fixtures are saved"""
+    parts = ['<html><head><title>Market</title><script>var x = 1;</script></head><body>',
+             '<nav class="header">' + ''.join(f'<a href="/c/{i}">Category {i}</a>' for i in range(40)) + '</nav>']
+    for i in range(cards):
+        if mode == 'buff163':
+            parts.append(f'<li><a href="/goods/{i}"><img src="/i/{i}.png"></a><p><span class="l_Right">'
+                         f'<div class="f_Strong price-box"><span class="price">¥<big>{100 + i}</big>.50</span></div>'
+                         f'</span></p></li>')
+        else:
+            parts.append(f'<div class="ItemPreview"><a class="ItemPreview-link" href="/item/{i}">'
+                         f'<img src="/i/{i}.png"><div class="ItemPreview-wear">Field-Tested</div>'
+                         f'<div class="ItemPreview-priceValue"><span>${20 + i}.{i % 100:02d}</span></div>'
+                         f'<span>Float 0.{i:04d}</span></a></div>')
+    parts.append('<footer class="footer">' + '<p>Footer text</p>' * 50 + '</footer></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+def benchmark_html_parsers(fixture_dir=None, repeat=20):
+    """Time every installed parser backend against the saved HTML fixtures"""
+    fixture_dir = fixture_dir or HTML_PARSER_SETTINGS['fixture_dir']
+    fixtures = []
+    if os.path.isdir(fixture_dir):
+        for name in sorted(os.listdir(fixture_dir)):
+            mode = name.split('_', 1)[0]
+            if name.endswith('.html') and mode in HTML_NODE_LIMITS:
+                with open(os.path.join(fixture_dir, name), 'rb') as f:
+                    fixtures.append((name, mode, f.read()))
+    
+    if not fixtures:
+        print(f"⚠️ No HTML fixtures in {fixture_dir}, using generated pages")
+        fixtures = [(f"generated_{mode}", mode, _generate_html_fixture(mode)) for mode in HTML_NODE_LIMITS]
+    
+    # The slowest installed backend - bs4 when present - is what the others are checked against
+    backends = available_html_parser_backends()
+    baseline_backend = backends[0]
+    
+    results = {}
+    for name, mode, html in fixtures:
+        print(f"\n📄 {name} ({len(html) / 1024:.0f} KB)")
+        baseline = baseline_ms = None
+        
+        for backend in backends:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                extracted = extract_html_nodes(html, mode, backend=backend)
+            elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+            
+            if baseline is None:
+                baseline, baseline_ms = extracted, elapsed_ms
+            matches = extracted == baseline
+            
+            print(f"   {backend:<11} {elapsed_ms:8.2f} ms  {baseline_ms / elapsed_ms:6.1f}x  "
+                  f"{'✅ same as' if matches else '⚠️ differs from'} {baseline_backend}")
+            results.setdefault(name, {})[backend] = {'ms': elapsed_ms, 'baseline': baseline_backend, 'matches': matches}
+    
+    return results
+
+class Listing:
+    """
+    One marketplace listing
+    Uses __slots__ instead of a dict, and only builds the URL and sticker
+    list when something actually reads them
+    """
+    __slots__ = ('price', 'float_value', 'wear', 'id', 'platform', 'screenshot',
+                 '_url', '_url_template', '_stickers')
+    
+    # Dict-style keys, so listing['price'] and listing.get('float') keep working
+    KEYS = ('price', 'float', 'url', 'wear', 'id', 'stickers', 'screenshot', 'platform')
+    
+    def __init__(self, price, float_value=None, wear='Unknown', listing_id='unknown', platform=None,
+                 screenshot='', url=None, url_template=None, stickers=None):
+        self.price = price
+        self.float_value = float_value
+        self.wear = wear
+        self.id = listing_id
+        self.platform = platform
+        self.screenshot = screenshot
+        self._url = url
+        self._url_template = url_template
+        # Keep the platform's own sticker list - it is never copied
+        self._stickers = stickers
+    
+    @property
+    def url(self):
+        """Listing URL, formatted the first time it is needed"""
+        if self._url is None and self._url_template:
+            self._url = self._url_template.format(self.id)
+        return self._url or ''
+    
+    @property
+    def stickers(self):
+        """Stickers applied to the item (empty when the platform sent none)"""
+        return self._stickers or []
+    
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, 'float_value' if key == 'float' else key)
+    
+    def get(self, key, default=None):
+        if key not in self.KEYS:
+            return default
+        return self[key]
+    
+    def __contains__(self, key):
+        return key in self.KEYS
+    
+    def to_dict(self):
+        """Plain dict version, for JSON output"""
+        return {key: self[key] for key in self.KEYS}
+    
+    def __repr__(self):
+        return f"Listing({self.platform} ${self.price:.2f} id={self.id})"
 
 def clean_skin_name_for_url(name):
     """Clean skin name for URL encoding"""
@@ -83,10 +1380,11 @@ def clean_skin_name_for_url(name):
     # URL encode
     return urllib.parse.quote(name.strip())
 
+@instrument_fetcher
 def get_steam_market_price(skin_name):
     """Get price from Steam Community Market with better error handling"""
     try:
-        rate_limit_request('steam', 2.0)
+        rate_limit_request('steam')
         
         # Use the correct Steam Market API endpoint
         url = "https://steamcommunity.com/market/priceoverview/"
@@ -106,14 +1404,14 @@ def get_steam_market_price(skin_name):
             'Sec-Fetch-Site': 'same-origin'
         })
         
-        response = requests.get(url, params=params, headers=steam_headers, timeout=15)
+        response = http_get('steam', url, params=params, headers=steam_headers, timeout=15)
         
-        print(f"    Steam API Status: {response.status_code}")
+        logger.debug("    Steam API Status: %s", response.status_code)
         
         if response.status_code == 200:
             try:
-                data = response.json()
-                print(f"    Steam Response: {data}")
+                data = parse_json_response('steam', response)
+                logger.debug("    Steam Response: %s", data)
                 
                 if data.get('success') == True:
                     # Try multiple price fields - Steam API can return different formats
@@ -134,7 +1432,7 @@ def get_steam_market_price(skin_name):
                         try:
                             price_str = str(median_price).replace('$', '').replace(',', '').strip()
                             price_to_use = float(price_str)
-                            print(f"    Steam: Using median_price as fallback: ${price_to_use:.2f}")
+                            logger.debug("    Steam: Using median_price as fallback: $%.2f", price_to_use)
                         except (ValueError, TypeError):
                             pass
                     
@@ -148,77 +1446,86 @@ def get_steam_market_price(skin_name):
                             'volume': volume
                         }
                     else:
-                        print(f"    Steam: No price data (lowest_price: '{lowest_price}', median_price: '{median_price}')")
+                        logger.debug("    Steam: No price data (lowest_price: '%s', median_price: '%s')", lowest_price, median_price)
                         
             except json.JSONDecodeError as e:
-                print(f"    Steam: JSON decode error - {e}")
-                print(f"    Response text: {response.text[:200]}...")
+                logger.warning("    Steam: JSON decode error - %s", e)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    Response text: %s...", response.text[:200])
         elif response.status_code == 429:
-            print(f"    Steam: Rate limited - waiting...")
-            time.sleep(10 + random.uniform(0, 5))
+            logger.warning("    Steam: Rate limited - waiting...")
+            _fetch_sleep(10 + random.uniform(0, 5))
         else:
-            print(f"    Steam: HTTP {response.status_code}")
+            logger.info("    Steam: HTTP %s", response.status_code)
             
     except requests.exceptions.RequestException as e:
-        print(f"    Steam Market Request Error: {e}")
+        logger.warning("    Steam Market Request Error: %s", e)
     except Exception as e:
-        print(f"    Steam Market Error: {e}")
+        logger.warning("    Steam Market Error: %s", e)
     
     return None
 
+def _fetch_steamapis_endpoint(url, skin_name):
+    """Try one SteamApis endpoint, returning a price or None"""
+    # Every endpoint takes its own token, hedged or not
+    rate_limit_request('steamapis')
+    try:
+        response = http_get('steamapis', url, headers=get_headers(), timeout=10)
+        
+        if response.status_code == 200:
+            data = parse_json_response('steamapis', response)
+            
+            # Try different price field names
+            price_fields = ['lowest_price', 'price', 'median_price', 'current_price']
+            
+            for field in price_fields:
+                price_value = data.get(field)
+                if price_value and str(price_value) not in ['None', '--', '']:
+                    try:
+                        if isinstance(price_value, str):
+                            price_str = price_value.replace('$', '').replace(',', '').strip()
+                            price_to_use = float(price_str)
+                        else:
+                            price_to_use = float(price_value)
+                        
+                        if price_to_use > 0:
+                            return {
+                                'price_usd': price_to_use,
+                                'name': skin_name,
+                                'url': f"https://steamcommunity.com/market/listings/730/{urllib.parse.quote(skin_name)}"
+                            }
+                    except (ValueError, TypeError):
+                        continue
+        
+    except Exception as e:
+        logger.warning("    SteamApis endpoint error: %s", e)
+    
+    return None
+
+@instrument_fetcher
 def get_steamapis_price(skin_name):
     """Alternative price source using SteamApis.com"""
     try:
-        rate_limit_request('steamapis', 2.0)
-        
         # Try multiple SteamApis endpoints
         endpoints = [
             f"https://api.steamapis.com/market/item/730/{urllib.parse.quote(skin_name)}",
             f"https://api.steamapis.com/steam/market/730/{urllib.parse.quote(skin_name)}"
         ]
         
-        for url in endpoints:
-            try:
-                response = requests.get(url, headers=get_headers(), timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Try different price field names
-                    price_fields = ['lowest_price', 'price', 'median_price', 'current_price']
-                    
-                    for field in price_fields:
-                        price_value = data.get(field)
-                        if price_value and str(price_value) not in ['None', '--', '']:
-                            try:
-                                if isinstance(price_value, str):
-                                    price_str = price_value.replace('$', '').replace(',', '').strip()
-                                    price_to_use = float(price_str)
-                                else:
-                                    price_to_use = float(price_value)
-                                
-                                if price_to_use > 0:
-                                    return {
-                                        'price_usd': price_to_use,
-                                        'name': skin_name,
-                                        'url': f"https://steamcommunity.com/market/listings/730/{urllib.parse.quote(skin_name)}"
-                                    }
-                            except (ValueError, TypeError):
-                                continue
-                
-            except Exception as e:
-                print(f"    SteamApis endpoint error: {e}")
-                continue
+        return run_fallback_chain([
+            functools.partial(_fetch_steamapis_endpoint, url, skin_name) for url in endpoints
+        ], platform='steamapis')
                 
     except Exception as e:
-        print(f"    SteamApis Error: {e}")
+        logger.warning("    SteamApis Error: %s", e)
     
     return None
 
+@instrument_fetcher
 def get_buff163_price(skin_name):
     """Get price from Buff163 as primary reference"""
     try:
-        rate_limit_request('buff163', 3.0)
+        rate_limit_request('buff163')
         
         # Clean skin name for Buff URL
         clean_name = skin_name.replace("★ ", "").replace(" | ", " ").replace(" (", " ").replace(")", "")
@@ -231,10 +1538,10 @@ def get_buff163_price(skin_name):
             'page_num': 1
         }
         
-        response = requests.get(url, params=params, headers=get_headers(), timeout=10)
+        response = http_get('buff163', url, params=params, headers=get_headers(), timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json_response('buff163', response)
             if data.get('data', {}).get('items'):
                 items = data['data']['items']
                 for item in items:
@@ -248,37 +1555,30 @@ def get_buff163_price(skin_name):
                             'url': f"https://buff.163.com/goods/{item.get('id', '')}"
                         }
     except Exception as e:
-        print(f"    Buff163 Error: {e}")
+        logger.warning("    Buff163 Error: %s", e)
     
     return None
 
+@instrument_fetcher
 def get_buff163_price_scraping(skin_name):
     """Buff163 via web scraping with CloudFlare bypass"""
     try:
-        print("    ⏳ Trying Buff163 (web scraping)...")
-        rate_limit_request('buff163_scraping', 5.0)
-        
-        scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'mobile': False}
-        )
+        rate_limit_request('buff163_scraping')
         
         # Search URL for Buff163
         search_term = skin_name.replace('★ ', '').replace(' | ', ' ')
         encoded_search = urllib.parse.quote(search_term)
         url = f"https://buff.163.com/market/csgo#tab=selling&page_num=1&search={encoded_search}"
         
-        response = scraper.get(url, timeout=20)
+        response = scraper_get('buff.163.com', url, timeout=20)
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
+            save_html_fixture('buff163', response.content)
             
             # Look for price elements (this would need to be customized based on actual HTML structure)
-            price_elements = soup.find_all(['span', 'div'], class_=re.compile(r'price|cost', re.I))
-            
-            for elem in price_elements[:3]:  # Check first 3 price elements
-                price_text = elem.get_text(strip=True)
+            for price_text in extract_html_nodes(response.content, 'buff163'):
                 # Look for CNY prices
-                price_match = re.search(r'¥(\d+\.?\d*)', price_text)
+                price_match = _CNY_PRICE_RE.search(price_text)
                 if price_match:
                     price_cny = float(price_match.group(1))
                     price_usd = price_cny / 7.2  # Convert CNY to USD
@@ -290,23 +1590,24 @@ def get_buff163_price_scraping(skin_name):
                         }
                         
     except Exception as e:
-        print(f"    Buff163 scraping Error: {e}")
+        logger.warning("    Buff163 scraping Error: %s", e)
     
     return None
 
+@instrument_fetcher
 def get_pricempire_price(skin_name):
     """Try Pricempire API if available"""
     try:
-        rate_limit_request('pricempire', 2.0)
+        rate_limit_request('pricempire')
         
         # Simple approach - try to get basic price data
         clean_name = skin_name.replace("★ ", "").replace(" | ", "-").replace(" (", "-").replace(")", "").replace(" ", "-").lower()
         url = f"https://pricempire.com/api/v1/market/items/{clean_name}"
         
-        response = requests.get(url, headers=get_headers(), timeout=10)
+        response = http_get('pricempire', url, headers=get_headers(), timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json_response('pricempire', response)
             if data.get('steam') and data['steam'].get('last_24h'):
                 return {
                     'price_usd': float(data['steam']['last_24h']),
@@ -314,23 +1615,24 @@ def get_pricempire_price(skin_name):
                     'url': f"https://pricempire.com/item/cs2/{clean_name}"
                 }
     except Exception as e:
-        print(f"    Pricempire Error: {e}")
+        logger.warning("    Pricempire Error: %s", e)
     
     return None
 
+@instrument_fetcher
 def get_csgostash_price(skin_name):
     """Try CSGOStash as fallback price source"""
     try:
-        rate_limit_request('csgostash', 2.0)
+        rate_limit_request('csgostash')
         
         # Clean skin name for CSGOStash URL format
         clean_name = skin_name.replace("★ ", "").replace(" | ", "-").replace(" (", "-").replace(")", "").replace(" ", "-").lower()
         url = f"https://csgostash.com/api/v2/prices/{clean_name}"
         
-        response = requests.get(url, headers=get_headers(), timeout=10)
+        response = http_get('csgostash', url, headers=get_headers(), timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json_response('csgostash', response)
             if data.get('steam_price'):
                 return {
                     'price_usd': float(data['steam_price']),
@@ -338,14 +1640,15 @@ def get_csgostash_price(skin_name):
                     'url': f"https://csgostash.com/skin/{clean_name}"
                 }
     except Exception as e:
-        print(f"    CSGOStash Error: {e}")
+        logger.warning("    CSGOStash Error: %s", e)
     
     return None
 
+@instrument_fetcher
 def get_steamlytics_price(skin_name):
     """Alternative price source - SteamLytics"""
     try:
-        rate_limit_request('steamlytics', 3.0)
+        rate_limit_request('steamlytics')
         
         # Clean skin name for URL
         clean_name = skin_name.replace('★ ', '').replace(' | ', '-').replace(' (', '-').replace(')', '').replace(' ', '-').lower()
@@ -356,10 +1659,10 @@ def get_steamlytics_price(skin_name):
             'search': skin_name
         }
         
-        response = requests.get(url, params=params, headers=get_headers(), timeout=10)
+        response = http_get('steamlytics', url, params=params, headers=get_headers(), timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json_response('steamlytics', response)
             if data.get('items'):
                 for item in data['items']:
                     if skin_name.lower() in item.get('name', '').lower():
@@ -372,14 +1675,15 @@ def get_steamlytics_price(skin_name):
                             }
                             
     except Exception as e:
-        print(f"    SteamLytics Error: {e}")
+        logger.warning("    SteamLytics Error: %s", e)
     
     return None
 
+@instrument_fetcher
 def get_simple_steam_price(skin_name):
     """Simple Steam market price checker - different approach"""
     try:
-        rate_limit_request('steam_simple', 3.0)
+        rate_limit_request('steam_simple')
         
         # Use Steam's market search page to get price info
         search_url = "https://steamcommunity.com/market/search/render/"
@@ -394,10 +1698,10 @@ def get_simple_steam_price(skin_name):
             'query': skin_name
         }
         
-        response = requests.get(search_url, params=params, headers=get_headers(), timeout=15)
+        response = http_get('steam', search_url, params=params, headers=get_headers(), timeout=15)
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json_response('steam', response)
             if data.get('success') and data.get('results'):
                 results = data['results']
                 
@@ -427,147 +1731,898 @@ def get_simple_steam_price(skin_name):
                                 continue
                                 
     except Exception as e:
-        print(f"    Steam Simple Error: {e}")
+        logger.warning("    Steam Simple Error: %s", e)
     
     return None
 
+# Price history - per (skin, platform) ring buffers with periodic on-disk segments
+PRICE_HISTORY_SETTINGS = {
+    'enabled': True,
+    'capacity': 512,             # Most observations kept in memory per skin and platform
+    'initial_capacity': 16,      # Buffers start this small and double as observations arrive
+    'max_skins': 10000,          # Least recently updated skins are dropped from memory beyond this
+    'segment_dir': 'price_history',
+    'segment_interval': 900,     # Seconds between on-disk segments
+    'compact_after': 24,         # Segments on disk before they are merged into one
+    'retention': 30 * 86400,     # Seconds of on-disk history kept when segments are merged
+    'rolling_window': 6 * 3600,  # Seconds of history used for a local reference price
+    'rolling_min_samples': 3,    # Observations needed before a local reference is trusted
+    'prefer_rolling_reference': False  # Answer from history before asking the network
+}
+
+PRICE_COLUMNS = ('ts', 'price', 'float')
+
+_price_history = OrderedDict()  # skin -> {platform: series}, least recently updated first
+_evicted_price_series = []      # (skin, platform, series) dropped from memory before being saved
+_price_history_lock = threading.Lock()
+_last_price_history_segment = time.time()
+_last_price_history_stamp = 0  # Millisecond stamp of the newest segment name, kept unique
+
+def _new_price_column(size):
+    """Create a NaN-filled float column"""
+    np = _optional_module('numpy')
+    if np is not None:
+        return np.full(size, np.nan)
+    return array.array('d', [math.nan]) * size
+
+def _new_price_series(capacity):
+    """Create an empty ring buffer of price observations"""
+    columns = {name: _new_price_column(capacity) for name in PRICE_COLUMNS}
+    columns.update({'next': 0, 'count': 0, 'unsaved': 0})
+    return columns
+
+def _grow_price_series(series):
+    """Double a full series' buffers, up to the configured capacity"""
+    size = len(series['ts'])
+    new_size = min(size * 2, PRICE_HISTORY_SETTINGS['capacity'])
+    for name in PRICE_COLUMNS:
+        column = _new_price_column(new_size)
+        column[:size] = series[name]
+        series[name] = column
+    # A full buffer has wrapped next back to 0 - continue in the first new slot instead
+    series['next'] = size
+
+def _evict_price_history():
+    """Drop the least recently updated skins beyond max_skins, keeping unsaved rows for the next segment"""
+    while len(_price_history) > PRICE_HISTORY_SETTINGS['max_skins']:
+        skin_name, platforms = _price_history.popitem(last=False)
+        for platform, series in platforms.items():
+            if series['unsaved']:
+                _evicted_price_series.append((skin_name, platform, series))
+
+def _to_float(value):
+    """Convert a float value from any platform to a number, NaN when unknown"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def record_price_observation(skin_name, platform, price, float_value=None, timestamp=None):
+    """Record one fetched price in the skin's history for that platform"""
+    if not PRICE_HISTORY_SETTINGS.get('enabled'):
+        return
+    
+    price = _to_float(price)
+    if math.isnan(price) or price <= 0:
+        return
+    
+    with _price_history_lock:
+        platforms = _price_history.get(skin_name)
+        if platforms is None:
+            platforms = _price_history[skin_name] = {}
+            _evict_price_history()
+        else:
+            _price_history.move_to_end(skin_name)
+        
+        series = platforms.get(platform)
+        if series is None:
+            series = _new_price_series(min(PRICE_HISTORY_SETTINGS['initial_capacity'], PRICE_HISTORY_SETTINGS['capacity']))
+            platforms[platform] = series
+        elif series['count'] == len(series['ts']) < PRICE_HISTORY_SETTINGS['capacity']:
+            # Buffers only wrap once they are at full capacity, so growing is a plain copy
+            _grow_price_series(series)
+        
+        position = series['next']
+        series['ts'][position] = timestamp if timestamp is not None else time.time()
+        series['price'][position] = price
+        series['float'][position] = _to_float(float_value)
+        
+        capacity = len(series['ts'])
+        series['next'] = (position + 1) % capacity
+        series['count'] = min(series['count'] + 1, capacity)
+        series['unsaved'] = min(series['unsaved'] + 1, capacity)
+
+def _series_columns(series, last=None):
+    """Copies of a series' ts, price and float columns, oldest first, optionally only the newest few"""
+    count = series['count'] if last is None else min(last, series['count'])
+    capacity = len(series['ts'])
+    start = (series['next'] - count) % capacity
+    end = start + count
+    
+    np = _optional_module('numpy')
+    if end <= capacity:
+        return tuple(series[name][start:end].copy() if np is not None else series[name][start:end]
+                     for name in PRICE_COLUMNS)
+    
+    wrapped = end - capacity
+    if np is not None:
+        return tuple(np.concatenate((series[name][start:], series[name][:wrapped])) for name in PRICE_COLUMNS)
+    return tuple(series[name][start:] + series[name][:wrapped] for name in PRICE_COLUMNS)
+
+def get_price_series(skin_name, platform, since=None):
+    """Get a skin's observations on one platform as ts, price and float arrays, oldest first"""
+    with _price_history_lock:
+        series = _price_history.get(skin_name, {}).get(platform)
+        if series is None:
+            return None
+        columns = _series_columns(series)
+    
+    if since is not None:
+        first = bisect.bisect_left(columns[0], since)
+        columns = tuple(column[first:] for column in columns)
+    return dict(zip(PRICE_COLUMNS, columns))
+
+def get_price_history(skin_name, platform=None, since=None):
+    """Get (timestamp, platform, price, float) observations for a skin, oldest first"""
+    with _price_history_lock:
+        platforms = [platform] if platform is not None else list(_price_history.get(skin_name, {}))
+    
+    rows = []
+    for series_platform in platforms:
+        series = get_price_series(skin_name, series_platform, since)
+        if series is not None:
+            rows.extend((ts, series_platform, price, float_value) for ts, price, float_value
+                        in zip(series['ts'].tolist(), series['price'].tolist(), series['float'].tolist()))
+    rows.sort()
+    return rows
+
+def get_rolling_reference_price(skin_name, window=None, min_samples=None):
+    """Median of recent reference source prices, or None without enough history"""
+    window = window or PRICE_HISTORY_SETTINGS['rolling_window']
+    min_samples = min_samples or PRICE_HISTORY_SETTINGS['rolling_min_samples']
+    since = time.time() - window
+    
+    prices = []
+    for source, _, _ in REFERENCE_PRICE_SOURCES:
+        series = get_price_series(skin_name, source, since)
+        if series is not None and len(series['price']):
+            prices.append(series['price'])
+    
+    np = _optional_module('numpy')
+    if np is not None:
+        prices = np.concatenate(prices) if prices else np.empty(0)
+        if len(prices) < min_samples:
+            return None
+        median = float(np.median(prices))
+    else:
+        prices = sorted(price for column in prices for price in column)
+        if len(prices) < min_samples:
+            return None
+        middle = len(prices) // 2
+        median = prices[middle] if len(prices) % 2 else (prices[middle - 1] + prices[middle]) / 2
+    
+    return {
+        'price_usd': median,
+        'name': skin_name,
+        'url': 'local price history',
+        'samples': len(prices)
+    }
+
+def _write_price_history_segment(base, names, columns):
+    """Write one segment atomically - .npz with numpy, .json.gz without"""
+    np = _optional_module('numpy')
+    if np is not None:
+        path = base + '.npz'
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                names=np.array(json.dumps(names)),
+                series=np.array(columns['series'], dtype=np.int32),
+                ts=np.array(columns['ts']),
+                price=np.array(columns['price'], dtype=np.float32),
+                float=np.array(columns['float'])
+            )
+    else:
+        path = base + '.json.gz'
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        floats = [None if math.isnan(value) else value for value in columns['float']]
+        with gzip.open(tmp_path, 'wt') as f:
+            json.dump({'names': names, **columns, 'float': floats}, f)
+    os.replace(tmp_path, path)
+    return path
+
+def flush_price_history_segment(force=False):
+    """Write observations recorded since the last segment to disk"""
+    global _last_price_history_segment, _last_price_history_stamp
+    if not PRICE_HISTORY_SETTINGS.get('enabled'):
+        return None
+    if not force and time.time() - _last_price_history_segment < PRICE_HISTORY_SETTINGS['segment_interval']:
+        return None
+    
+    with _price_history_lock:
+        _last_price_history_segment = time.time()
+        _last_price_history_stamp = max(int(_last_price_history_segment * 1000), _last_price_history_stamp + 1)
+        stamp = _last_price_history_stamp
+        names = []
+        columns = {'series': [], 'ts': [], 'price': [], 'float': []}
+        pending = [(skin_name, platform, series)
+                   for skin_name, platforms in _price_history.items()
+                   for platform, series in platforms.items()]
+        pending.extend(_evicted_price_series)
+        _evicted_price_series.clear()
+        
+        for skin_name, platform, series in pending:
+            if not series['unsaved']:
+                continue
+            names.append([skin_name, platform])
+            ts, price, float_values = _series_columns(series, last=series['unsaved'])
+            columns['series'].extend([len(names) - 1] * len(ts))
+            columns['ts'].extend(ts.tolist())
+            columns['price'].extend(price.tolist())
+            columns['float'].extend(float_values.tolist())
+            series['unsaved'] = 0
+    
+    if not names:
+        return None
+    
+    try:
+        os.makedirs(PRICE_HISTORY_SETTINGS['segment_dir'], exist_ok=True)
+        base = os.path.join(PRICE_HISTORY_SETTINGS['segment_dir'], f"segment_{stamp}")
+        path = _write_price_history_segment(base, names, columns)
+    except Exception as e:
+        logger.error("❌ Error writing price history segment: %s", e)
+        return None
+    
+    if len(_price_history_segment_files(PRICE_HISTORY_SETTINGS['segment_dir'])) > PRICE_HISTORY_SETTINGS['compact_after']:
+        compacted = compact_price_history_segments()
+        if compacted:
+            path = compacted
+    return path
+
+def _price_history_segment_files(segment_dir):
+    """Segment filenames in a directory, oldest first"""
+    try:
+        filenames = sorted(os.listdir(segment_dir))
+    except FileNotFoundError:
+        return []
+    return [filename for filename in filenames if filename.endswith(('.npz', '.json.gz'))]
+
+def _read_price_history_segment(path):
+    """Read one segment as (timestamp, skin, platform, price, float) rows"""
+    if path.endswith('.npz'):
+        np = _optional_module('numpy')
+        if np is None:
+            return []
+        with np.load(path) as segment:
+            names = json.loads(str(segment['names']))
+            columns = list(zip(segment['series'].tolist(), segment['ts'].tolist(),
+                               segment['price'].tolist(), segment['float'].tolist()))
+    else:
+        with gzip.open(path, 'rt') as f:
+            segment = json.load(f)
+        names = segment['names']
+        floats = [math.nan if value is None else value for value in segment['float']]
+        columns = zip(segment['series'], segment['ts'], segment['price'], floats)
+    
+    rows = []
+    for series_index, ts, price, float_value in columns:
+        skin_name, platform = names[series_index]
+        rows.append((ts, skin_name, platform, price, float_value))
+    return rows
+
+def load_price_history_segments(segment_dir=None):
+    """Read every on-disk segment back as (timestamp, skin, platform, price, float) rows"""
+    segment_dir = segment_dir or PRICE_HISTORY_SETTINGS['segment_dir']
+    rows = []
+    for filename in _price_history_segment_files(segment_dir):
+        rows.extend(_read_price_history_segment(os.path.join(segment_dir, filename)))
+    
+    rows.sort()
+    return rows
+
+def compact_price_history_segments(segment_dir=None, retention=None):
+    """Merge on-disk segments into one, dropping observations older than the retention period"""
+    segment_dir = segment_dir or PRICE_HISTORY_SETTINGS['segment_dir']
+    retention = retention or PRICE_HISTORY_SETTINGS['retention']
+    filenames = _price_history_segment_files(segment_dir)
+    if len(filenames) < 2:
+        return None
+    
+    try:
+        cutoff = time.time() - retention
+        names, name_index = [], {}
+        columns = {'series': [], 'ts': [], 'price': [], 'float': []}
+        for filename in filenames:
+            for ts, skin_name, platform, price, float_value in _read_price_history_segment(os.path.join(segment_dir, filename)):
+                if ts < cutoff:
+                    continue
+                key = (skin_name, platform)
+                if key not in name_index:
+                    name_index[key] = len(names)
+                    names.append([skin_name, platform])
+                columns['series'].append(name_index[key])
+                columns['ts'].append(ts)
+                columns['price'].append(price)
+                columns['float'].append(float_value)
+        
+        # The merged segment takes the newest segment's name, so segment order is unchanged
+        path = None
+        if names:
+            newest = filenames[-1]
+            path = _write_price_history_segment(os.path.join(segment_dir, newest[:newest.index('.')]), names, columns)
+        for filename in filenames:
+            if path is None or os.path.join(segment_dir, filename) != path:
+                os.remove(os.path.join(segment_dir, filename))
+        return path
+    except Exception as e:
+        logger.error("❌ Error compacting price history segments: %s", e)
+        return None
+
+# Reference price sources in their default priority order
+REFERENCE_PRICE_SOURCES = [
+    ('buff163', 'Buff163', get_buff163_price),
+    ('buff163_scraping', 'Buff163 (scraping)', get_buff163_price_scraping),
+    ('steam', 'Steam Market', get_steam_market_price),
+    ('steam_simple', 'Steam Simple', get_simple_steam_price),
+    ('steamapis', 'SteamApis', get_steamapis_price),
+    ('steamlytics', 'SteamLytics', get_steamlytics_price),
+    ('pricempire', 'Pricempire', get_pricempire_price),
+    ('csgostash', 'CSGOStash', get_csgostash_price)
+]
+
+# Source health tracking for adaptive ordering and circuit breaking
+SOURCE_HEALTH_SETTINGS = {
+    'adaptive_ordering': True,
+    'default_latency': 5.0,    # Assumed latency (seconds) for sources without samples
+    'latency_smoothing': 0.3,  # Weight of the newest sample in the latency average
+    'failure_threshold': 3,    # Consecutive failures before a source is skipped
+    'cooldown': 300            # Seconds a failing source is skipped before a retry
+}
+
+_source_health = {}
+_source_health_lock = threading.Lock()
+
+def _new_source_health():
+    """Create an empty health record for a reference price source"""
+    return {
+        'successes': 0,
+        'failures': 0,
+        'misses': 0,  # Clean answers that did not list the skin
+        'consecutive_failures': 0,
+        'avg_latency': None,
+        'open_until': 0
+    }
+
+def record_source_result(source, success, latency, found=True):
+    """Record the outcome and latency of one reference price lookup
+
+    A successful lookup that did not find the skin is a miss - it keeps the circuit closed.
+    """
+    with _source_health_lock:
+        health = _source_health.setdefault(source, _new_source_health())
+        
+        smoothing = SOURCE_HEALTH_SETTINGS['latency_smoothing']
+        if health['avg_latency'] is None:
+            health['avg_latency'] = latency
+        else:
+            health['avg_latency'] = smoothing * latency + (1 - smoothing) * health['avg_latency']
+        
+        if success:
+            health['successes' if found else 'misses'] += 1
+            health['consecutive_failures'] = 0
+            health['open_until'] = 0
+        else:
+            health['failures'] += 1
+            health['consecutive_failures'] += 1
+            # Open the circuit once a source keeps failing
+            if health['consecutive_failures'] >= SOURCE_HEALTH_SETTINGS['failure_threshold']:
+                health['open_until'] = time.time() + SOURCE_HEALTH_SETTINGS['cooldown']
+
+def is_source_available(source):
+    """Check whether a source's circuit breaker allows a request"""
+    with _source_health_lock:
+        health = _source_health.get(source)
+        return not health or health['open_until'] <= time.time()
+
+def _source_expected_cost(source):
+    """Estimate the seconds spent per successful answer from a source"""
+    with _source_health_lock:
+        health = _source_health.get(source) or _new_source_health()
+        # Laplace smoothing keeps untried sources in the middle of the pack
+        success_rate = (health['successes'] + 1) / (health['successes'] + health['failures'] + health['misses'] + 2)
+        latency = health['avg_latency']
+        if latency is None:
+            latency = SOURCE_HEALTH_SETTINGS['default_latency']
+    return latency / success_rate
+
+def get_ordered_reference_sources():
+    """Get the reference price sources, most likely to answer quickly first"""
+    if not SOURCE_HEALTH_SETTINGS.get('adaptive_ordering'):
+        return list(REFERENCE_PRICE_SOURCES)
+    
+    # sorted() is stable, so sources without history keep their default order
+    return sorted(REFERENCE_PRICE_SOURCES, key=lambda source: _source_expected_cost(source[0]))
+
+def display_source_health():
+    """Display success rate and latency of every reference price source"""
+    print("📡 Reference source health:")
+    for source, label, _ in get_ordered_reference_sources():
+        with _source_health_lock:
+            health = dict(_source_health.get(source) or _new_source_health())
+        total = health['successes'] + health['failures'] + health['misses']
+        if not total:
+            print(f"  {label}: no data")
+            continue
+        rate = health['successes'] / total * 100
+        miss_rate = health['misses'] / total * 100
+        state = "open" if health['open_until'] > time.time() else "closed"
+        print(f"  {label}: {rate:.0f}% success, {miss_rate:.0f}% not listed, {health['avg_latency']:.2f}s avg, circuit {state}")
+
+# Reference price cache
+REFERENCE_CACHE_SETTINGS = {
+    'enabled': True,
+    'ttl': 900,            # Seconds a cached reference price stays valid
+    'max_entries': 1000    # Least recently used skins are evicted beyond this
+}
+
+_reference_price_cache = OrderedDict()
+_reference_price_cache_lock = threading.Lock()
+
+def get_cached_reference_price(skin_name):
+    """Get a reference price from the cache if it has not expired"""
+    with _reference_price_cache_lock:
+        entry = _reference_price_cache.get(skin_name)
+        if not entry:
+            return None
+        
+        if time.time() - entry['cached_at'] > REFERENCE_CACHE_SETTINGS['ttl']:
+            del _reference_price_cache[skin_name]
+            return None
+        
+        _reference_price_cache.move_to_end(skin_name)
+        return entry
+
+def cache_reference_price(skin_name, reference_info, cached_at=None):
+    """Store a reference price, evicting the least recently used skins"""
+    with _reference_price_cache_lock:
+        _reference_price_cache[skin_name] = {
+            'info': reference_info,
+            'cached_at': cached_at if cached_at is not None else time.time()
+        }
+        _reference_price_cache.move_to_end(skin_name)
+        
+        while len(_reference_price_cache) > REFERENCE_CACHE_SETTINGS['max_entries']:
+            _reference_price_cache.popitem(last=False)
+
 def get_reference_price(skin_name):
     """Get reference price from multiple sources with improved fallbacks"""
-    print(f"  🔍 Getting reference price for {skin_name}...")
-    
-    # Try Buff163 first (your preferred reference)
-    print("    ⏳ Trying Buff163...")
-    buff_price = get_buff163_price(skin_name)
-    if buff_price:
-        print(f"    ✅ Buff163: ${buff_price['price_usd']:.2f}")
-        return buff_price
-    
-    # Try Buff163 scraping as backup
-    buff_scraping = get_buff163_price_scraping(skin_name)
-    if buff_scraping:
-        print(f"    ✅ Buff163 (scraping): ${buff_scraping['price_usd']:.2f}")
-        return buff_scraping
-    
-    # Then fall back to Steam Market...
-    print("    ❌ Buff163 failed, trying Steam Community Market...")
-    steam_price = get_steam_market_price(skin_name)
-    if steam_price:
-        print(f"    ✅ Steam Market: ${steam_price['price_usd']:.2f} (Volume: {steam_price.get('volume', 'N/A')})")
-        return steam_price
-    
-    print("    ❌ Steam Market failed, trying Steam Simple Search...")
-    
-    # Try Steam Simple Search as immediate fallback
-    steam_simple = get_simple_steam_price(skin_name)
-    if steam_simple:
-        print(f"    ✅ Steam Simple: ${steam_simple['price_usd']:.2f}")
-        return steam_simple
-    
-    print("    ❌ Steam Simple failed, trying SteamApis...")
-    
-    # Try SteamApis as backup
-    steamapis_price = get_steamapis_price(skin_name)
-    if steamapis_price:
-        print(f"    ✅ SteamApis: ${steamapis_price['price_usd']:.2f}")
-        return steamapis_price
-    
-    print("    ❌ SteamApis failed, trying SteamLytics...")
-    
-    # Try SteamLytics as backup
-    steamlytics_price = get_steamlytics_price(skin_name)
-    if steamlytics_price:
-        print(f"    ✅ SteamLytics: ${steamlytics_price['price_usd']:.2f}")
-        return steamlytics_price
-    
-    print("    ❌ SteamLytics failed, trying Pricempire...")
-    
-    # Try Pricempire as backup
-    pricempire_price = get_pricempire_price(skin_name)
-    if pricempire_price:
-        print(f"    ✅ Pricempire: ${pricempire_price['price_usd']:.2f}")
-        return pricempire_price
-    
-    print("    ❌ Pricempire failed, trying CSGOStash...")
-    
-    # Try CSGOStash as final fallback
-    csgostash_price = get_csgostash_price(skin_name)
-    if csgostash_price:
-        print(f"    ✅ CSGOStash: ${csgostash_price['price_usd']:.2f}")
-        return csgostash_price
-    
-    print("    ❌ All price sources failed")
+    logger.info("  🔍 Getting reference price for %s...", skin_name)
+    
+    if REFERENCE_CACHE_SETTINGS.get('enabled'):
+        cached = get_cached_reference_price(skin_name)
+        if cached:
+            age = time.time() - cached['cached_at']
+            logger.info("    ⚡ Cached reference: $%.2f (age %.0fs)", cached['info']['price_usd'], age)
+            return cached['info']
+    
+    if PRICE_HISTORY_SETTINGS.get('prefer_rolling_reference'):
+        rolling = get_rolling_reference_price(skin_name)
+        if rolling:
+            logger.info("    📈 Local rolling reference: $%.2f (%s samples)", rolling['price_usd'], rolling['samples'])
+            return rolling
+    
+    reference_info = fetch_reference_price(skin_name)
+    
+    if not reference_info:
+        # Every source failed - recent history is better than nothing
+        reference_info = get_rolling_reference_price(skin_name)
+        if reference_info:
+            logger.info("    📈 Using local rolling reference: $%.2f", reference_info['price_usd'])
+            return reference_info
+    
+    if reference_info and REFERENCE_CACHE_SETTINGS.get('enabled'):
+        cache_reference_price(skin_name, reference_info)
+    
+    return reference_info
+
+def _try_reference_source(source, label, get_price_func, skin_name):
+    """Query one reference price source and record how it went"""
+    logger.debug("    ⏳ Trying %s...", label)
+    started = time.time()
+    _request_outcomes.current = outcomes = {'errors': 0}
+    try:
+        price_info = get_price_func(skin_name)
+    finally:
+        _request_outcomes.current = None
+    
+    cancel_event = getattr(_fetch_context, 'cancel_event', None)
+    if cancel_event is not None and cancel_event.is_set():
+        # Lost a hedge race - says nothing about the source's health
+        return None
+    # A source that answered cleanly but does not list the skin is still healthy
+    record_source_result(source, bool(price_info) or not outcomes['errors'], time.time() - started, bool(price_info))
+    
+    if price_info:
+        record_price_observation(skin_name, source, price_info['price_usd'])
+        if 'volume' in price_info:
+            logger.info("    ✅ %s: $%.2f (Volume: %s)", label, price_info['price_usd'], price_info.get('volume', 'N/A'))
+        else:
+            logger.info("    ✅ %s: $%.2f", label, price_info['price_usd'])
+        return price_info
+    
+    if outcomes['errors']:
+        logger.info("    ❌ %s failed", label)
+    else:
+        logger.info("    ❌ %s: no price for this skin", label)
+    return None
+
+def fetch_reference_price(skin_name):
+    """Query the reference price sources, healthiest first, until one answers"""
+    candidates = []
+    for source, label, get_price_func in get_ordered_reference_sources():
+        if not is_source_available(source):
+            logger.info("    ⏭️ Skipping %s (circuit open)", label)
+            continue
+        candidates.append(functools.partial(_try_reference_source, source, label, get_price_func, skin_name))
+    
+    price_info = run_fallback_chain(candidates)
+    if price_info:
+        return price_info
+    
+    logger.warning("    ❌ All price sources failed")
     return None
 
+@instrument_fetcher
 def get_skinport_listings_web_scraping(skin_name):
     """Web scraping approach for Skinport with CloudFlare bypass"""
     try:
-        print("  🔍 Fetching Skinport via web scraping...")
-        rate_limit_request('skinport_web', 5.0)
-        
-        # Use cloudscraper to bypass CloudFlare
-        scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'mobile': False}
-        )
+        logger.info("  🔍 Fetching Skinport via web scraping...")
+        rate_limit_request('skinport_web')
         
         # Search URL format
         search_query = urllib.parse.quote(skin_name.replace('★ ', ''))
         url = f"https://skinport.com/market/730?search={search_query}"
         
-        response = scraper.get(url, timeout=20)
+        # Use cloudscraper to bypass CloudFlare
+        response = scraper_get('skinport.com', url, timeout=20)
+        
+        if response.status_code == 200:
+            save_html_fixture('skinport', response.content)
+            
+            # Look for item cards/listings (these selectors would need to be updated based on actual HTML)
+            listings = []
+            for card in extract_html_nodes(response.content, 'skinport'):
+                if not card['price']:
+                    continue
+                
+                price_match = _USD_PRICE_RE.search(card['price'].replace(',', ''))
+                if price_match:
+                    listings.append(Listing(
+                        float(price_match.group(1)),
+                        float_value=card['float'] if card['float'] is not None else 'N/A',
+                        wear=card['wear'] if card['wear'] is not None else 'Unknown',
+                        listing_id='scraped',
+                        platform='Skinport',
+                        url=f"https://skinport.com{card['href']}" if card['href'] else url
+                    ))
+            
+            if listings:
+                logger.info("  ✅ Found %s Skinport listings via scraping", len(listings))
+                return listings
+                
+    except Exception as e:
+        logger.warning("  ❌ Skinport scraping error: %s", e)
+    
+    return []
+
+# Skinport catalogue snapshot shared by every skin in a monitoring cycle
+SKINPORT_CATALOGUE_SETTINGS = {
+    'enabled': True,
+    'url': 'https://skinport.com/api/data/730',
+    'max_age': 300,  # Seconds a snapshot stays valid outside the monitoring loop
+    'streaming': True,  # Decode the catalogue item by item, keeping only monitored skins
+    'chunk_size': 65536
+}
+
+_skinport_catalogue = {
+    'items': None,
+    'index': None,
+    'fetched_at': 0,
+    'skins': None,         # Skins a streamed snapshot was filtered for, None when it is complete
+    'cycle_skins': set(),  # Skins the current cycle will look up
+    'etag': None,          # Validators for revalidating a stale snapshot
+    'last_modified': None
+}
+_skinport_catalogue_lock = threading.Lock()
+
+def _extract_skinport_items(data):
+    """Pull the item list out of the different Skinport response formats"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        # Try different possible keys
+        return (data.get('items') or 
+                data.get('data') or 
+                data.get('results') or
+                [data] if 'market_hash_name' in data else [])
+    return []
+
+# Skin-name matching - tokens are lowercase words, so "AK-47 | Redline (Field-Tested)"
+# and "ak 47 redline field tested" share one canonical key
+_SKIN_NAME_TOKEN_RE = re.compile(r'[a-z0-9]+')
+SKIN_VARIANT_TOKENS = frozenset(('stattrak', 'souvenir'))  # Only matched when the query asks for them
+SKIN_MATCH_SETTINGS = {
+    'fuzzy': False  # Let partial names match every skin containing all their words
+}
+_SKIN_WEAR_RE = re.compile(r'\((factory new|minimal wear|field-tested|well-worn|battle-scarred)\)\s*$', re.IGNORECASE)
+
+def normalize_skin_name(name):
+    """Canonical lookup key for a market_hash_name"""
+    return ' '.join(_SKIN_NAME_TOKEN_RE.findall(name.lower()))
+
+def is_fuzzy_skin_query(skin_name):
+    """Whether a name may match other skins - never for a full market_hash_name with its wear"""
+    return SKIN_MATCH_SETTINGS.get('fuzzy') and not _SKIN_WEAR_RE.search(skin_name)
+
+def build_skin_name_index(items):
+    """Index catalogue items by canonical name, with a token index for partial names"""
+    by_key = {}
+    key_tokens = {}
+    by_token = {}
+    
+    for item in items:
+        if not isinstance(item, dict) or not item.get('market_hash_name'):
+            continue
+        key = normalize_skin_name(item['market_hash_name'])
+        entries = by_key.get(key)
+        if entries is not None:
+            entries.append(item)
+            continue
+        
+        by_key[key] = [item]
+        tokens = frozenset(key.split())
+        key_tokens[key] = tokens
+        for token in tokens:
+            by_token.setdefault(token, []).append(key)
+    
+    return {'by_key': by_key, 'key_tokens': key_tokens, 'by_token': by_token}
+
+def match_skin_name(index, skin_name):
+    """Items for a skin - the exact name if listed, otherwise every name containing all its tokens when fuzzy"""
+    key = normalize_skin_name(skin_name)
+    exact = index['by_key'].get(key)
+    if exact:
+        return exact
+    # "Fade" must never pick up "Marble Fade"
+    if not is_fuzzy_skin_query(skin_name):
+        return []
+    
+    tokens = frozenset(key.split())
+    postings = [index['by_token'].get(token) for token in tokens]
+    if not postings or not all(postings):
+        return []
+    
+    # Walk the rarest token's keys and check the rest against each key's token set
+    excluded = SKIN_VARIANT_TOKENS - tokens
+    matching_items = []
+    for candidate in min(postings, key=len):
+        candidate_tokens = index['key_tokens'][candidate]
+        if tokens <= candidate_tokens and not (excluded & candidate_tokens):
+            matching_items.extend(index['by_key'][candidate])
+    return matching_items
+
+def build_skin_name_filter(skin_names):
+    """Predicate keeping catalogue items that match_skin_name would return for any of the skins"""
+    exact_keys = set()
+    anchors = {}
+    for name in skin_names:
+        key = normalize_skin_name(name)
+        exact_keys.add(key)
+        tokens = frozenset(key.split())
+        if tokens and is_fuzzy_skin_query(name):
+            anchors.setdefault(max(tokens, key=len), []).append(tokens)
+    
+    def is_wanted(item):
+        name = item.get('market_hash_name') if isinstance(item, dict) else None
+        if not name:
+            return False
+        key = normalize_skin_name(name)
+        if key in exact_keys:
+            return True
+        
+        item_tokens = frozenset(key.split())
+        for token in item_tokens:
+            for tokens in anchors.get(token, ()):
+                if tokens <= item_tokens and not ((SKIN_VARIANT_TOKENS - tokens) & item_tokens):
+                    return True
+        return False
+    
+    return is_wanted
+
+def invalidate_skinport_catalogue(drop=False):
+    """Mark the Skinport catalogue snapshot stale so the next lookup revalidates it, or drop it entirely"""
+    with _skinport_catalogue_lock:
+        _skinport_catalogue['fetched_at'] = 0
+        if drop:
+            _skinport_catalogue['items'] = None
+            _skinport_catalogue['index'] = None
+            _skinport_catalogue['skins'] = None
+            _skinport_catalogue['etag'] = None
+            _skinport_catalogue['last_modified'] = None
+
+def set_skinport_catalogue_skins(skin_names):
+    """Register the skins a cycle will look up, so one streamed download covers all of them"""
+    with _skinport_catalogue_lock:
+        _skinport_catalogue['cycle_skins'] = set(skin_names)
+
+def get_skinport_catalogue_snapshot(wanted_skins=None):
+    """Get the Skinport catalogue, downloading it at most once per cycle
+
+    With streaming on, only items matching the monitored skins, the cycle's skins and
+    wanted_skins are kept. A snapshot missing any of wanted_skins is refetched wider.
+    """
+    wanted = set(skins if wanted_skins is None else wanted_skins)
+    with _skinport_catalogue_lock:
+        age = time.time() - _skinport_catalogue['fetched_at']
+        fresh = _skinport_catalogue['items'] is not None and age < SKINPORT_CATALOGUE_SETTINGS['max_age']
+        covered = _skinport_catalogue['skins'] is None or wanted <= _skinport_catalogue['skins']
+        if fresh and covered:
+            return _skinport_catalogue
         
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
+        try:
+            rate_limit_request('skinport_catalogue')
             
-            # Look for item cards/listings (these selectors would need to be updated based on actual HTML)
-            item_cards = soup.find_all(['div', 'a'], class_=re.compile(r'item|card|listing', re.I))
+            headers = {
+                'User-Agent': random.choice(USER_AGENTS),
+                'Accept': 'application/json',
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Referer': 'https://skinport.com/',
+                'Origin': 'https://skinport.com'
+            }
             
-            listings = []
-            for card in item_cards[:5]:  # Get first 5
-                try:
-                    # Try to extract price
-                    price_elem = card.find(['span', 'div'], string=re.compile(r'\$\d+', re.I))
-                    if price_elem:
-                        price_text = price_elem.get_text(strip=True)
-                        price_match = re.search(r'\$(\d+\.?\d*)', price_text.replace(',', ''))
-                        
+            streaming = SKINPORT_CATALOGUE_SETTINGS.get('streaming')
+            filter_skins = None
+            if streaming:
+                filter_skins = wanted | set(skins) | _skinport_catalogue['cycle_skins']
+                if fresh and _skinport_catalogue['skins'] is not None:
+                    filter_skins |= _skinport_catalogue['skins']
+            
+            # Streamed downloads bypass the HTTP cache, so a stale snapshot that already
+            # holds every skin we need is revalidated here instead of downloaded again
+            revalidate = streaming and _skinport_catalogue['items'] is not None and (
+                _skinport_catalogue['skins'] is None or filter_skins <= _skinport_catalogue['skins'])
+            if revalidate:
+                if _skinport_catalogue['etag']:
+                    headers['If-None-Match'] = _skinport_catalogue['etag']
+                if _skinport_catalogue['last_modified']:
+                    headers['If-Modified-Since'] = _skinport_catalogue['last_modified']
+            
+            response = http_get('skinport', SKINPORT_CATALOGUE_SETTINGS['url'], headers=headers, timeout=20, stream=streaming)
+            logger.debug("    Catalogue response: %s", response.status_code)
+            
+            if response.status_code == 304 and revalidate:
+                response.close()
+                _skinport_catalogue['fetched_at'] = time.time()
+                increment_metric('arbitrage_http_cache_hits_total', platform='skinport', kind='revalidated')
+                logger.info("    📦 Skinport catalogue unchanged (%s items)", len(_skinport_catalogue['items']))
+                return _skinport_catalogue
+            
+            if response.status_code == 200:
+                if streaming:
+                    # Non-matching items are dropped as soon as they are decoded
+                    is_wanted = build_skin_name_filter(filter_skins)
+                    items = [item for item in iter_json_response_items(
+                        'skinport', response, SKINPORT_CATALOGUE_SETTINGS['chunk_size'], _extract_skinport_items
+                    ) if is_wanted(item)]
+                else:
+                    items = _extract_skinport_items(parse_json_response('skinport', response))
+                
+                # Index once per snapshot so every skin is a dict lookup
+                _skinport_catalogue['items'] = items
+                _skinport_catalogue['index'] = build_skin_name_index(items)
+                _skinport_catalogue['fetched_at'] = time.time()
+                _skinport_catalogue['skins'] = frozenset(filter_skins) if filter_skins is not None else None
+                _skinport_catalogue['etag'] = response.headers.get('ETag')
+                _skinport_catalogue['last_modified'] = response.headers.get('Last-Modified')
+                logger.info("    📦 Skinport catalogue snapshot: %s items", len(items))
+                return _skinport_catalogue
+            
+            response.close()
+            
+            if response.status_code == 429:
+                logger.warning("    Catalogue rate limited, keeping previous snapshot")
+                
+        except requests.exceptions.RequestException as e:
+            logger.warning("    Catalogue request error: %s", e)
+        except ValueError as e:
+            logger.warning("    Catalogue decode error: %s", e)
+        
+        # Serve a stale snapshot rather than nothing
+        if _skinport_catalogue['items'] is not None:
+            return _skinport_catalogue
+        return None
+
+def find_skinport_catalogue_items(snapshot, skin_name):
+    """Look a skin up in a catalogue snapshot"""
+    return match_skin_name(snapshot['index'], skin_name)
+
+def _skinport_catalogue_covers(snapshot, skin_name):
+    """Whether a snapshot is fresh and kept skin_name, so missing from it means not listed"""
+    age = time.time() - snapshot['fetched_at']
+    return age < SKINPORT_CATALOGUE_SETTINGS['max_age'] and (snapshot['skins'] is None or skin_name in snapshot['skins'])
+
+def _parse_skinport_catalogue_items(matching_items):
+    """Convert matching Skinport catalogue items into listings"""
+    listings = []
+    
+    for item in matching_items[:10]:  # Get top 10 matches
+        try:
+            # Skinport price structure analysis
+            price_fields = [
+                'suggested_price',
+                'min_price', 
+                'starting_at',
+                'price',
+                'avg_price'
+            ]
+            
+            price_value = None
+            for field in price_fields:
+                if field in item and item[field]:
+                    price_raw = item[field]
+                    # Handle different price formats
+                    if isinstance(price_raw, (int, float)):
+                        # Prices might be in cents
+                        if price_raw > 100:
+                            price_value = price_raw / 100
+                        else:
+                            price_value = price_raw
+                        break
+                    elif isinstance(price_raw, str):
+                        # Extract number from string
+                        price_match = re.search(r'(\d+\.?\d*)', price_raw.replace(',', ''))
                         if price_match:
-                            price = float(price_match.group(1))
-                            
-                            # Extract other info if available
-                            float_elem = card.find(['span', 'div'], string=re.compile(r'float|wear', re.I))
-                            wear_elem = card.find(['span', 'div'], class_=re.compile(r'wear|condition', re.I))
-                            
-                            listings.append({
-                                'price': price,
-                                'float': float_elem.get_text(strip=True) if float_elem else 'N/A',
-                                'wear': wear_elem.get_text(strip=True) if wear_elem else 'Unknown',
-                                'url': f"https://skinport.com{card.get('href', '')}" if card.get('href') else url,
-                                'platform': 'Skinport',
-                                'id': 'scraped',
-                                'stickers': [],
-                                'screenshot': ''
-                            })
-                            
-                except Exception as parse_error:
-                    continue
+                            price_value = float(price_match.group(1))
+                            if price_value > 100:
+                                price_value = price_value / 100
+                            break
             
-            if listings:
-                print(f"  ✅ Found {len(listings)} Skinport listings via scraping")
-                return listings
+            if price_value and price_value > 0:
+                # Extract additional item info
+                float_value = item.get('wear_value') or item.get('float')
+                exterior = item.get('exterior') or item.get('condition') or 'Unknown'
+                item_id = item.get('id') or item.get('item_id') or 'unknown'
                 
-    except Exception as e:
-        print(f"  ❌ Skinport scraping error: {e}")
+                listings.append(Listing(
+                    float(price_value),
+                    float_value=float_value,
+                    wear=exterior,
+                    listing_id=str(item_id),
+                    platform='Skinport',
+                    screenshot=item.get('image') or item.get('screenshot', ''),
+                    url_template="https://skinport.com/item/{}",
+                    stickers=item.get('stickers')
+                ))
+                
+        except Exception as parse_error:
+            logger.warning("    Error parsing item: %s", parse_error)
+            record_parse_failure('skinport')
+            continue
     
-    return []
+    # Sort by price
+    listings.sort(key=lambda x: x.price)
+    return listings
 
+@instrument_fetcher
 def get_skinport_listings_complete(skin_name):
     """
     Complete Skinport API implementation with all error handling
     Uses the actual working Skinport endpoints
     """
     try:
-        print(f"  🔍 Fetching from Skinport API...")
-        rate_limit_request('skinport', 10.0)  # Conservative rate limiting
+        logger.info("  🔍 Fetching from Skinport API...")
         
         # Clean the skin name for search
         search_term = skin_name.lower().replace('|', '').replace('(', '').replace(')', '').replace('-', ' ').strip()
@@ -575,160 +2630,107 @@ def get_skinport_listings_complete(skin_name):
         
         # Try multiple endpoint approaches
         endpoints = [
-            # Method 1: Direct search
+            # Method 1: Shared catalogue snapshot, filtered in memory
             {
-                'url': f'https://skinport.com/api/data/730',
-                'params': {'search': search_encoded},
-                'method': 'search'
+                'url': SKINPORT_CATALOGUE_SETTINGS['url'],
+                'params': {},
+                'method': 'filter_locally'
             },
-            # Method 2: Get all items for weapon type
+            # Method 2: Direct search
             {
                 'url': f'https://skinport.com/api/data/730',
-                'params': {},
-                'method': 'filter_locally'
+                'params': {'search': search_encoded},
+                'method': 'search'
             }
         ]
         
+        if not SKINPORT_CATALOGUE_SETTINGS.get('enabled'):
+            endpoints = endpoints[1:]
+        
         for attempt, endpoint_config in enumerate(endpoints, 1):
             try:
-                print(f"    Attempt {attempt}: {endpoint_config['method']}")
-                
-                headers = {
-                    'User-Agent': random.choice(USER_AGENTS),
-                    'Accept': 'application/json',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Referer': 'https://skinport.com/',
-                    'Origin': 'https://skinport.com'
-                }
-                
-                response = requests.get(
-                    endpoint_config['url'],
-                    params=endpoint_config['params'],
-                    headers=headers,
-                    timeout=20
-                )
+                logger.debug("    Attempt %s: %s", attempt, endpoint_config['method'])
+                if attempt > 1:
+                    record_retry('skinport')
                 
-                print(f"    Response: {response.status_code}")
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"    Data keys: {list(data.keys()) if isinstance(data, dict) else 'List response'}")
+                authoritative = False
+                if endpoint_config['method'] == 'filter_locally':
+                    snapshot = get_skinport_catalogue_snapshot([skin_name])
+                    if not snapshot:
+                        continue
                     
-                    # Handle different response formats
-                    items = []
-                    if isinstance(data, list):
-                        items = data
-                    elif isinstance(data, dict):
-                        # Try different possible keys
-                        items = (data.get('items') or 
-                                data.get('data') or 
-                                data.get('results') or
-                                [data] if 'market_hash_name' in data else [])
+                    matching_items = find_skinport_catalogue_items(snapshot, skin_name)
+                    # Only a failed or stale snapshot is worth a search request and a scrape
+                    authoritative = _skinport_catalogue_covers(snapshot, skin_name)
+                else:
+                    rate_limit_request('skinport_catalogue')
                     
-                    print(f"    Found {len(items)} total items")
+                    headers = {
+                        'User-Agent': random.choice(USER_AGENTS),
+                        'Accept': 'application/json',
+                        'Accept-Language': 'en-US,en;q=0.9',
+                        'Accept-Encoding': 'gzip, deflate, br',
+                        'Referer': 'https://skinport.com/',
+                        'Origin': 'https://skinport.com'
+                    }
                     
-                    # Filter items that match our skin
-                    matching_items = []
-                    skin_keywords = skin_name.lower().replace('|', '').replace('(', '').replace(')', '').split()
+                    response = http_get(
+                        'skinport',
+                        endpoint_config['url'],
+                        params=endpoint_config['params'],
+                        headers=headers,
+                        timeout=20
+                    )
                     
-                    for item in items:
-                        if not isinstance(item, dict):
-                            continue
-                            
-                        item_name = item.get('market_hash_name', '').lower()
-                        item_name_clean = item_name.replace('|', '').replace('(', '').replace(')', '')
-                        
-                        # Check if all keywords from our skin are in the item name
-                        if all(keyword in item_name_clean for keyword in skin_keywords):
-                            matching_items.append(item)
+                    logger.debug("    Response: %s", response.status_code)
                     
-                    print(f"    Matching items: {len(matching_items)}")
+                    if response.status_code == 429:
+                        logger.warning("    Rate limited, waiting 30 seconds...")
+                        _fetch_sleep(30)
+                        continue
+                    if response.status_code != 200:
+                        continue
                     
-                    if matching_items:
-                        listings = []
-                        
-                        for item in matching_items[:10]:  # Get top 10 matches
-                            try:
-                                # Skinport price structure analysis
-                                price_fields = [
-                                    'suggested_price',
-                                    'min_price', 
-                                    'starting_at',
-                                    'price',
-                                    'avg_price'
-                                ]
-                                
-                                price_value = None
-                                for field in price_fields:
-                                    if field in item and item[field]:
-                                        price_raw = item[field]
-                                        # Handle different price formats
-                                        if isinstance(price_raw, (int, float)):
-                                            # Prices might be in cents
-                                            if price_raw > 100:
-                                                price_value = price_raw / 100
-                                            else:
-                                                price_value = price_raw
-                                            break
-                                        elif isinstance(price_raw, str):
-                                            # Extract number from string
-                                            price_match = re.search(r'(\d+\.?\d*)', price_raw.replace(',', ''))
-                                            if price_match:
-                                                price_value = float(price_match.group(1))
-                                                if price_value > 100:
-                                                    price_value = price_value / 100
-                                                break
-                                
-                                if price_value and price_value > 0:
-                                    # Extract additional item info
-                                    float_value = item.get('wear_value') or item.get('float')
-                                    exterior = item.get('exterior') or item.get('condition') or 'Unknown'
-                                    item_id = item.get('id') or item.get('item_id') or 'unknown'
-                                    
-                                    listing = {
-                                        'price': float(price_value),
-                                        'float': float_value,
-                                        'url': f"https://skinport.com/item/{item_id}",
-                                        'wear': exterior,
-                                        'id': str(item_id),
-                                        'stickers': item.get('stickers', []),
-                                        'screenshot': item.get('image') or item.get('screenshot', ''),
-                                        'platform': 'Skinport'
-                                    }
-                                    listings.append(listing)
-                                    
-                            except Exception as parse_error:
-                                print(f"    Error parsing item: {parse_error}")
-                                continue
-                        
-                        if listings:
-                            # Sort by price
-                            listings.sort(key=lambda x: x['price'])
-                            print(f"  ✅ Skinport: Found {len(listings)} listings")
-                            return listings[:5]  # Return top 5
+                    data = parse_json_response('skinport', response)
+                    logger.debug("    Data keys: %s", list(data.keys()) if isinstance(data, dict) else 'List response')
+                    
+                    # Handle different response formats
+                    items = _extract_skinport_items(data)
+                    logger.debug("    Found %s total items", len(items))
+                    
+                    # Filter items that match our skin
+                    matching_items = match_skin_name(build_skin_name_index(items), skin_name)
                 
-                elif response.status_code == 429:
-                    print(f"    Rate limited, waiting 30 seconds...")
-                    time.sleep(30)
-                    continue
+                logger.debug("    Matching items: %s", len(matching_items))
+                
+                if matching_items:
+                    listings = _parse_skinport_catalogue_items(matching_items)
+                    
+                    if listings:
+                        logger.info("  ✅ Skinport: Found %s listings", len(listings))
+                        return listings[:5]  # Return top 5
+                
+                if authoritative:
+                    logger.info("  ❌ Skinport: Not listed in the catalogue")
+                    return []
                     
             except requests.exceptions.RequestException as e:
-                print(f"    Request error: {e}")
+                logger.warning("    Request error: %s", e)
                 continue
         
-        print(f"  ❌ Skinport: All API methods failed, trying web scraping...")
+        logger.info("  ❌ Skinport: All API methods failed, trying web scraping...")
         return get_skinport_listings_web_scraping(skin_name)
         
     except Exception as e:
-        print(f"  ❌ Skinport Error: {e}")
+        logger.warning("  ❌ Skinport Error: %s", e)
         return get_skinport_listings_web_scraping(skin_name)
 
+@instrument_fetcher
 def get_skinport_listings(skin_name):
     """Get listings from Skinport with comprehensive error handling"""
     try:
-        print(f"  🔍 Fetching Skinport listings...")
-        rate_limit_request('skinport', 3.0)  # Longer delay for Skinport
+        logger.info("  🔍 Fetching Skinport listings...")
+        rate_limit_request('skinport')
         
         # Try multiple API approaches with better parameters
         api_attempts = [
@@ -770,14 +2772,16 @@ def get_skinport_listings(skin_name):
         
         for attempt_num, api_call in enumerate(api_attempts, 1):
             try:
-                print(f"    Attempt {attempt_num}: {api_call['params']}")
-                response = requests.get(api_call['url'], params=api_call['params'], headers=headers, timeout=15)
+                logger.debug("    Attempt %s: %s", attempt_num, api_call['params'])
+                if attempt_num > 1:
+                    record_retry('skinport')
+                response = http_get('skinport', api_call['url'], params=api_call['params'], headers=headers, timeout=15)
                 
-                print(f"    Response status: {response.status_code}")
+                logger.debug("    Response status: %s", response.status_code)
                 
                 if response.status_code == 200:
-                    data = response.json()
-                    print(f"    Response data length: {len(data) if data else 0}")
+                    data = parse_json_response('skinport', response)
+                    logger.debug("    Response data length: %s", len(data) if data else 0)
                     
                     if data and len(data) > 0:
                         listings = []
@@ -788,49 +2792,123 @@ def get_skinport_listings(skin_name):
                                     if price > 100:  # Assume it's in cents
                                         price = price / 100
                                     
-                                    listings.append({
-                                        'price': float(price),
-                                        'float': item.get('float_value', item.get('float')),
-                                        'url': f"https://skinport.com/item/{item.get('id', 'unknown')}",
-                                        'wear': item.get('exterior', item.get('wear_name', 'Unknown')),
-                                        'id': item.get('id', 'unknown'),
-                                        'stickers': item.get('stickers', []),
-                                        'screenshot': item.get('screenshot', '')
-                                    })
+                                    listings.append(Listing(
+                                        float(price),
+                                        float_value=item.get('float_value', item.get('float')),
+                                        wear=item.get('exterior', item.get('wear_name', 'Unknown')),
+                                        listing_id=item.get('id', 'unknown'),
+                                        platform='Skinport',
+                                        screenshot=item.get('screenshot', ''),
+                                        url_template="https://skinport.com/item/{}",
+                                        stickers=item.get('stickers')
+                                    ))
                             except (ValueError, TypeError) as e:
-                                print(f"    Error parsing item: {e}")
+                                logger.warning("    Error parsing item: %s", e)
+                                record_parse_failure('skinport')
                                 continue
                         
                         if listings:
-                            print(f"  ✅ Found {len(listings)} Skinport listings")
+                            logger.info("  ✅ Found %s Skinport listings", len(listings))
                             return listings
                         
                 elif response.status_code == 400:
-                    print(f"  ⚠️ Skinport API method {attempt_num} returned 400, trying next...")
+                    logger.debug("  ⚠️ Skinport API method %s returned 400, trying next...", attempt_num)
                     continue
                 elif response.status_code == 429:
-                    print(f"  ⚠️ Skinport API rate limited, waiting longer...")
-                    time.sleep(15 + random.uniform(0, 10))
+                    logger.warning("  ⚠️ Skinport API rate limited, waiting longer...")
+                    _fetch_sleep(15 + random.uniform(0, 10))
                     continue
                 else:
-                    print(f"  ❌ Skinport API method {attempt_num}: HTTP {response.status_code}")
+                    logger.info("  ❌ Skinport API method %s: HTTP %s", attempt_num, response.status_code)
                     
             except requests.exceptions.RequestException as e:
-                print(f"  ❌ Skinport API method {attempt_num} request error: {e}")
+                logger.warning("  ❌ Skinport API method %s request error: %s", attempt_num, e)
                 continue
         
-        print("  ❌ All Skinport API methods failed, trying web scraping...")
+        logger.info("  ❌ All Skinport API methods failed, trying web scraping...")
         return get_skinport_listings_web_scraping(skin_name)
         
     except Exception as e:
-        print(f"[Skinport Error] {skin_name}: {e}")
+        logger.warning("[Skinport Error] %s: %s", skin_name, e)
         return get_skinport_listings_web_scraping(skin_name)
 
+def _parse_csfloat_item(item):
+    """Convert one CSFloat item into a Listing, or None without a usable price"""
+    price = item.get('price', item.get('suggested_price', item.get('listing_price', 0)))
+    if not isinstance(price, (int, float)):
+        return None
+    if price > 100:  # Assume it's in cents
+        price = price / 100
+    
+    return Listing(
+        float(price),
+        float_value=item.get('float_value', item.get('float', item.get('wear_value'))),
+        wear=item.get('wear_name', item.get('exterior', item.get('condition', 'Unknown'))),
+        listing_id=item.get('id', item.get('listing_id', 'unknown')),
+        platform='CSFloat',
+        screenshot=item.get('screenshot', item.get('image_url', '')),
+        url_template="https://csfloat.com/item/{}",
+        stickers=item.get('stickers')
+    )
+
+def _fetch_csfloat_attempt(attempt_num, api_call, headers):
+    """Try one CSFloat endpoint, returning its listings or None"""
+    rate_limit_request('csfloat')
+    try:
+        logger.debug("    Attempt %s: %s", attempt_num, api_call['params'])
+        response = http_get('csfloat', api_call['url'], params=api_call['params'], headers=headers, timeout=15)
+        
+        logger.debug("    Response status: %s", response.status_code)
+        
+        if response.status_code == 200:
+            data = parse_json_response('csfloat', response)
+            logger.debug("    Raw response keys: %s", data.keys() if isinstance(data, dict) else 'List response')
+            
+            # Handle different response formats
+            items = []
+            if isinstance(data, list):
+                items = data
+            elif isinstance(data, dict):
+                items = data.get('data', data.get('items', data.get('results', data.get('listings', []))))
+            
+            logger.debug("    Found %s items", len(items))
+            
+            if items and len(items) > 0:
+                listings = []
+                for item in items[:5]:  # Get top 5 listings
+                    try:
+                        listing = _parse_csfloat_item(item)
+                        if listing:
+                            listings.append(listing)
+                    except (ValueError, TypeError) as e:
+                        logger.warning("    Error parsing item: %s", e)
+                        record_parse_failure('csfloat')
+                        continue
+                
+                if listings:
+                    logger.info("  ✅ Found %s CSFloat listings", len(listings))
+                    return listings
+        
+        elif response.status_code == 404:
+            logger.debug("  ⚠️ CSFloat API method %s: Item not found, trying next...", attempt_num)
+            return None
+        elif response.status_code == 429:
+            logger.warning("  ⚠️ CSFloat API rate limited, waiting...")
+            _fetch_sleep(10 + random.uniform(0, 5))
+            return None
+        else:
+            logger.info("  ❌ CSFloat API method %s: HTTP %s", attempt_num, response.status_code)
+            
+    except requests.exceptions.RequestException as e:
+        logger.warning("  ❌ CSFloat API method %s request error: %s", attempt_num, e)
+    
+    return None
+
+@instrument_fetcher
 def get_csfloat_listings(skin_name):
     """Get listings from CSFloat with comprehensive error handling"""
     try:
-        print(f"  🔍 Fetching CSFloat listings...")
-        rate_limit_request('csfloat', 2.0)
+        logger.info("  🔍 Fetching CSFloat listings...")
         
         # Try multiple API approaches
         api_attempts = [
@@ -879,78 +2957,26 @@ def get_csfloat_listings(skin_name):
         if API_KEYS.get('csfloat'):
             headers['Authorization'] = f"Bearer {API_KEYS['csfloat']}"
         
-        for attempt_num, api_call in enumerate(api_attempts, 1):
-            try:
-                print(f"    Attempt {attempt_num}: {api_call['params']}")
-                response = requests.get(api_call['url'], params=api_call['params'], headers=headers, timeout=15)
-                
-                print(f"    Response status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"    Raw response keys: {data.keys() if isinstance(data, dict) else 'List response'}")
-                    
-                    # Handle different response formats
-                    items = []
-                    if isinstance(data, list):
-                        items = data
-                    elif isinstance(data, dict):
-                        items = data.get('data', data.get('items', data.get('results', data.get('listings', []))))
-                    
-                    print(f"    Found {len(items)} items")
-                    
-                    if items and len(items) > 0:
-                        listings = []
-                        for item in items[:5]:  # Get top 5 listings
-                            try:
-                                price = item.get('price', item.get('suggested_price', item.get('listing_price', 0)))
-                                if isinstance(price, (int, float)):
-                                    if price > 100:  # Assume it's in cents
-                                        price = price / 100
-                                    
-                                    listings.append({
-                                        'price': float(price),
-                                        'float': item.get('float_value', item.get('float', item.get('wear_value'))),
-                                        'url': f"https://csfloat.com/item/{item.get('id', item.get('listing_id', 'unknown'))}",
-                                        'wear': item.get('wear_name', item.get('exterior', item.get('condition', 'Unknown'))),
-                                        'id': item.get('id', item.get('listing_id', 'unknown')),
-                                        'stickers': item.get('stickers', []),
-                                        'screenshot': item.get('screenshot', item.get('image_url', ''))
-                                    })
-                            except (ValueError, TypeError) as e:
-                                print(f"    Error parsing item: {e}")
-                                continue
-                        
-                        if listings:
-                            print(f"  ✅ Found {len(listings)} CSFloat listings")
-                            return listings
-                
-                elif response.status_code == 404:
-                    print(f"  ⚠️ CSFloat API method {attempt_num}: Item not found, trying next...")
-                    continue
-                elif response.status_code == 429:
-                    print(f"  ⚠️ CSFloat API rate limited, waiting...")
-                    time.sleep(10 + random.uniform(0, 5))
-                    continue
-                else:
-                    print(f"  ❌ CSFloat API method {attempt_num}: HTTP {response.status_code}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"  ❌ CSFloat API method {attempt_num} request error: {e}")
-                continue
+        listings = run_fallback_chain([
+            functools.partial(_fetch_csfloat_attempt, attempt_num, api_call, headers)
+            for attempt_num, api_call in enumerate(api_attempts, 1)
+        ], platform='csfloat')
+        if listings:
+            return listings
         
-        print("  ❌ All CSFloat API methods failed")
+        logger.info("  ❌ All CSFloat API methods failed")
         
     except Exception as e:
-        print(f"[CSFloat Error] {skin_name}: {e}")
+        logger.warning("[CSFloat Error] %s: %s", skin_name, e)
     
     return []
 
+@instrument_fetcher
 def get_bitskins_listings(skin_name):
     """Get listings from BitSkins (if API available)"""
     try:
-        print(f"  🔍 Fetching BitSkins listings...")
-        rate_limit_request('bitskins', 2.0)
+        logger.info("  🔍 Fetching BitSkins listings...")
+        rate_limit_request('bitskins')
         
         # BitSkins API endpoint (requires API key)
         url = "https://bitskins.com/api/v1/get_inventory_on_sale/"
@@ -965,118 +2991,284 @@ def get_bitskins_listings(skin_name):
         if API_KEYS.get('bitskins'):
             params['api_key'] = API_KEYS['bitskins']
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_get('bitskins', url, params=params, headers=headers, timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json_response('bitskins', response)
             if data.get('status') == 'success' and data.get('data'):
                 items = data['data']['items'][:5]  # Top 5
                 listings = []
                 
                 for item in items:
                     try:
-                        listings.append({
-                            'price': float(item.get('price', 0)),
-                            'float': item.get('float_value'),
-                            'url': f"https://bitskins.com/view_item?item_id={item.get('item_id', 'unknown')}",
-                            'wear': item.get('exterior', 'Unknown'),
-                            'id': item.get('item_id', 'unknown'),
-                            'stickers': item.get('stickers', []),
-                            'screenshot': item.get('image', '')
-                        })
+                        listings.append(Listing(
+                            float(item.get('price', 0)),
+                            float_value=item.get('float_value'),
+                            wear=item.get('exterior', 'Unknown'),
+                            listing_id=item.get('item_id', 'unknown'),
+                            platform='BitSkins',
+                            screenshot=item.get('image', ''),
+                            url_template="https://bitskins.com/view_item?item_id={}",
+                            stickers=item.get('stickers')
+                        ))
                     except (ValueError, TypeError):
+                        record_parse_failure('bitskins')
                         continue
                 
                 if listings:
-                    print(f"  ✅ Found {len(listings)} BitSkins listings")
+                    logger.info("  ✅ Found %s BitSkins listings", len(listings))
                     return listings
         
     except Exception as e:
-        print(f"  ❌ BitSkins Error: {e}")
+        logger.warning("  ❌ BitSkins Error: %s", e)
     
     return []
 
+DMARKET_ITEMS_URL = "https://api.dmarket.com/exchange/v1/market/items"
+DMARKET_GAME_ID = 'a8db3d44-6c42-4b44-b9c3-e1dff1a9ed3c'  # CS:GO game ID
+
+def _dmarket_headers():
+    """Headers DMarket's market API expects"""
+    headers = get_headers()
+    headers.update({
+        'Accept': 'application/json',
+        'Origin': 'https://dmarket.com',
+        'Referer': 'https://dmarket.com/'
+    })
+    return headers
+
+def _parse_dmarket_item(item):
+    """Convert one DMarket object into a Listing, or None without a usable price"""
+    # DMarket prices are in cents
+    price_cents = item.get('price', {}).get('USD', 0)
+    if float(price_cents) <= 0:
+        return None
+    
+    extra = item.get('extra', {})
+    return Listing(
+        float(price_cents) / 100,
+        float_value=extra.get('floatValue'),
+        wear=extra.get('exterior', 'Unknown'),
+        listing_id=item.get('itemId', 'unknown'),
+        platform='DMarket',
+        screenshot=item.get('image', ''),
+        url_template="https://dmarket.com/ingame-items/item-detail/{}",
+        stickers=extra.get('stickers')
+    )
+
+@instrument_fetcher
 def get_dmarket_listings(skin_name):
     """Get listings from DMarket with fixed parameters"""
     try:
-        print(f"  🔍 Fetching DMarket listings...")
-        rate_limit_request('dmarket', 2.0)
+        logger.info("  🔍 Fetching DMarket listings...")
+        rate_limit_request('dmarket')
         
         # DMarket API endpoint with corrected parameters
-        url = "https://api.dmarket.com/exchange/v1/market/items"
+        url = DMARKET_ITEMS_URL
         params = {
             'side': 'market',
             'orderBy': 'price',
             'orderDir': 'asc',
             'title': skin_name,
             'priceFrom': 0,
-            'priceTo': 50000,  # $500 max in cents
-            'gameId': 'a8db3d44-6c42-4b44-b9c3-e1dff1a9ed3c',  # CS:GO game ID
+            'gameId': DMARKET_GAME_ID,
             'currency': 'USD',
             'platform': 'browser',
             'limit': 5
         }
         
-        headers = get_headers()
-        headers.update({
-            'Accept': 'application/json',
-            'Origin': 'https://dmarket.com',
-            'Referer': 'https://dmarket.com/'
-        })
-        
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = http_get('dmarket', url, params=params, headers=_dmarket_headers(), timeout=15)
         
-        print(f"    DMarket Response status: {response.status_code}")
+        logger.debug("    DMarket Response status: %s", response.status_code)
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json_response('dmarket', response)
             
             if data.get('objects'):
                 listings = []
                 
                 for item in data['objects'][:5]:
                     try:
-                        # DMarket prices are in cents
-                        price_cents = item.get('price', {}).get('USD', 0)
-                        if price_cents > 0:
-                            price_usd = float(price_cents) / 100
-                            
-                            listings.append({
-                                'price': price_usd,
-                                'float': item.get('extra', {}).get('floatValue'),
-                                'url': f"https://dmarket.com/ingame-items/item-detail/{item.get('itemId', 'unknown')}",
-                                'wear': item.get('extra', {}).get('exterior', 'Unknown'),
-                                'id': item.get('itemId', 'unknown'),
-                                'stickers': item.get('extra', {}).get('stickers', []),
-                                'screenshot': item.get('image', '')
-                            })
+                        listing = _parse_dmarket_item(item)
+                        if listing:
+                            listings.append(listing)
                     except (ValueError, TypeError, KeyError):
+                        record_parse_failure('dmarket')
                         continue
                 
                 if listings:
-                    print(f"  ✅ Found {len(listings)} DMarket listings")
+                    logger.info("  ✅ Found %s DMarket listings", len(listings))
                     return listings
             else:
-                print(f"    DMarket: No objects in response")
+                logger.debug("    DMarket: No objects in response")
                 
         elif response.status_code == 429:
-            print(f"  ⚠️ DMarket API rate limited, waiting...")
-            time.sleep(15)
+            logger.warning("  ⚠️ DMarket API rate limited, waiting...")
+            _fetch_sleep(15)
         else:
-            print(f"  ❌ DMarket: HTTP {response.status_code}")
-            print(f"  Response: {response.text[:200]}")
+            logger.info("  ❌ DMarket: HTTP %s", response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("  Response: %s", response.text[:200])
                     
     except Exception as e:
-        print(f"  ❌ DMarket Error: {e}")
+        logger.warning("  ❌ DMarket Error: %s", e)
     
     return []
 
-def calculate_profit_margin(market_price, reference_price, platform="Unknown"):
-    """Calculate if the deal is profitable (market price <= 90% of reference price)"""
+# Full order-book depth mode
+ORDER_BOOK_SETTINGS = {
+    'enabled': False,  # Page through CSFloat and DMarket instead of taking the top 5
+    'page_size': 50,   # Listings requested per page
+    'max_pages': 20    # Hard stop, even if every listing is still under break-even
+}
+
+def get_break_even_price(reference_price):
+    """Highest listing price that is still a deal under DEAL_SETTINGS' target ratio and minimum profit"""
+    return min(reference_price * DEAL_SETTINGS['target_ratio'], reference_price - DEAL_SETTINGS['min_profit'])
+
+def iter_csfloat_listing_pages(skin_name, max_price=None):
+    """Yield CSFloat listings page by page, cheapest first"""
+    headers = get_headers()
+    if API_KEYS.get('csfloat'):
+        headers['Authorization'] = f"Bearer {API_KEYS['csfloat']}"
+    
+    page_size = ORDER_BOOK_SETTINGS['page_size']
+    for page in range(ORDER_BOOK_SETTINGS['max_pages']):
+        rate_limit_request('csfloat')
+        params = {
+            'market_hash_name': skin_name,
+            'limit': page_size,
+            'page': page,
+            'sort_by': 'lowest_price'
+        }
+        if max_price is not None:
+            params['max_price'] = int(max_price * 100)  # Cents
+        
+        response = http_get('csfloat', 'https://csfloat.com/api/v1/listings', params=params, headers=headers, timeout=15)
+        if response.status_code != 200:
+            logger.debug("    CSFloat depth page %s: HTTP %s", page + 1, response.status_code)
+            return
+        
+        data = parse_json_response('csfloat', response)
+        items = data if isinstance(data, list) else data.get('data', data.get('listings', []))
+        listings = [listing for listing in map(_parse_csfloat_item, items) if listing]
+        if listings:
+            yield listings
+        if len(items) < page_size:
+            return
+
+def iter_dmarket_listing_pages(skin_name, max_price=None):
+    """Yield DMarket listings page by page, cheapest first"""
+    headers = _dmarket_headers()
+    cursor = None
+    
+    for page in range(ORDER_BOOK_SETTINGS['max_pages']):
+        rate_limit_request('dmarket')
+        params = {
+            'side': 'market',
+            'orderBy': 'price',
+            'orderDir': 'asc',
+            'title': skin_name,
+            'priceFrom': 0,
+            'gameId': DMARKET_GAME_ID,
+            'currency': 'USD',
+            'platform': 'browser',
+            'limit': ORDER_BOOK_SETTINGS['page_size']
+        }
+        # Let DMarket drop everything above break-even server-side, instead of a fixed cap
+        if max_price is not None:
+            params['priceTo'] = int(max_price * 100) + 1
+        if cursor:
+            params['cursor'] = cursor
+        
+        response = http_get('dmarket', DMARKET_ITEMS_URL, params=params, headers=headers, timeout=15)
+        if response.status_code != 200:
+            logger.debug("    DMarket depth page %s: HTTP %s", page + 1, response.status_code)
+            return
+        
+        data = parse_json_response('dmarket', response)
+        listings = [listing for listing in map(_parse_dmarket_item, data.get('objects') or []) if listing]
+        if listings:
+            yield listings
+        
+        cursor = data.get('cursor')
+        if not cursor:
+            return
+
+def collect_order_book(pages, break_even_price):
+    """Take listings from a page generator until prices pass break-even"""
+    collected = []
+    try:
+        for page in pages:
+            for listing in page:
+                collected.append(listing)
+                if listing.price > break_even_price:
+                    # Keep the first miss for context and download nothing more
+                    return collected
+    except Exception as e:
+        logger.warning("    Order book error: %s", e)
+    finally:
+        pages.close()
+    return collected
+
+@instrument_fetcher
+def get_csfloat_order_book(skin_name, reference_price):
+    """Every CSFloat listing up to break-even for the reference price"""
+    logger.info("  🔍 Fetching CSFloat order book...")
+    break_even = get_break_even_price(reference_price)
+    if break_even <= 0:
+        # Too cheap for any listing to clear the minimum profit - don't send a negative price cap
+        logger.info("  ⏭️ CSFloat order book skipped: break-even $%.2f", break_even)
+        return []
+    listings = collect_order_book(iter_csfloat_listing_pages(skin_name, break_even), break_even)
+    logger.info("  ✅ CSFloat order book: %s listings up to $%.2f", len(listings), break_even)
+    return listings
+
+@instrument_fetcher
+def get_dmarket_order_book(skin_name, reference_price):
+    """Every DMarket listing up to break-even for the reference price"""
+    logger.info("  🔍 Fetching DMarket order book...")
+    break_even = get_break_even_price(reference_price)
+    if break_even <= 0:
+        # A negative priceTo would be sent otherwise
+        logger.info("  ⏭️ DMarket order book skipped: break-even $%.2f", break_even)
+        return []
+    listings = collect_order_book(iter_dmarket_listing_pages(skin_name, break_even), break_even)
+    logger.info("  ✅ DMarket order book: %s listings up to $%.2f", len(listings), break_even)
+    return listings
+
+ORDER_BOOK_FETCHERS = {
+    'CSFloat': get_csfloat_order_book,
+    'DMarket': get_dmarket_order_book
+}
+
+def get_listing_platforms(reference_info):
+    """Listing platforms for a skin, using order-book depth where enabled"""
+    if not ORDER_BOOK_SETTINGS.get('enabled'):
+        return LISTING_PLATFORMS
+    
+    return [
+        (platform_name, functools.partial(ORDER_BOOK_FETCHERS[platform_name], reference_price=reference_info['price_usd'])
+         if platform_name in ORDER_BOOK_FETCHERS else get_listings_func)
+        for platform_name, get_listings_func in LISTING_PLATFORMS
+    ]
+
+# Listing platforms checked for every skin
+LISTING_PLATFORMS = [
+    ("Skinport", get_skinport_listings_complete),
+    ("CSFloat", get_csfloat_listings),
+    ("BitSkins", get_bitskins_listings),
+    ("DMarket", get_dmarket_listings)
+]
+
+def calculate_profit_margin(market_price, reference_price, platform="Unknown", target_ratio=None):
+    """Calculate if the deal is profitable (market price <= target ratio of reference price)"""
     if not reference_price or reference_price == 0 or not market_price or market_price == 0:
         return False, 0, 0
     
-    target_price = reference_price * 0.9  # 90% of reference price
+    if target_ratio is None:
+        target_ratio = DEAL_SETTINGS['target_ratio']
+    target_price = reference_price * target_ratio
     profit_potential = reference_price - market_price
     
     # Avoid division by zero
@@ -1098,31 +3290,102 @@ def calculate_roi(purchase_price, sell_price, fees_percentage=0.15):
     roi = ((net_sell_price - purchase_price) / purchase_price) * 100
     return roi
 
+# Deal thresholds and platform fees
+DEAL_SETTINGS = {
+    'target_ratio': 0.9,  # Buy at or below 90% of the reference price
+    'min_profit': 2.0     # Minimum profit in USD for a deal to count
+}
+
+PLATFORM_FEES = {
+    'default': 0.15  # Fraction of the sell price lost to fees, per platform name
+}
+
+def get_platform_fee(platform):
+    """Get the fee rate used for ROI on a platform"""
+    return PLATFORM_FEES.get(platform, PLATFORM_FEES['default'])
+
+def evaluate_listings_batch(listing_prices, reference_prices, fee_rates=None,
+                            target_ratio=None, min_profit=None):
+    """
+    Evaluate many listings at once
+    Returns profit, profit %, ROI and the profitable mask, plus listing
+    indices ranked by profit (profitable listings first)
+    """
+    if fee_rates is None:
+        fee_rates = PLATFORM_FEES['default']
+    if target_ratio is None:
+        target_ratio = DEAL_SETTINGS['target_ratio']
+    if min_profit is None:
+        min_profit = DEAL_SETTINGS['min_profit']
+    
+    np = _optional_module('numpy')
+    if np is not None:
+        market = np.asarray(listing_prices, dtype=float)
+        reference = np.broadcast_to(np.asarray(reference_prices, dtype=float), market.shape)
+        fees = np.broadcast_to(np.asarray(fee_rates, dtype=float), market.shape)
+        
+        # Same rules as calculate_profit_margin: missing prices are never a deal
+        valid = (market > 0) & (reference > 0)
+        safe_market = np.where(valid, market, 1.0)
+        profit = np.where(valid, reference - market, 0.0)
+        profit_pct = np.where(valid, profit / safe_market * 100, 0.0)
+        roi = np.where(valid, (reference * (1 - fees) - market) / safe_market * 100, 0.0)
+        profitable = valid & (market <= reference * target_ratio) & (profit > min_profit)
+        
+        # Profitable listings first, then by profit, best first
+        ranking = np.lexsort((-profit, ~profitable))
+        return {
+            'profit': profit,
+            'profit_pct': profit_pct,
+            'roi': roi,
+            'profitable': profitable,
+            'ranking': ranking
+        }
+    
+    count = len(listing_prices)
+    if not isinstance(reference_prices, (list, tuple)):
+        reference_prices = [reference_prices] * count
+    if not isinstance(fee_rates, (list, tuple)):
+        fee_rates = [fee_rates] * count
+    
+    results = {'profit': [], 'profit_pct': [], 'roi': [], 'profitable': []}
+    for market_price, reference_price, fee_rate in zip(listing_prices, reference_prices, fee_rates):
+        is_profitable, profit_potential, profit_percentage = calculate_profit_margin(
+            market_price, reference_price, target_ratio=target_ratio)
+        results['profit'].append(profit_potential)
+        results['profit_pct'].append(profit_percentage)
+        results['roi'].append(calculate_roi(market_price, reference_price, fee_rate) if reference_price else 0)
+        results['profitable'].append(is_profitable and profit_potential > min_profit)
+    
+    results['ranking'] = sorted(range(count), key=lambda i: (not results['profitable'][i], -results['profit'][i]))
+    return results
+
 def alert_profitable_deal(skin_name, platform, listing, reference_info, profit_potential, profit_percentage):
     """Alert when a profitable deal is found"""
-    print(f"\n" + "="*60)
-    print(f"🚨💰 PROFITABLE DEAL FOUND! 💰🚨")
-    print(f"="*60)
-    print(f"📦 Skin: {skin_name}")
-    print(f"🏪 Platform: {platform}")
-    print(f"💲 Market Price: ${listing['price']:.2f}")
-    print(f"📊 Reference Price: ${reference_info['price_usd']:.2f}")
-    print(f"🎯 Float Value: {listing.get('float', 'N/A')}")
-    print(f"👕 Wear: {listing.get('wear', 'N/A')}")
-    print(f"💰 Profit Potential: ${profit_potential:.2f} ({profit_percentage:.1f}%)")
-    
-    # Calculate ROI with typical platform fees
-    roi = calculate_roi(listing['price'], reference_info['price_usd'])
-    print(f"📈 ROI (after 15% fees): {roi:.1f}%")
-    
-    print(f"🛒 BUY NOW: {listing['url']}")
-    print(f"📈 Reference: {reference_info['url']}")
+    logger.log(DEAL, "\n" + "=" * 60)
+    logger.log(DEAL, "🚨💰 PROFITABLE DEAL FOUND! 💰🚨")
+    logger.log(DEAL, "=" * 60)
+    logger.log(DEAL, "📦 Skin: %s", skin_name)
+    logger.log(DEAL, "🏪 Platform: %s", platform)
+    logger.log(DEAL, "💲 Market Price: $%.2f", listing['price'])
+    logger.log(DEAL, "📊 Reference Price: $%.2f", reference_info['price_usd'])
+    logger.log(DEAL, "🎯 Float Value: %s", listing.get('float', 'N/A'))
+    logger.log(DEAL, "👕 Wear: %s", listing.get('wear', 'N/A'))
+    logger.log(DEAL, "💰 Profit Potential: $%.2f (%.1f%%)", profit_potential, profit_percentage)
+    
+    # Calculate ROI with the platform's fees
+    fee_rate = get_platform_fee(platform)
+    roi = calculate_roi(listing['price'], reference_info['price_usd'], fee_rate)
+    logger.log(DEAL, "📈 ROI (after %.0f%% fees): %.1f%%", fee_rate * 100, roi)
+    
+    logger.log(DEAL, "🛒 BUY NOW: %s", listing['url'])
+    logger.log(DEAL, "📈 Reference: %s", reference_info['url'])
     
     # Add sticker info if available
     if listing.get('stickers'):
-        print(f"🏷️  Stickers: {len(listing['stickers'])} stickers")
+        logger.log(DEAL, "🏷️  Stickers: %s stickers", len(listing['stickers']))
     
-    print(f"="*60)
+    logger.log(DEAL, "=" * 60)
     
     # Sound alert - triple beep for profit
     try:
@@ -1131,92 +3394,442 @@ def alert_profitable_deal(skin_name, platform, listing, reference_info, profit_p
                 winsound.Beep(1200, 300)
                 time.sleep(0.1)
         else:
-            print("🔊🔊🔊 PROFIT ALERT! 🔊🔊🔊")
+            logger.log(DEAL, "🔊🔊🔊 PROFIT ALERT! 🔊🔊🔊")
     except:
-        print("🔊🔊🔊 PROFIT ALERT! 🔊🔊🔊")
+        logger.log(DEAL, "🔊🔊🔊 PROFIT ALERT! 🔊🔊🔊")
+
+def fetch_all_platform_listings(skin_name, platforms=None):
+    """Fetch listings from every platform, concurrently when enabled"""
+    if platforms is None:
+        platforms = LISTING_PLATFORMS
+    
+    results = {}
+    
+    if not CONCURRENCY_SETTINGS.get('enabled') or len(platforms) < 2:
+        for platform_name, get_listings_func in platforms:
+            results[platform_name] = get_listings_func(skin_name)
+        return results
+    
+    # Each platform keeps its own rate limit budget, so the slowest
+    # platform sets the pace instead of the sum of all of them
+    max_workers = max(1, min(CONCURRENCY_SETTINGS.get('max_workers', 4), len(platforms)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='platform') as executor:
+        futures = {
+            platform_name: executor.submit(get_listings_func, skin_name)
+            for platform_name, get_listings_func in platforms
+        }
+        
+        for platform_name, future in futures.items():
+            try:
+                results[platform_name] = future.result()
+            except Exception as e:
+                logger.warning("  ❌ %s Error: %s", platform_name, e)
+                results[platform_name] = []
+    
+    return results
 
 def check_skin_arbitrage(skin_name):
     """Main function to check arbitrage opportunities for a skin"""
-    print(f"\n{'='*60}")
-    print(f"🔍 ANALYZING: {skin_name}")
-    print(f"{'='*60}")
+    logger.info("\n" + "=" * 60)
+    logger.info("🔍 ANALYZING: %s", skin_name)
+    logger.info("=" * 60)
     
     # Get reference price from Steam Market or other sources
     reference_info = get_reference_price(skin_name)
     if not reference_info:
-        print(f"❌ Could not get reference price for {skin_name}")
-        print(f"⚠️ Skipping arbitrage check...")
+        logger.info("❌ Could not get reference price for %s", skin_name)
+        logger.info("⚠️ Skipping arbitrage check...")
+        record_skin_check(skin_name, None, {}, False)
         return False
     
-    print(f"📊 Reference Price: ${reference_info['price_usd']:.2f} USD")
-    target_price = reference_info['price_usd'] * 0.9
-    print(f"🎯 Target Price (90%): ${target_price:.2f} USD")
-    print(f"💰 Looking for deals under ${target_price:.2f} with $2+ profit...")
+    logger.info("📊 Reference Price: $%.2f USD", reference_info['price_usd'])
+    target_price = reference_info['price_usd'] * DEAL_SETTINGS['target_ratio']
+    logger.info("🎯 Target Price (%.0f%%): $%.2f USD", DEAL_SETTINGS['target_ratio'] * 100, target_price)
+    logger.info("💰 Looking for deals under $%.2f with $%.2f+ profit...", target_price, DEAL_SETTINGS['min_profit'])
+    
+    platform_listings = fetch_all_platform_listings(skin_name, get_listing_platforms(reference_info))
     
+    profitable_found = evaluate_platform_listings(skin_name, reference_info, platform_listings)
+    record_skin_check(skin_name, reference_info, platform_listings, profitable_found)
+    return profitable_found
+
+def evaluate_platform_listings(skin_name, reference_info, platform_listings):
+    """Check fetched listings against the reference price and alert on deals"""
     profitable_found = False
     
-    # List of platforms to check
-    platforms = [
-        ("Skinport", get_skinport_listings_complete),
-        ("CSFloat", get_csfloat_listings),
-        ("BitSkins", get_bitskins_listings),
-        ("DMarket", get_dmarket_listings)
+    # Evaluate every listing from every platform in one batch
+    rows = [
+        (platform_name, listing)
+        for platform_name, _ in LISTING_PLATFORMS
+        for listing in platform_listings.get(platform_name) or []
     ]
+    results = evaluate_listings_batch(
+        [listing['price'] for _, listing in rows],
+        reference_info['price_usd'],
+        [get_platform_fee(platform_name) for platform_name, _ in rows]
+    )
     
-    for platform_name, get_listings_func in platforms:
-        print(f"\n🏪 CHECKING {platform_name.upper()}:")
-        print("-" * 40)
+    row_index = 0
+    for platform_name, _ in LISTING_PLATFORMS:
+        logger.info("\n🏪 CHECKING %s:", platform_name.upper())
+        logger.info("-" * 40)
         
-        listings = get_listings_func(skin_name)
+        listings = platform_listings.get(platform_name)
         
         if listings:
             for i, listing in enumerate(listings, 1):
-                is_profitable, profit_potential, profit_percentage = calculate_profit_margin(
-                    listing['price'], reference_info['price_usd'], platform_name
-                )
+                record_price_observation(skin_name, platform_name, listing['price'], listing.get('float'))
                 
-                status = "✅ PROFITABLE!" if (is_profitable and profit_potential > 2) else "❌ Not profitable"
-                float_info = f"Float: {listing.get('float', 'N/A')}"
-                sticker_info = f"Stickers: {len(listing.get('stickers', []))}" if listing.get('stickers') else ""
+                is_deal = bool(results['profitable'][row_index])
+                profit_potential = float(results['profit'][row_index])
+                profit_percentage = float(results['profit_pct'][row_index])
+                row_index += 1
                 
-                print(f"  [{i}] ${listing['price']:.2f} | {float_info} | {sticker_info} | {status}")
+                # Skip building the per-listing line entirely unless it will be shown
+                if logger.isEnabledFor(logging.INFO):
+                    status = "✅ PROFITABLE!" if is_deal else "❌ Not profitable"
+                    sticker_info = f"Stickers: {len(listing['stickers'])}" if listing.get('stickers') else ""
+                    logger.info("  [%s] $%.2f | Float: %s | %s | %s", i, listing['price'], listing.get('float', 'N/A'), sticker_info, status)
                 
-                if is_profitable and profit_potential > 2:  # At least $2 profit
+                if is_deal:  # Under the target ratio with at least min_profit
                     alert_profitable_deal(skin_name, platform_name, listing, reference_info, profit_potential, profit_percentage)
                     save_opportunity_to_log(skin_name, platform_name, listing, reference_info, profit_potential)
                     profitable_found = True
         else:
-            print(f"  ❌ No {platform_name} listings found")
+            logger.info("  ❌ No %s listings found", platform_name)
     
     # Summary
     if not profitable_found:
-        print(f"\n❌ No profitable deals found for {skin_name}")
+        logger.info("\n❌ No profitable deals found for %s", skin_name)
     else:
-        print(f"\n✅ Found profitable opportunities for {skin_name}!")
+        logger.info("\n✅ Found profitable opportunities for %s!", skin_name)
+    
+    return profitable_found
+
+# Asyncio fetch engine
+ASYNC_ENGINE_SETTINGS = {
+    'max_workers': 32,          # Worker threads running blocking fetchers
+    'max_skin_concurrency': 8,  # Skins analysed at the same time in one cycle
+    'request_timeout': 45.0     # Seconds before a single fetch is abandoned
+}
+
+_async_executor = None
+_async_executor_lock = threading.Lock()
+
+def _get_async_executor():
+    """Get the worker pool shared by all async fetches"""
+    global _async_executor
+    with _async_executor_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(
+                max_workers=ASYNC_ENGINE_SETTINGS['max_workers'],
+                thread_name_prefix='fetch'
+            )
+        return _async_executor
+
+def _run_in_fetch_context(cancel_event, deadline, func, args):
+    """Run a fetcher with the cancellation context of its async task"""
+    _fetch_context.cancel_event = cancel_event
+    _fetch_context.deadline = deadline
+    try:
+        return func(*args)
+    finally:
+        _fetch_context.cancel_event = None
+        _fetch_context.deadline = None
+
+async def run_fetch(func, *args, timeout=None):
+    """Await a blocking fetcher with a deadline and cooperative cancellation"""
+    if timeout is None:
+        timeout = ASYNC_ENGINE_SETTINGS['request_timeout']
+    
+    cancel_event = threading.Event()
+    deadline = time.monotonic() + timeout if timeout else None
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        _get_async_executor(), _run_in_fetch_context, cancel_event, deadline, func, args
+    )
+    
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        # The worker stops at its next request, sleep or rate limit check
+        cancel_event.set()
+        raise
+
+async def _async_fetch_or_default(func, skin_name, default, label, timeout):
+    """Run a fetcher on the engine, returning a default on timeout or error"""
+    try:
+        return await run_fetch(func, skin_name, timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning("  ⏰ %s timed out for %s", label, skin_name)
+    except Exception as e:
+        logger.warning("  ❌ %s Error: %s", label, e)
+    return default
+
+async def async_get_reference_price(skin_name, timeout=None):
+    """Async version of get_reference_price"""
+    return await _async_fetch_or_default(get_reference_price, skin_name, None, "Reference price", timeout)
+
+async def async_get_skinport_listings(skin_name, timeout=None):
+    """Async version of get_skinport_listings"""
+    return await _async_fetch_or_default(get_skinport_listings, skin_name, [], "Skinport", timeout)
+
+async def async_get_skinport_listings_complete(skin_name, timeout=None):
+    """Async version of get_skinport_listings_complete"""
+    return await _async_fetch_or_default(get_skinport_listings_complete, skin_name, [], "Skinport", timeout)
+
+async def async_get_csfloat_listings(skin_name, timeout=None):
+    """Async version of get_csfloat_listings"""
+    return await _async_fetch_or_default(get_csfloat_listings, skin_name, [], "CSFloat", timeout)
+
+async def async_get_bitskins_listings(skin_name, timeout=None):
+    """Async version of get_bitskins_listings"""
+    return await _async_fetch_or_default(get_bitskins_listings, skin_name, [], "BitSkins", timeout)
+
+async def async_get_dmarket_listings(skin_name, timeout=None):
+    """Async version of get_dmarket_listings"""
+    return await _async_fetch_or_default(get_dmarket_listings, skin_name, [], "DMarket", timeout)
+
+async def async_fetch_all_platform_listings(skin_name, platforms=None, timeout=None):
+    """Fetch listings from every platform concurrently on the event loop"""
+    if platforms is None:
+        platforms = LISTING_PLATFORMS
+    
+    results = await asyncio.gather(*(
+        _async_fetch_or_default(get_listings_func, skin_name, [], platform_name, timeout)
+        for platform_name, get_listings_func in platforms
+    ))
+    return {platform_name: listings for (platform_name, _), listings in zip(platforms, results)}
+
+async def async_check_skin_arbitrage(skin_name, timeout=None):
+    """Async version of check_skin_arbitrage"""
+    reference_info = await async_get_reference_price(skin_name, timeout)
+    if not reference_info:
+        logger.info("❌ Could not get reference price for %s", skin_name)
+        record_skin_check(skin_name, None, {}, False)
+        return False
     
+    platform_listings = await async_fetch_all_platform_listings(skin_name, get_listing_platforms(reference_info), timeout)
+    profitable_found = evaluate_platform_listings(skin_name, reference_info, platform_listings)
+    record_skin_check(skin_name, reference_info, platform_listings, profitable_found)
     return profitable_found
 
+async def async_check_skins(skin_names, max_concurrency=None, timeout=None):
+    """Analyse many skins with a bounded number in flight at once"""
+    set_skinport_catalogue_skins(skin_names)
+    semaphore = asyncio.Semaphore(max_concurrency or ASYNC_ENGINE_SETTINGS['max_skin_concurrency'])
+    
+    async def check(skin_name):
+        async with semaphore:
+            return await async_check_skin_arbitrage(skin_name, timeout)
+    
+    results = await asyncio.gather(*(check(skin_name) for skin_name in skin_names), return_exceptions=True)
+    
+    outcomes = {}
+    for skin_name, result in zip(skin_names, results):
+        if isinstance(result, Exception):
+            logger.info("❌ %s: %s", skin_name, result)
+            result = False
+        outcomes[skin_name] = result
+    return outcomes
+
+def run_async_cycle(skin_names=None, max_concurrency=None, timeout=None):
+    """Run one monitoring pass over the skins on the asyncio engine"""
+    return asyncio.run(async_check_skins(list(skin_names or skins), max_concurrency, timeout))
+
+# Opportunity store - embedded SQLite with buffered batch writes
+OPPORTUNITY_STORE_SETTINGS = {
+    'path': 'arbitrage_opportunities.db',
+    'batch_size': 50,       # Buffered opportunities written per transaction
+    'flush_interval': 5.0,  # Seconds before a partial batch is written anyway
+    'max_buffer': 5000,     # Oldest unwritten opportunities are dropped beyond this while the store fails
+    'legacy_log': 'arbitrage_opportunities.json'  # Imported once into an empty store
+}
+
+OPPORTUNITY_COLUMNS = (
+    'ts', 'skin', 'platform', 'market_price', 'reference_price',
+    'profit_potential', 'url', 'float_value', 'wear'
+)
+
+_opportunity_db = None
+_opportunity_buffer = []
+_opportunity_store_lock = threading.Lock()
+_last_opportunity_flush = time.time()
+
+def _import_legacy_opportunity_log(db, path):
+    """Copy the old JSON-lines opportunity log into the store"""
+    try:
+        with open(path, 'r') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return 0
+    
+    rows = []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+            ts = time.mktime(time.strptime(entry['timestamp'], '%Y-%m-%d %H:%M:%S'))
+            rows.append((
+                ts, entry.get('skin'), entry.get('platform'), entry.get('market_price'),
+                entry.get('reference_price'), entry.get('profit_potential'), entry.get('url'),
+                entry.get('float'), entry.get('wear')
+            ))
+        except (ValueError, KeyError, TypeError):
+            continue
+    
+    with db:
+        db.executemany(
+            f"INSERT INTO opportunities ({', '.join(OPPORTUNITY_COLUMNS)}) VALUES ({', '.join('?' * len(OPPORTUNITY_COLUMNS))})",
+            rows
+        )
+    logger.info("✅ Imported %s opportunities from %s", len(rows), path)
+    return len(rows)
+
+def get_opportunity_db():
+    """Open the opportunity store, creating tables and indexes on first use"""
+    global _opportunity_db
+    if _opportunity_db is None:
+        db = sqlite3.connect(OPPORTUNITY_STORE_SETTINGS['path'], check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        with db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS opportunities (
+                    id INTEGER PRIMARY KEY,
+                    ts REAL NOT NULL,
+                    skin TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    market_price REAL,
+                    reference_price REAL,
+                    profit_potential REAL,
+                    url TEXT,
+                    float_value,
+                    wear TEXT
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS idx_opportunities_skin_ts ON opportunities (skin, ts)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_opportunities_platform_ts ON opportunities (platform, ts)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_opportunities_ts ON opportunities (ts)")
+        
+        legacy_log = OPPORTUNITY_STORE_SETTINGS.get('legacy_log')
+        if legacy_log and db.execute("SELECT COUNT(*) FROM opportunities").fetchone()[0] == 0:
+            _import_legacy_opportunity_log(db, legacy_log)
+        
+        _opportunity_db = db
+    return _opportunity_db
+
+def flush_opportunity_store():
+    """Write buffered opportunities to the store in one transaction"""
+    global _last_opportunity_flush
+    with _opportunity_store_lock:
+        _last_opportunity_flush = time.time()
+        if not _opportunity_buffer:
+            return 0
+        
+        rows = list(_opportunity_buffer)
+        try:
+            db = get_opportunity_db()
+            with db:
+                db.executemany(
+                    f"INSERT INTO opportunities ({', '.join(OPPORTUNITY_COLUMNS)}) VALUES ({', '.join('?' * len(OPPORTUNITY_COLUMNS))})",
+                    rows
+                )
+        except sqlite3.Error as e:
+            logger.error("Error saving to log: %s", e)
+            # Keep retrying later, but don't let a broken store grow the buffer forever
+            overflow = len(_opportunity_buffer) - OPPORTUNITY_STORE_SETTINGS['max_buffer']
+            if overflow > 0:
+                del _opportunity_buffer[:overflow]
+                logger.warning("Dropped %s oldest unsaved opportunities", overflow)
+            return 0
+        
+        del _opportunity_buffer[:len(rows)]
+        return len(rows)
+
+def close_opportunity_store():
+    """Flush pending opportunities and close the store"""
+    global _opportunity_db
+    flush_opportunity_store()
+    with _opportunity_store_lock:
+        if _opportunity_db is not None:
+            _opportunity_db.close()
+            _opportunity_db = None
+
 def save_opportunity_to_log(skin_name, platform, listing, reference_info, profit_potential):
-    """Save profitable opportunities to a log file"""
+    """Save profitable opportunities to the opportunity store"""
     try:
-        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-        log_entry = {
-            'timestamp': timestamp,
-            'skin': skin_name,
-            'platform': platform,
-            'market_price': listing['price'],
-            'reference_price': reference_info['price_usd'],
-            'profit_potential': profit_potential,
-            'url': listing['url'],
-            'float': listing.get('float'),
-            'wear': listing.get('wear')
-        }
+        float_value = listing.get('float')
+        if not isinstance(float_value, (int, float, str, type(None))):
+            float_value = str(float_value)
+        
+        row = (
+            time.time(), skin_name, platform, listing['price'], reference_info['price_usd'],
+            profit_potential, listing['url'], float_value, listing.get('wear')
+        )
         
-        with open('arbitrage_opportunities.json', 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
+        with _opportunity_store_lock:
+            _opportunity_buffer.append(row)
+            should_flush = (len(_opportunity_buffer) >= OPPORTUNITY_STORE_SETTINGS['batch_size'] or
+                            time.time() - _last_opportunity_flush >= OPPORTUNITY_STORE_SETTINGS['flush_interval'])
+        
+        if should_flush:
+            flush_opportunity_store()
             
     except Exception as e:
-        print(f"Error saving to log: {e}")
+        logger.error("Error saving to log: %s", e)
+
+def _opportunity_filters(skin=None, platform=None, since_hours=None):
+    """Build the WHERE clause and parameters shared by opportunity queries"""
+    conditions = []
+    params = []
+    if skin:
+        conditions.append("skin = ?")
+        params.append(skin)
+    if platform:
+        conditions.append("platform = ?")
+        params.append(platform)
+    if since_hours is not None:
+        conditions.append("ts >= ?")
+        params.append(time.time() - since_hours * 3600)
+    
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params
+
+def count_opportunities(skin=None, platform=None, since_hours=None):
+    """Count logged opportunities without loading the rows"""
+    flush_opportunity_store()
+    where, params = _opportunity_filters(skin, platform, since_hours)
+    with _opportunity_store_lock:
+        return get_opportunity_db().execute(f"SELECT COUNT(*) FROM opportunities{where}", params).fetchone()[0]
+
+def query_opportunities(skin=None, platform=None, since_hours=None, limit=100):
+    """Query logged opportunities, newest first"""
+    flush_opportunity_store()
+    
+    where, params = _opportunity_filters(skin, platform, since_hours)
+    sql = f"SELECT {', '.join(OPPORTUNITY_COLUMNS)} FROM opportunities{where}"
+    sql += " ORDER BY ts DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    
+    with _opportunity_store_lock:
+        rows = get_opportunity_db().execute(sql, params).fetchall()
+    
+    return [
+        {
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts)),
+            'skin': skin_name,
+            'platform': platform_name,
+            'market_price': market_price,
+            'reference_price': reference_price,
+            'profit_potential': profit_potential,
+            'url': url,
+            'float': float_value,
+            'wear': wear
+        }
+        for ts, skin_name, platform_name, market_price, reference_price, profit_potential, url, float_value, wear in rows
+    ]
 
 def display_statistics(total_opportunities, cycle_count, start_time):
     """Display bot statistics"""
@@ -1229,6 +3842,12 @@ def display_statistics(total_opportunities, cycle_count, start_time):
     print(f"🔄 Cycles completed: {cycle_count}")
     print(f"💰 Total opportunities: {total_opportunities}")
     print(f"📈 Avg opportunities/hour: {avg_opportunities_per_hour:.2f}")
+    try:
+        print(f"🗃️ Logged opportunities (24h): {count_opportunities(since_hours=24)}")
+    except sqlite3.Error as e:
+        print(f"🗃️ Opportunity store unavailable: {e}")
+    display_source_health()
+    display_metrics_summary()
 
 def test_skinport_api():
     """Test the Skinport API fix"""
@@ -1253,17 +3872,209 @@ def test_skinport_api():
         else:
             print(f"❌ No listings found")
 
-def main():
-    """Main loop with enhanced monitoring"""
+# Monitoring loop settings
+MONITOR_SETTINGS = {
+    'cycle_interval': 90,       # Seconds between monitoring cycles
+    'skin_delay_range': (5, 10), # Random delay between skins to look more human
+    'engine': 'sync'            # 'async' checks many skins at once on the asyncio engine
+}
+
+# Priority scheduler for large skin lists
+SCHEDULER_SETTINGS = {
+    'enabled': True,
+    'min_interval': 90,        # Hottest skins are checked at most this often (seconds)
+    'max_interval': 3600,      # Stale skins are still checked at least this often
+    'per_skin_requests': {     # Rate-limited requests one skin costs on each platform
+        'buff163': 1,
+        'csfloat': 1,
+        'bitskins': 1,
+        'dmarket': 1
+    },
+    'per_skin_seconds': 3.0,   # Wall time one skin's fetches take, for the concurrency bound
+    'price_window': 20,        # Reference prices kept per skin for volatility
+    'deal_decay': 0.8,         # How quickly past deals stop boosting a skin
+    'volatility_weight': 40.0, # Priority per unit of price coefficient of variation
+    'liquidity_weight': 0.5,   # Priority per log-unit of listings and Steam volume
+    'deal_weight': 3.0         # Priority per (decayed) deal found
+}
+
+_skin_schedule = {}
+_skin_schedule_lock = threading.Lock()
+
+def _new_skin_schedule():
+    """Create an empty scheduling record for a skin"""
+    return {
+        'next_due': 0,
+        'interval': SCHEDULER_SETTINGS['min_interval'],
+        'priority': 0.0,
+        'prices': [],
+        'liquidity': 0.0,
+        'deal_score': 0.0,
+        'last_checked': 0
+    }
+
+def _parse_volume(volume):
+    """Parse a Steam volume like '1,234' into a number"""
+    try:
+        return float(str(volume).replace(',', ''))
+    except (TypeError, ValueError):
+        return 0.0
+
+def _skin_priority(entry):
+    """Score how much a skin deserves to be polled often"""
+    prices = entry['prices']
+    volatility = 0.0
+    if len(prices) >= 2:
+        mean = sum(prices) / len(prices)
+        if mean > 0:
+            variance = sum((price - mean) ** 2 for price in prices) / len(prices)
+            volatility = variance ** 0.5 / mean
+    
+    return (SCHEDULER_SETTINGS['volatility_weight'] * volatility +
+            SCHEDULER_SETTINGS['liquidity_weight'] * math.log1p(entry['liquidity']) +
+            SCHEDULER_SETTINGS['deal_weight'] * entry['deal_score'])
+
+def record_skin_check(skin_name, reference_info, platform_listings, found_deal):
+    """Update a skin's schedule after it has been checked"""
+    now = time.time()
+    with _skin_schedule_lock:
+        entry = _skin_schedule.setdefault(skin_name, _new_skin_schedule())
+        
+        if reference_info:
+            entry['prices'].append(reference_info['price_usd'])
+            del entry['prices'][:-SCHEDULER_SETTINGS['price_window']]
+            
+            listing_count = sum(len(listings or []) for listings in (platform_listings or {}).values())
+            entry['liquidity'] = listing_count + _parse_volume(reference_info.get('volume'))
+        
+        entry['deal_score'] = entry['deal_score'] * SCHEDULER_SETTINGS['deal_decay'] + (1 if found_deal else 0)
+        entry['priority'] = _skin_priority(entry)
+        
+        # Interval shrinks as priority grows, between the configured bounds
+        interval = SCHEDULER_SETTINGS['max_interval'] / (1 + entry['priority'])
+        entry['interval'] = max(SCHEDULER_SETTINGS['min_interval'], min(SCHEDULER_SETTINGS['max_interval'], interval))
+        entry['last_checked'] = now
+        entry['next_due'] = now + entry['interval']
+
+def get_cycle_skin_budget(cycle_seconds=None, engine=None, max_concurrency=None):
+    """How many skins fit in a cycle, bounded by the platforms' request rates and the engine's concurrency"""
+    if cycle_seconds is None:
+        cycle_seconds = MONITOR_SETTINGS['cycle_interval']
+    engine = engine or MONITOR_SETTINGS['engine']
+    
+    # A platform's token bucket allows its burst plus one request per interval
+    rate_budget = float('inf')
+    if RATE_LIMIT_SETTINGS.get('enabled'):
+        for platform, requests_per_skin in SCHEDULER_SETTINGS['per_skin_requests'].items():
+            interval = get_rate_limit_interval(platform)
+            if interval > 0 and requests_per_skin > 0:
+                allowed = RATE_LIMIT_SETTINGS['bursts'].get(platform, 1) + cycle_seconds / interval
+                rate_budget = min(rate_budget, allowed / requests_per_skin)
+    
+    # The sync loop checks one skin at a time and pauses between skins
+    if engine == 'async':
+        concurrency = max_concurrency or ASYNC_ENGINE_SETTINGS['max_skin_concurrency']
+        per_skin = SCHEDULER_SETTINGS['per_skin_seconds']
+    else:
+        concurrency = 1
+        low, high = MONITOR_SETTINGS['skin_delay_range']
+        per_skin = SCHEDULER_SETTINGS['per_skin_seconds'] + (low + high) / 2
+    concurrency_budget = concurrency * cycle_seconds / max(per_skin, 0.001)
+    
+    return max(1, int(min(rate_budget, concurrency_budget)))
+
+def get_due_skins(skin_names, budget=None, now=None):
+    """Pick the skins to check this cycle, most urgent first"""
+    if budget is None:
+        budget = get_cycle_skin_budget()
+    if now is None:
+        now = time.time()
+    
+    candidates = []
+    with _skin_schedule_lock:
+        for position, skin_name in enumerate(skin_names):
+            entry = _skin_schedule.get(skin_name)
+            if entry is None:
+                # Never checked - goes ahead of everything, in list order
+                candidates.append((float('inf'), -position, skin_name))
+                continue
+            
+            overdue = now - entry['next_due']
+            if overdue >= 0:
+                urgency = overdue / entry['interval'] + entry['priority']
+                candidates.append((urgency, -position, skin_name))
+    
+    return [skin_name for _, _, skin_name in heapq.nlargest(budget, candidates)]
+
+def seconds_until_next_due(skin_names, now=None):
+    """Seconds until the next skin in the list becomes due"""
+    if now is None:
+        now = time.time()
+    with _skin_schedule_lock:
+        next_due = min((_skin_schedule[skin]['next_due'] for skin in skin_names if skin in _skin_schedule),
+                       default=now)
+        if any(skin not in _skin_schedule for skin in skin_names):
+            next_due = now
+    return max(0.0, next_due - now)
+
+def run_monitor_cycle(skin_names, engine=None, max_concurrency=None):
+    """Check one cycle's worth of skins, returning how many had opportunities"""
+    cycle_opportunities = 0
+    engine = engine or MONITOR_SETTINGS['engine']
+    
+    # Every skin in this cycle is answered from one fresh catalogue download,
+    # unless a warm start restored one that is still fresh
+    if not _take_restored_catalogue():
+        invalidate_skinport_catalogue()
+    
+    if SCHEDULER_SETTINGS.get('enabled'):
+        budget = get_cycle_skin_budget(engine=engine, max_concurrency=max_concurrency)
+        cycle_skins = get_due_skins(skin_names, budget)
+        logger.info("🗓️ Scheduled %s of %s skins this cycle", len(cycle_skins), len(skin_names))
+    else:
+        cycle_skins = list(skin_names)
+    set_skinport_catalogue_skins(cycle_skins)
+    
+    if engine == 'async':
+        if not cycle_skins:
+            return 0
+        outcomes = run_async_cycle(cycle_skins, max_concurrency)
+        return sum(1 for found in outcomes.values() if found)
+    
+    for i, skin in enumerate(cycle_skins, 1):
+        logger.info("\n[%s/%s] Processing: %s", i, len(cycle_skins), skin)
+        if check_skin_arbitrage(skin):
+            cycle_opportunities += 1
+        
+        # Random delay between skins to look more human
+        time.sleep(random.uniform(*MONITOR_SETTINGS['skin_delay_range']))
+    
+    return cycle_opportunities
+
+class ShutdownRequested(Exception):
+    """Raised in the main thread when SIGTERM asks the monitoring loop to stop"""
+
+def _request_shutdown(signum, frame):
+    """SIGTERM handler - unwinds main() through the same path as Ctrl+C"""
+    raise ShutdownRequested(f"signal {signum}")
+
+def _install_sigterm_handler():
+    """Route SIGTERM into main(), returning the previous handler (None off the main thread)"""
+    if threading.current_thread() is not threading.main_thread():
+        return None
+    return signal.signal(signal.SIGTERM, _request_shutdown)
+
+def main(max_cycles=None, engine=None, max_concurrency=None):
+    """Main loop with enhanced monitoring, stopping after max_cycles when given"""
     print("="*70)
     print("🤖 CS:GO SKIN ARBITRAGE BOT v3.0 (COMPLETE RESTORATION)")
     print("="*70)
-    print("💡 Strategy: Find skins ≤90% of reference market prices")
-    print("💰 Minimum profit threshold: $2.00")
+    print(f"💡 Strategy: Find skins ≤{DEAL_SETTINGS['target_ratio']:.0%} of reference market prices")
+    print(f"💰 Minimum profit threshold: ${DEAL_SETTINGS['min_profit']:.2f}")
     print("📊 Reference source: Buff163 + Steam Market + fallbacks")
     print("🏪 Target platforms: Skinport + CSFloat + BitSkins + DMarket")
-    print("🔄 Monitoring cycle: 90 seconds")
-    print("📝 Logging: arbitrage_opportunities.json")
+    print(f"🔄 Monitoring cycle: {MONITOR_SETTINGS['cycle_interval']} seconds")
+    print(f"📝 Logging: {OPPORTUNITY_STORE_SETTINGS['path']}")
     print("🎲 Enhanced rate limiting and randomized requests")
     print("🔧 Web scraping fallbacks for failed APIs")
     print("="*70)
@@ -1271,23 +4082,17 @@ def main():
     cycle = 1
     total_opportunities = 0
     start_time = time.time()
+    start_metrics_server()
+    previous_sigterm = _install_sigterm_handler()
     
     try:
-        while True:
+        while max_cycles is None or cycle <= max_cycles:
             cycle_start = time.time()
             print(f"\n🔄 CYCLE #{cycle} STARTING - {time.strftime('%H:%M:%S')}")
             print(f"📈 Total opportunities found so far: {total_opportunities}")
             
-            cycle_opportunities = 0
-            
-            for i, skin in enumerate(skins, 1):
-                print(f"\n[{i}/{len(skins)}] Processing: {skin}")
-                if check_skin_arbitrage(skin):
-                    cycle_opportunities += 1
-                    total_opportunities += 1
-                
-                # Random delay between skins to look more human
-                time.sleep(random.uniform(5, 10))
+            cycle_opportunities = run_monitor_cycle(skins, engine, max_concurrency)
+            total_opportunities += cycle_opportunities
             
             cycle_duration = time.time() - cycle_start
             
@@ -1301,20 +4106,45 @@ def main():
             if cycle % 10 == 0:
                 display_statistics(total_opportunities, cycle, start_time)
             
-            print(f"⏰ Next cycle in 90 seconds...")
+            cycle_interval = MONITOR_SETTINGS['cycle_interval']
+            if SCHEDULER_SETTINGS.get('enabled'):
+                # Nothing to gain from waking up before the next skin is due
+                cycle_interval = max(cycle_interval, min(seconds_until_next_due(skins), SCHEDULER_SETTINGS['max_interval']))
+            
+            print(f"⏰ Next cycle in {cycle_interval:.0f} seconds...")
             print("="*70)
             
+            maybe_save_runtime_state()
+            flush_opportunity_store()
+            flush_price_history_segment()
+            write_metrics_file()
+            
             cycle += 1
-            time.sleep(90)  # Wait 90 seconds between cycles
+            if max_cycles is not None and cycle > max_cycles:
+                print(f"\n🏁 Bot finished after {max_cycles} cycles")
+                display_statistics(total_opportunities, max_cycles, start_time)
+                break
+            time.sleep(cycle_interval)  # Wait between cycles
             
-    except KeyboardInterrupt:
-        print(f"\n🛑 Bot stopped by user after {cycle-1} cycles")
+    except (KeyboardInterrupt, ShutdownRequested) as e:
+        stopped_by = "SIGTERM" if isinstance(e, ShutdownRequested) else "user"
+        print(f"\n🛑 Bot stopped by {stopped_by} after {cycle-1} cycles")
         print(f"📊 Total opportunities found: {total_opportunities}")
         display_statistics(total_opportunities, cycle-1, start_time)
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
         print(f"📊 Total opportunities found before crash: {total_opportunities}")
         display_statistics(total_opportunities, cycle-1, start_time)
+    finally:
+        # Every way out leaves the state, opportunities and price history on disk
+        save_runtime_state()
+        flush_opportunity_store()
+        flush_price_history_segment(force=True)
+        write_metrics_file()
+        if previous_sigterm is not None:
+            signal.signal(signal.SIGTERM, previous_sigterm)
+    
+    return total_opportunities
 
 def test_single_skin(skin_name):
     """Test function to check a single skin manually"""
@@ -1419,6 +4249,186 @@ def interactive_mode():
         except Exception as e:
             print(f"❌ Error: {e}")
 
+# Warm-start runtime state shared across bot restarts
+RUNTIME_STATE_SETTINGS = {
+    'enabled': True,
+    'path': 'bot_state.json',  # Read by every command, written only by the monitoring loop
+    'save_interval': 300,  # Seconds between periodic saves from the monitoring loop
+    'version': 1
+}
+
+_runtime_state = {
+    'last_saved': 0
+}
+_runtime_state_lock = threading.Lock()
+
+def _snapshot_rate_limits(now, now_monotonic):
+    """Copy the rate limiter state with bucket timestamps converted to wall time"""
+    with _rate_limit_lock:
+        buckets = {
+            platform: {
+                'tokens': bucket['tokens'],
+                'capacity': bucket.get('capacity'),
+                'refill_rate': bucket.get('refill_rate'),
+                'updated': now - (now_monotonic - bucket['updated'])
+            }
+            for platform, bucket in _rate_limit_buckets.items()
+        }
+        return buckets, dict(last_request_times)
+
+def _snapshot_skinport_catalogue():
+    """Copy the Skinport catalogue snapshot, or None when there is nothing worth keeping"""
+    with _skinport_catalogue_lock:
+        if _skinport_catalogue['items'] is None:
+            return None
+        return {
+            'items': _skinport_catalogue['items'],
+            'fetched_at': _skinport_catalogue['fetched_at'],
+            # A streamed snapshot only holds the skins it was filtered for
+            'skins': sorted(_skinport_catalogue['skins']) if _skinport_catalogue['skins'] is not None else None,
+            'etag': _skinport_catalogue['etag'],
+            'last_modified': _skinport_catalogue['last_modified']
+        }
+
+def save_runtime_state(path=None):
+    """Atomically write rate limits, reference prices, the catalogue, source health and the schedule"""
+    if not RUNTIME_STATE_SETTINGS.get('enabled'):
+        return False
+    path = path or RUNTIME_STATE_SETTINGS['path']
+    
+    try:
+        now = time.time()
+        buckets, request_times = _snapshot_rate_limits(now, time.monotonic())
+        
+        with _reference_price_cache_lock:
+            reference_prices = [
+                {'skin': skin, 'info': entry['info'], 'cached_at': entry['cached_at']}
+                for skin, entry in _reference_price_cache.items()
+            ]
+        with _source_health_lock:
+            source_health = {source: dict(health) for source, health in _source_health.items()}
+        with _skin_schedule_lock:
+            schedule = {
+                skin: dict(entry, prices=list(entry['prices']))
+                for skin, entry in _skin_schedule.items()
+            }
+        
+        state = {
+            'version': RUNTIME_STATE_SETTINGS['version'],
+            'saved_at': now,
+            'rate_limits': {'buckets': buckets, 'last_request_times': request_times},
+            'reference_prices': reference_prices,
+            'skinport_catalogue': _snapshot_skinport_catalogue(),
+            'source_health': source_health,
+            'schedule': schedule
+        }
+        
+        # A per-process temporary file means neither a crash nor a parallel run leaves half-written state
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        
+        with _runtime_state_lock:
+            _runtime_state['last_saved'] = now
+        logger.debug("💾 Runtime state saved to %s", path)
+        return True
+    except Exception as e:
+        logger.warning("❌ Error saving runtime state: %s", e)
+        return False
+
+def _restore_rate_limits(rate_limits, now, now_monotonic):
+    """Rebuild rate limiter buckets, mapping saved wall times onto this process's monotonic clock"""
+    with _rate_limit_lock:
+        for platform, bucket in rate_limits.get('buckets', {}).items():
+            elapsed = max(0.0, now - bucket['updated'])
+            restored = {'tokens': bucket['tokens'], 'updated': now_monotonic - elapsed}
+            if bucket.get('capacity') is not None:
+                restored['capacity'] = bucket['capacity']
+                restored['refill_rate'] = bucket['refill_rate']
+            _rate_limit_buckets[platform] = restored
+        last_request_times.update(rate_limits.get('last_request_times', {}))
+    return len(rate_limits.get('buckets', {}))
+
+def _restore_skinport_catalogue(catalogue, now):
+    """Reinstate a saved catalogue snapshot if it is still fresh"""
+    if not catalogue or now - catalogue['fetched_at'] >= SKINPORT_CATALOGUE_SETTINGS['max_age']:
+        return 0
+    
+    # Skins the snapshot was not filtered for make the next lookup refetch it wider
+    with _skinport_catalogue_lock:
+        _skinport_catalogue['items'] = catalogue['items']
+        _skinport_catalogue['index'] = build_skin_name_index(catalogue['items'])
+        _skinport_catalogue['fetched_at'] = catalogue['fetched_at']
+        _skinport_catalogue['skins'] = frozenset(catalogue['skins']) if catalogue.get('skins') is not None else None
+        _skinport_catalogue['etag'] = catalogue.get('etag')
+        _skinport_catalogue['last_modified'] = catalogue.get('last_modified')
+        _skinport_catalogue['restored'] = True
+    return len(catalogue['items'])
+
+def load_runtime_state(path=None):
+    """Restore runtime state saved by a previous run, skipping anything that has expired"""
+    if not RUNTIME_STATE_SETTINGS.get('enabled'):
+        return {}
+    path = path or RUNTIME_STATE_SETTINGS['path']
+    
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.error("❌ Error loading runtime state: %s", e)
+        return {}
+    
+    if state.get('version') != RUNTIME_STATE_SETTINGS['version']:
+        logger.info("📝 Runtime state is from another version, starting cold")
+        return {}
+    
+    try:
+        now = time.time()
+        restored = {'rate_limits': _restore_rate_limits(state.get('rate_limits', {}), now, time.monotonic())}
+        
+        restored['reference_prices'] = 0
+        for entry in state.get('reference_prices', []):
+            if now - entry.get('cached_at', 0) <= REFERENCE_CACHE_SETTINGS['ttl']:
+                cache_reference_price(entry['skin'], entry['info'], entry['cached_at'])
+                restored['reference_prices'] += 1
+        
+        restored['catalogue_items'] = _restore_skinport_catalogue(state.get('skinport_catalogue'), now)
+        
+        with _source_health_lock:
+            for source, health in state.get('source_health', {}).items():
+                _source_health[source] = dict(_new_source_health(), **health)
+        restored['sources'] = len(state.get('source_health', {}))
+        
+        with _skin_schedule_lock:
+            for skin, entry in state.get('schedule', {}).items():
+                _skin_schedule[skin] = dict(_new_skin_schedule(), **entry)
+        restored['scheduled_skins'] = len(state.get('schedule', {}))
+    except Exception as e:
+        logger.error("❌ Error restoring runtime state: %s", e)
+        return {}
+    
+    age = now - state.get('saved_at', now)
+    logger.info("✅ Warm start from state saved %.0fs ago: %s reference prices, %s catalogue items, "
+                "%s sources, %s scheduled skins", age, restored['reference_prices'],
+                restored['catalogue_items'], restored['sources'], restored['scheduled_skins'])
+    return restored
+
+def maybe_save_runtime_state():
+    """Save runtime state if the periodic save interval has passed"""
+    with _runtime_state_lock:
+        due = time.time() - _runtime_state['last_saved'] >= RUNTIME_STATE_SETTINGS['save_interval']
+    return save_runtime_state() if due else False
+
+def _take_restored_catalogue():
+    """Whether a freshly restored catalogue can serve this cycle instead of a new download"""
+    with _skinport_catalogue_lock:
+        restored = _skinport_catalogue.pop('restored', False)
+        age = time.time() - _skinport_catalogue['fetched_at']
+        return restored and _skinport_catalogue['items'] is not None and age < SKINPORT_CATALOGUE_SETTINGS['max_age']
+
 def load_config():
     """Load configuration from file if it exists"""
     try:
@@ -1429,10 +4439,16 @@ def load_config():
         if config.get('skins'):
             skins = config['skins']
             print(f"✅ Loaded {len(skins)} skins from config")
-            
+        if config.get('logging'):
+            LOGGING_SETTINGS.update(config['logging'])
+        if config.get('runtime_state'):
+            RUNTIME_STATE_SETTINGS.update(config['runtime_state'])
+        
+        load_runtime_state()
         return config
     except FileNotFoundError:
         print("📝 No config file found, using defaults")
+        load_runtime_state()
         return {}
     except Exception as e:
         print(f"❌ Error loading config: {e}")
@@ -1449,7 +4465,7 @@ def save_config():
         
         with open('bot_config.json', 'w') as f:
             json.dump(config, f, indent=2)
-            
+        
         print("✅ Configuration saved")
     except Exception as e:
         print(f"❌ Error saving config: {e}")
@@ -1472,15 +4488,19 @@ def check_platform_status():
         ("CSGOStash", "https://csgostash.com/")
     ]
     
+    results = []
     for platform_name, url in platforms:
         try:
-            response = requests.get(url, headers=get_headers(), timeout=10)
+            response = http_get('status', url, headers=get_headers(), timeout=10)
             status = "✅ Online" if response.status_code == 200 else f"⚠️ HTTP {response.status_code}"
             print(f"  {platform_name}: {status}")
+            results.append({'platform': platform_name, 'url': url, 'status': response.status_code, 'error': None})
         except Exception as e:
             print(f"  {platform_name}: ❌ Error - {str(e)[:50]}...")
+            results.append({'platform': platform_name, 'url': url, 'status': None, 'error': str(e)})
     
     print("="*70)
+    return results
 
 def setup_api_keys():
     """Interactive setup for API keys"""
@@ -1536,14 +4556,11 @@ def check_dependencies():
     """Check if required dependencies are installed"""
     missing_deps = []
     
-    try:
-        import cloudscraper
-    except ImportError:
+    # find_spec only locates the packages - they are imported when a scraper first needs them
+    if not _module_available('cloudscraper'):
         missing_deps.append('cloudscraper')
     
-    try:
-        from bs4 import BeautifulSoup
-    except ImportError:
+    if not _module_available('bs4'):
         missing_deps.append('beautifulsoup4')
     
     if missing_deps:
@@ -1577,14 +4594,7 @@ def run_comprehensive_test():
     print("\n🏪 Testing marketplace APIs...")
     
     # Test each platform
-    platforms = [
-        ("Skinport", get_skinport_listings_complete),
-        ("CSFloat", get_csfloat_listings),
-        ("BitSkins", get_bitskins_listings),
-        ("DMarket", get_dmarket_listings)
-    ]
-    
-    for platform_name, get_listings_func in platforms:
+    for platform_name, get_listings_func in LISTING_PLATFORMS:
         print(f"\n  Testing {platform_name}...")
         listings = get_listings_func(test_skin)
         if listings:
@@ -1597,12 +4607,703 @@ def run_comprehensive_test():
     print("\n" + "="*70)
     print("🧪 Test completed!")
 
+# Offline benchmark harness - replays recorded or synthetic responses instead of the network
+BENCHMARK_SETTINGS = {
+    'fixture_dir': os.path.join('fixtures', 'replay'),
+    'skin_count': 10,          # Monitored skins used per run
+    'latency': (0.02, 0.08),   # Simulated network latency per request, in seconds
+    'error_rate': 0.0,         # Share of requests that fail
+    'error_status': None,      # Status code for failed requests, None raises a connection error
+    'catalogue_size': 20000,   # Items in the synthetic Skinport catalogue
+    'seed': 1337,
+    'quiet': True              # Hide the fetchers' own output while measuring
+}
+
+def _replay_price_key(name):
+    """Normalise the different ways fetchers spell a skin name"""
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', name.lower()).split())
+
+def _replay_reference_price(name):
+    """Stable made-up reference price for a skin"""
+    return round(random.Random(_replay_price_key(name)).uniform(10, 90), 2)
+
+def _replay_listing_prices(name, platform, count=5):
+    """Stable made-up listing prices around the reference price, some of them deals"""
+    rng = random.Random(f"{_replay_price_key(name)}:{platform}")
+    reference = _replay_reference_price(name)
+    return sorted(round(reference * rng.uniform(0.7, 1.2), 2) for _ in range(count))
+
+def _replay_steam_priceoverview(adapter, path, query):
+    price = _replay_reference_price(query.get('market_hash_name', ''))
+    return 200, {'success': True, 'lowest_price': f"${price:.2f}", 'median_price': f"${price * 1.02:.2f}", 'volume': '1,234'}
+
+def _replay_steam_search(adapter, path, query):
+    name = query.get('query', '')
+    price = _replay_reference_price(name)
+    return 200, {'success': True, 'results': [{'name': name, 'hash_name': name, 'sell_price_text': f"${price:.2f}"}]}
+
+def _replay_steamapis(adapter, path, query):
+    name = urllib.parse.unquote(path.rsplit('/', 1)[-1])
+    return 200, {'lowest_price': _replay_reference_price(name)}
+
+def _replay_buff163_goods(adapter, path, query):
+    name = query.get('search', '')
+    price_cny = _replay_reference_price(name) * 7.2
+    return 200, {'data': {'items': [{'id': 1000, 'name': name, 'sell_min_price': f"{price_cny:.2f}"}]}}
+
+def _replay_slug_price(adapter, path, query):
+    price = _replay_reference_price(path.rsplit('/', 1)[-1])
+    return 200, {'steam': {'last_24h': price}, 'steam_price': price}
+
+def _replay_steamlytics(adapter, path, query):
+    name = query.get('search', '')
+    return 200, {'items': [{'name': name, 'price': {'steam': {'last_24h': _replay_reference_price(name)}}}]}
+
+def _replay_skinport_catalogue(adapter, path, query):
+    items = adapter.skinport_catalogue()
+    if query.get('search'):
+        words = query['search'].replace('+', ' ').split()
+        items = [item for item in items if all(word in item['market_hash_name'].lower() for word in words)]
+    return 200, items
+
+def _replay_skinport_items(adapter, path, query):
+    name = query.get('market_hash_name') or query.get('search', '')
+    return 200, [{'id': 5000 + i, 'suggested_price': price, 'float_value': 0.1 + i / 50, 'exterior': 'Field-Tested'}
+                 for i, price in enumerate(_replay_listing_prices(name, 'skinport_api'))]
+
+def _replay_csfloat(adapter, path, query):
+    if int(query.get('page', 0)) > 0:
+        return 200, {'data': []}
+    name = query.get('market_hash_name') or query.get('search') or query.get('query', '')
+    return 200, {'data': [{'id': 7000 + i, 'price': int(price * 100), 'float_value': 0.12 + i / 50, 'wear_name': 'Field-Tested'}
+                          for i, price in enumerate(_replay_listing_prices(name, 'csfloat'))]}
+
+def _replay_bitskins(adapter, path, query):
+    name = query.get('market_hash_name', '')
+    return 200, {'status': 'success', 'data': {'items': [
+        {'item_id': 9000 + i, 'price': f"{price:.2f}", 'float_value': 0.15 + i / 50, 'exterior': 'Field-Tested'}
+        for i, price in enumerate(_replay_listing_prices(name, 'bitskins'))
+    ]}}
+
+def _replay_dmarket(adapter, path, query):
+    name = query.get('title', '')
+    return 200, {'cursor': '', 'objects': [
+        {'itemId': f"dm-{i}", 'price': {'USD': str(int(price * 100))}, 'extra': {'floatValue': 0.2 + i / 50, 'exterior': 'field-tested'}}
+        for i, price in enumerate(_replay_listing_prices(name, 'dmarket'))
+    ]}
+
+def _replay_html_page(mode):
+    def respond(adapter, path, query):
+        return 200, adapter.html_page(mode)
+    return respond
+
+# Synthetic responses keyed by host + path prefix, used when no recorded fixture matches
+REPLAY_ROUTES = [
+    ('steamcommunity.com/market/priceoverview', _replay_steam_priceoverview),
+    ('steamcommunity.com/market/search/render', _replay_steam_search),
+    ('api.steamapis.com/', _replay_steamapis),
+    ('buff.163.com/api/market/goods', _replay_buff163_goods),
+    ('buff.163.com/market/csgo', _replay_html_page('buff163')),
+    ('pricempire.com/api/', _replay_slug_price),
+    ('csgostash.com/api/', _replay_slug_price),
+    ('steamlytics.xyz/api/', _replay_steamlytics),
+    ('skinport.com/api/data/730', _replay_skinport_catalogue),
+    ('api.skinport.com/v1/items', _replay_skinport_items),
+    ('skinport.com/market/730', _replay_html_page('skinport')),
+    ('csfloat.com/api/', _replay_csfloat),
+    ('api.csfloat.com/', _replay_csfloat),
+    ('bitskins.com/api/', _replay_bitskins),
+    ('api.dmarket.com/exchange/v1/market/items', _replay_dmarket)
+]
+
+class FixtureReplayAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter answering requests from recorded fixtures or synthetic routes"""
+    
+    def __init__(self, skin_names=(), fixture_dir=None, latency=None, error_rate=None, error_status=None, seed=None):
+        super().__init__()
+        self.skin_names = list(skin_names)
+        self.latency = latency if latency is not None else BENCHMARK_SETTINGS['latency']
+        self.error_rate = error_rate if error_rate is not None else BENCHMARK_SETTINGS['error_rate']
+        self.error_status = error_status if error_status is not None else BENCHMARK_SETTINGS['error_status']
+        self.requests = {}
+        self.errors = 0
+        self._random = random.Random(BENCHMARK_SETTINGS['seed'] if seed is None else seed)
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._catalogue = None
+        self._recorded = load_replay_fixtures(fixture_dir)
+        self._routes = sorted(REPLAY_ROUTES, key=lambda route: len(route[0]), reverse=True)
+    
+    def skinport_catalogue(self):
+        """Synthetic Skinport catalogue with the benchmark skins among realistic filler"""
+        with self._lock:
+            if self._catalogue is None:
+                filler = (f"Filler Weapon {i} | Pattern {i % 97} (Field-Tested)"
+                          for i in range(BENCHMARK_SETTINGS['catalogue_size']))
+                self._catalogue = [{
+                    'market_hash_name': name,
+                    'currency': 'USD',
+                    'min_price': _replay_listing_prices(name, 'skinport')[0],
+                    'quantity': 5,
+                    'item_page': f"https://skinport.com/item/{i}"
+                } for i, name in enumerate([*self.skin_names, *filler])]
+            return self._catalogue
+    
+    def html_page(self, mode):
+        """Generated search page for the scraping fallbacks"""
+        with self._lock:
+            if mode not in self._pages:
+                self._pages[mode] = _generate_html_fixture(mode, cards=60)
+            return self._pages[mode]
+    
+    def _respond(self, request):
+        recorded = self._recorded.get(request.url) or self._recorded.get(request.url.split('?', 1)[0])
+        if recorded:
+            return recorded['status'], recorded.get('headers', {}), recorded['body'].encode('utf-8')
+        
+        parts = urllib.parse.urlsplit(request.url)
+        target = parts.netloc.lower().removeprefix('www.') + parts.path
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        for prefix, responder in self._routes:
+            if target.startswith(prefix):
+                status, body = responder(self, parts.path, query)
+                if isinstance(body, bytes):
+                    return status, {'Content-Type': 'text/html; charset=utf-8'}, body
+                return status, {'Content-Type': 'application/json'}, json.dumps(body).encode('utf-8')
+        
+        return 404, {'Content-Type': 'text/plain'}, b'No fixture for this URL'
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        host = urllib.parse.urlsplit(request.url).netloc
+        with self._lock:
+            self.requests[host] = self.requests.get(host, 0) + 1
+            delay = self._random.uniform(*self.latency) if self.latency else 0
+            inject_error = self._random.random() < self.error_rate
+            if inject_error:
+                self.errors += 1
+        
+        if delay:
+            _fetch_sleep(delay)
+        if inject_error and self.error_status is None:
+            raise requests.exceptions.ConnectionError(f"Injected connection error for {host}", request=request)
+        
+        if inject_error:
+            status, headers, body = self.error_status, {'Content-Type': 'text/plain'}, b'Injected error'
+        else:
+            status, headers, body = self._respond(request)
+        
+        response = requests.models.Response()
+        response.status_code = status
+        response.reason = 'Replayed'
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        return response
+    
+    def close(self):
+        pass
+
+class FixtureRecordingAdapter(requests.adapters.HTTPAdapter):
+    """Live transport adapter that saves every response as a replay fixture"""
+    
+    def __init__(self, fixture_dir=None, **kwargs):
+        super().__init__(**kwargs)
+        self.fixture_dir = fixture_dir or BENCHMARK_SETTINGS['fixture_dir']
+        os.makedirs(self.fixture_dir, exist_ok=True)
+    
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if kwargs.get('stream'):
+            return response
+        
+        host = urllib.parse.urlsplit(request.url).netloc
+        name = f"{host}_{hashlib.sha1(request.url.encode('utf-8')).hexdigest()[:12]}.json"
+        try:
+            with open(os.path.join(self.fixture_dir, name), 'w') as f:
+                json.dump({
+                    'url': request.url,
+                    'status': response.status_code,
+                    'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+                    'body': response.content.decode('utf-8', errors='replace')
+                }, f)
+        except OSError as e:
+            logger.warning("⚠️ Could not record fixture for %s: %s", request.url, e)
+        return response
+
+def load_replay_fixtures(fixture_dir=None):
+    """Recorded fixtures keyed by full URL and by URL without its query string"""
+    fixture_dir = fixture_dir or BENCHMARK_SETTINGS['fixture_dir']
+    fixtures = {}
+    if not os.path.isdir(fixture_dir):
+        return fixtures
+    
+    for name in sorted(os.listdir(fixture_dir)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(fixture_dir, name), 'r') as f:
+                fixture = json.load(f)
+            fixtures[fixture['url']] = fixture
+            fixtures.setdefault(fixture['url'].split('?', 1)[0], fixture)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("⚠️ Skipping fixture %s: %s", name, e)
+    return fixtures
+
+@contextlib.contextmanager
+def transport_override(adapter):
+    """Send every session and scraper through an adapter for the duration of the block"""
+    global _transport_override
+    close_http_sessions()
+    close_cloudscrapers()
+    clear_http_cache()
+    _transport_override = adapter
+    try:
+        yield adapter
+    finally:
+        _transport_override = None
+        close_http_sessions()
+        close_cloudscrapers()
+        clear_http_cache()
+
+def record_replay_fixtures(skin_names=None, fixture_dir=None):
+    """Check skins against the live sites once, saving every response for offline replays"""
+    skin_names = list(skin_names or skins[:BENCHMARK_SETTINGS['skin_count']])
+    with transport_override(FixtureRecordingAdapter(fixture_dir)):
+        for skin in skin_names:
+            get_reference_price(skin)
+            fetch_all_platform_listings(skin)
+    print(f"✅ Recorded fixtures for {len(skin_names)} skins in {fixture_dir or BENCHMARK_SETTINGS['fixture_dir']}")
+
+@contextlib.contextmanager
+def offline_benchmark_environment(adapter):
+    """Replay transport plus settings that keep a benchmark fast and side-effect free"""
+    overrides = [
+        (RATE_LIMIT_SETTINGS, 'enabled', False),
+        (REFERENCE_CACHE_SETTINGS, 'enabled', False),
+        (SCHEDULER_SETTINGS, 'enabled', False),
+        (MONITOR_SETTINGS, 'skin_delay_range', (0, 0)),
+        (OPPORTUNITY_STORE_SETTINGS, 'legacy_log', None),
+        (RUNTIME_STATE_SETTINGS, 'enabled', False)
+    ]
+    saved = [(settings, key, settings.get(key)) for settings, key, _ in overrides]
+    saved_store_path = OPPORTUNITY_STORE_SETTINGS['path']
+    saved_log_level = logger.level
+    if BENCHMARK_SETTINGS['quiet']:
+        logger.setLevel(logging.CRITICAL)
+    
+    # Fixture runs start from empty in-memory state and hand the real state back afterwards
+    isolated = [
+        (_source_health, _source_health_lock),
+        (_skin_schedule, _skin_schedule_lock),
+        (_price_history, _price_history_lock),
+        (_evicted_price_series, _price_history_lock),
+        (_metric_counters, _metrics_lock),
+        (_metric_histograms, _metrics_lock)
+    ]
+    saved_state = []
+    for container, lock in isolated:
+        with lock:
+            saved_state.append(container.copy())
+            container.clear()
+    
+    # Opportunities found against fixtures go to a throwaway store
+    close_opportunity_store()
+    temp_dir = tempfile.mkdtemp(prefix='arbitrage_bench_')
+    OPPORTUNITY_STORE_SETTINGS['path'] = os.path.join(temp_dir, 'opportunities.db')
+    for settings, key, value in overrides:
+        settings[key] = value
+    
+    try:
+        with transport_override(adapter):
+            yield adapter
+    finally:
+        close_opportunity_store()
+        OPPORTUNITY_STORE_SETTINGS['path'] = saved_store_path
+        logger.setLevel(saved_log_level)
+        for settings, key, value in saved:
+            settings[key] = value
+        invalidate_skinport_catalogue(drop=True)
+        for (container, lock), contents in zip(isolated, saved_state):
+            with lock:
+                container.clear()
+                if isinstance(container, list):
+                    container.extend(contents)
+                else:
+                    container.update(contents)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def _measure_call(func, *args, trace=False):
+    """Run one call, returning (seconds, peak allocated bytes or None, error or None)"""
+    output = open(os.devnull, 'w') if BENCHMARK_SETTINGS['quiet'] else None
+    if trace:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    
+    error = None
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+            func(*args)
+    except Exception as e:
+        error = e
+    elapsed = time.perf_counter() - start
+    
+    peak = tracemalloc.get_traced_memory()[1] - baseline if trace else None
+    if output:
+        output.close()
+    return elapsed, peak, error
+
+def run_offline_benchmark(skin_names=None, output_path=None, **adapter_options):
+    """Benchmark the fetchers, check_skin_arbitrage and a monitoring cycle against replayed responses"""
+    skin_names = list(skin_names or skins[:BENCHMARK_SETTINGS['skin_count']])
+    adapter = FixtureReplayAdapter(skin_names, **adapter_options)
+    
+    functions = [('get_reference_price', get_reference_price)]
+    functions.extend((func.__name__, func) for _, func in LISTING_PLATFORMS)
+    functions.append(('check_skin_arbitrage', check_skin_arbitrage))
+    
+    print("="*70)
+    print(f"⏱️ OFFLINE BENCHMARK - {len(skin_names)} skins, latency {adapter.latency}, error rate {adapter.error_rate:.0%}")
+    print("="*70)
+    
+    results = {'skins': len(skin_names), 'functions': {}, 'cycles': {}}
+    with offline_benchmark_environment(adapter):
+        for name, func in functions:
+            invalidate_skinport_catalogue(drop=True)
+            timings, peaks, errors = [], [], 0
+            for skin in skin_names:
+                elapsed, _, error = _measure_call(func, skin)
+                timings.append(elapsed)
+                errors += error is not None
+            
+            # Allocations are measured in a second pass so tracing doesn't skew the timings
+            invalidate_skinport_catalogue(drop=True)
+            tracemalloc.start()
+            try:
+                for skin in skin_names:
+                    peaks.append(_measure_call(func, skin, trace=True)[1])
+            finally:
+                tracemalloc.stop()
+            
+            results['functions'][name] = {
+                'calls': len(timings),
+                'mean_ms': sum(timings) / len(timings) * 1000,
+                'p95_ms': _percentile(timings, 95) * 1000,
+                'max_ms': max(timings) * 1000,
+                'peak_kb': max(peaks) / 1024,
+                'errors': errors
+            }
+        
+        for name, func in (('main cycle', run_monitor_cycle), ('async cycle', run_async_cycle)):
+            elapsed, _, error = _measure_call(func, skin_names)
+            tracemalloc.start()
+            try:
+                peak = _measure_call(func, skin_names, trace=True)[1]
+            finally:
+                tracemalloc.stop()
+            
+            results['cycles'][name] = {
+                'seconds': elapsed,
+                'skins_per_second': len(skin_names) / elapsed if elapsed else 0,
+                'peak_kb': peak / 1024,
+                'error': str(error) if error else None
+            }
+    
+    results['requests'] = dict(adapter.requests)
+    results['injected_errors'] = adapter.errors
+    
+    print(f"\n{'Function':<36} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9} {'peak KB':>9} {'errors':>7}")
+    for name, stats in results['functions'].items():
+        print(f"{name:<36} {stats['mean_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f} "
+              f"{stats['peak_kb']:>9.0f} {stats['errors']:>7}")
+    
+    print()
+    for name, stats in results['cycles'].items():
+        print(f"🔄 {name}: {stats['seconds']:.2f}s, {stats['skins_per_second']:.2f} skins/sec, peak {stats['peak_kb']:.0f} KB"
+              + (f" (❌ {stats['error']})" if stats['error'] else ""))
+    print(f"🌐 {sum(adapter.requests.values())} replayed requests, {adapter.errors} injected errors")
+    
+    if output_path:
+        with open(output_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {output_path}")
+    
+    return results
+
+STARTUP_BENCHMARK_SETTINGS = {
+    'repeat': 5,        # Fresh interpreters started per run
+    'top_imports': 10,  # Slowest imports listed in the report
+    'heavy_modules': ('requests', 'cloudscraper', 'bs4', 'numpy', 'lxml', 'selectolax')
+}
+
+def _parse_importtime(stderr):
+    """Cumulative microseconds of the bot module and its direct imports from -X importtime output"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # Nesting is shown as two spaces of indent per level after the separator
+        level = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        if level <= 1:
+            cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+def benchmark_startup_time(repeat=None, output_path=None):
+    """Time importing the bot in fresh interpreters and report which imports dominate"""
+    repeat = repeat or STARTUP_BENCHMARK_SETTINGS['repeat']
+    module_dir, module_file = os.path.split(os.path.abspath(__file__))
+    module = os.path.splitext(module_file)[0]
+    heavy = STARTUP_BENCHMARK_SETTINGS['heavy_modules']
+    code = f"import sys, {module}; print(','.join(name for name in {heavy!r} if name in sys.modules))"
+    
+    print("="*70)
+    print(f"⏱️ STARTUP BENCHMARK - importing {module} {repeat} times")
+    print("="*70)
+    
+    timings, imports, loaded = [], {}, []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                cwd=module_dir, capture_output=True, text=True)
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            print(f"❌ Import failed: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode}")
+            return None
+        
+        # Keep the fastest sample per import - the others are mostly scheduler noise
+        for name, micros in _parse_importtime(result.stderr).items():
+            imports[name] = min(micros, imports.get(name, micros))
+        loaded = [name for name in result.stdout.strip().split(',') if name]
+    
+    top = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:STARTUP_BENCHMARK_SETTINGS['top_imports']]
+    results = {
+        'runs': repeat,
+        'wall_ms': {
+            'min': min(timings) * 1000,
+            'median': _percentile(timings, 50) * 1000,
+            'max': max(timings) * 1000
+        },
+        'module_import_ms': imports.get(module, 0) / 1000,
+        'top_imports_ms': {name: micros / 1000 for name, micros in top},
+        'heavy_modules_loaded': loaded
+    }
+    
+    wall = results['wall_ms']
+    print(f"🕒 Interpreter start + import: min {wall['min']:.0f} ms, median {wall['median']:.0f} ms, max {wall['max']:.0f} ms")
+    print(f"📦 {module} import: {results['module_import_ms']:.1f} ms cumulative")
+    print(f"\n{'Import':<36} {'ms':>9}")
+    for name, ms in results['top_imports_ms'].items():
+        print(f"{name:<36} {ms:>9.1f}")
+    print(f"\n🧳 Heavy modules loaded at import: {', '.join(loaded) or 'none'}")
+    
+    if output_path:
+        with open(output_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {output_path}")
+    
+    return results
+
+# Never lose buffered opportunities on exit
+atexit.register(close_opportunity_store)
+
+# Command line entry point for headless runs
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'DEAL', 'ERROR', 'CRITICAL')
+
+def load_skins_file(path):
+    """Read skins from a JSON list or a text file with one skin per line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    
+    if text.lstrip().startswith('['):
+        names = [str(name) for name in json.loads(text)]
+    else:
+        names = [line for line in text.splitlines() if not line.lstrip().startswith('#')]
+    return [name.strip() for name in names if name.strip()]
+
+def write_output(records, output, stream=None):
+    """Write result records to a sink: '-' for JSON lines on stdout, or a .json, .csv or JSON-lines file"""
+    if not output:
+        return
+    
+    if output == '-':
+        stream = stream or sys.stdout
+        for record in records:
+            stream.write(json.dumps(record, default=str) + '\n')
+        stream.flush()
+        return
+    
+    if output.endswith('.json'):
+        with open(output, 'w') as f:
+            json.dump(records, f, indent=2, default=str)
+    elif output.endswith('.csv'):
+        fieldnames = list(dict.fromkeys(key for record in records for key in record))
+        with open(output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(records)
+    else:
+        # One write per batch keeps lines from parallel runs sharing the file intact
+        with open(output, 'a') as f:
+            f.write(''.join(json.dumps(record, default=str) + '\n' for record in records))
+    print(f"💾 {len(records)} records written to {output}")
+
+def _opportunities_since(start_time):
+    """Opportunities logged since start_time, newest first"""
+    return query_opportunities(since_hours=(time.time() - start_time) / 3600, limit=None)
+
+def _cli_run(args):
+    """run - monitor the skins continuously, or for --cycles cycles"""
+    start_time = time.time()
+    main(max_cycles=args.cycles, engine=args.engine, max_concurrency=args.concurrency)
+    
+    write_output(_opportunities_since(start_time), args.output, args.stream)
+    return 0
+
+def _cli_scan(args):
+    """scan - check the given skins once and report what was found"""
+    start_time = time.time()
+    if len(args.skins) == 1 or (args.concurrency or 0) == 1:
+        set_skinport_catalogue_skins(args.skins)
+        outcomes = {skin: check_skin_arbitrage(skin) for skin in args.skins}
+    else:
+        outcomes = run_async_cycle(args.skins, args.concurrency)
+    flush_opportunity_store()
+    
+    # Parallel scans share the store, so keep only this scan's skins
+    opportunities = [row for row in _opportunities_since(start_time) if row['skin'] in outcomes]
+    for skin, found in outcomes.items():
+        print(f"{'✅' if found else '❌'} {skin}")
+    
+    write_output(opportunities if opportunities else [
+        {'skin': skin, 'opportunities': 0} for skin in outcomes
+    ], args.output, args.stream)
+    return 0
+
+def _cli_bench(args):
+    """bench - offline replay benchmark, plus parser and startup benchmarks on request"""
+    # Replayed traffic must not end up in the warm-start state
+    RUNTIME_STATE_SETTINGS['enabled'] = False
+    skin_names = skins[:args.skins] if args.skins else None
+    results = {'offline': run_offline_benchmark(skin_names)}
+    if args.parsers:
+        results['parsers'] = benchmark_html_parsers(repeat=args.repeat)
+    if args.startup:
+        results['startup'] = benchmark_startup_time()
+    
+    write_output([results], args.output, args.stream)
+    return 0
+
+def _cli_status(args):
+    """status - check platform availability and the warm-start source health"""
+    results = check_platform_status()
+    display_source_health()
+    write_output(results, args.output, args.stream)
+    return 0 if any(result['status'] == 200 for result in results) else 1
+
+def _cli_export(args):
+    """export - dump logged opportunities"""
+    opportunities = query_opportunities(args.skin, args.platform, args.since_hours, args.limit)
+    print(f"📊 {len(opportunities)} opportunities")
+    write_output(opportunities, args.output or '-', args.stream)
+    return 0
+
+def build_arg_parser():
+    """Argument parser for the headless subcommands"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--concurrency', type=int, help='skins analysed at once and platform fetches per skin')
+    common.add_argument('--interval', type=float, help='seconds between monitoring cycles')
+    common.add_argument('--skins-file', help='skins to monitor: a JSON list or one name per line')
+    common.add_argument('--output', help="result sink: '-' for JSON lines on stdout, or a .json, .csv or .jsonl file")
+    common.add_argument('--log-level', choices=LOG_LEVELS, type=str.upper)
+    common.add_argument('--quiet', action='store_true', default=None, help='only log warnings and deal alerts')
+    
+    parser = argparse.ArgumentParser(description="CS:GO skin arbitrage bot")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run = commands.add_parser('run', parents=[common], help='monitor the skins')
+    run.add_argument('--cycles', type=int, help='stop after this many cycles (default: run until interrupted)')
+    run.add_argument('--engine', choices=('sync', 'async'),
+                     help='sync checks skins one at a time, async checks --concurrency at once '
+                          '(default: MONITOR_SETTINGS engine)')
+    run.set_defaults(handler=_cli_run)
+    
+    scan = commands.add_parser('scan', parents=[common], help='check skins once')
+    scan.add_argument('skins', nargs='+', help='skin market hash names')
+    scan.set_defaults(handler=_cli_scan)
+    
+    bench = commands.add_parser('bench', parents=[common], help='run the offline benchmarks')
+    bench.add_argument('--skins', type=int, help='monitored skins to benchmark')
+    bench.add_argument('--parsers', action='store_true', help='also benchmark the HTML parser backends')
+    bench.add_argument('--startup', action='store_true', help='also benchmark import and startup time')
+    bench.add_argument('--repeat', type=int, default=20, help='parser benchmark repetitions')
+    bench.set_defaults(handler=_cli_bench)
+    
+    status = commands.add_parser('status', parents=[common], help='check platform availability')
+    status.set_defaults(handler=_cli_status)
+    
+    export = commands.add_parser('export', parents=[common], help='export logged opportunities')
+    export.add_argument('--skin', help='only this skin')
+    export.add_argument('--platform', help='only this platform')
+    export.add_argument('--since-hours', type=float, help='only opportunities from the last N hours')
+    export.add_argument('--limit', type=int, default=1000, help='newest N opportunities (0 for all)')
+    export.set_defaults(handler=_cli_export)
+    
+    return parser
+
+CLI_SCRAPING_COMMANDS = ('run', 'scan', 'bench')  # Subcommands that need the scraping dependencies
+
+def run_cli(argv=None):
+    """Run one subcommand without prompting, returning the process exit code"""
+    global skins
+    args = build_arg_parser().parse_args(argv)
+    
+    # With JSON lines on stdout, human-readable output moves to stderr
+    args.stream = sys.stdout
+    redirect = contextlib.redirect_stdout(sys.stderr) if args.output == '-' or (
+        args.command == 'export' and not args.output) else contextlib.nullcontext()
+    
+    with redirect:
+        # status and export only read local data, so they start without the scrapers installed
+        if args.command in CLI_SCRAPING_COMMANDS and not check_dependencies():
+            return 1
+        load_config()
+        setup_logging(level=args.log_level, quiet=args.quiet)
+        
+        if args.skins_file:
+            skins = load_skins_file(args.skins_file)
+        if args.interval is not None:
+            MONITOR_SETTINGS['cycle_interval'] = args.interval
+        if args.concurrency:
+            ASYNC_ENGINE_SETTINGS['max_skin_concurrency'] = args.concurrency
+            CONCURRENCY_SETTINGS['max_workers'] = args.concurrency
+        
+        try:
+            return args.handler(args)
+        except KeyboardInterrupt:
+            print("\n👋 Goodbye!")
+            return 130
+
 if __name__ == "__main__":
+    # Subcommands run headless, without the startup menu
+    if len(sys.argv) > 1:
+        sys.exit(run_cli())
+    
     # Check dependencies first
     if not check_dependencies():
         exit(1)
     
     config = load_config()
+    setup_logging()
     startup_banner()
     
     try:
@@ -0,0 +1,39 @@
+import pytest
+
+import sleaacs2calculator_clean as bot
+
+OPTIONAL_BACKENDS = {'bs4': 'bs4', 'lxml': 'lxml', 'selectolax': 'selectolax.parser'}
+MODES = sorted(bot.HTML_NODE_LIMITS)
+
+
+def _expected(mode):
+    # The standard library parser is always installed
+    return bot.extract_html_nodes(bot._generate_html_fixture(mode, cards=40), mode, backend='stream')
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('backend', sorted(OPTIONAL_BACKENDS))
+def test_optional_backend_matches_stream_parser(backend, mode):
+    pytest.importorskip(OPTIONAL_BACKENDS[backend])
+    html = bot._generate_html_fixture(mode, cards=40)
+    
+    assert bot.extract_html_nodes(html, mode, backend=backend) == _expected(mode)
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_stream_parser_finds_every_node_up_to_the_limit(mode):
+    nodes = _expected(mode)
+    
+    assert len(nodes) == min(40, bot.HTML_NODE_LIMITS[mode])
+    assert all(nodes)
+
+
+def test_benchmark_compares_against_the_first_installed_backend(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(bot, 'available_html_parser_backends', lambda: ['stream'])
+    
+    results = bot.benchmark_html_parsers(fixture_dir=str(tmp_path), repeat=1)
+    output = capsys.readouterr().out
+    
+    assert 'same as stream' in output
+    assert 'bs4' not in output
+    assert all(result['stream']['baseline'] == 'stream' and result['stream']['matches'] for result in results.values())
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+import sleaacs2calculator_clean as bot
+
+DOCUMENT = json.dumps([
+    {'market_hash_name': '★ Karambit | Doppler (Factory New)', 'min_price': 1234.5, 'quantity': 3},
+    -4500.0,
+    12,
+    1.5e-07,
+    True,
+    None,
+    'Quote " and \\ backslash',
+    [1, [2, 3]],
+    {'nested': {'price': 0.03}}
+], ensure_ascii=False).encode('utf-8')
+
+
+def _split(data, *cuts):
+    bounds = (0,) + cuts + (len(data),)
+    return [data[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def test_every_two_chunk_split_yields_the_same_items():
+    expected = json.loads(DOCUMENT)
+    for cut in range(len(DOCUMENT) + 1):
+        assert list(bot.iter_json_array(_split(DOCUMENT, cut))) == expected, cut
+
+
+def test_every_three_chunk_split_yields_the_same_items():
+    expected = json.loads(DOCUMENT)
+    for first in range(len(DOCUMENT) + 1):
+        for second in range(first, len(DOCUMENT) + 1, 7):
+            assert list(bot.iter_json_array(_split(DOCUMENT, first, second))) == expected, (first, second)
+
+
+def test_single_byte_chunks():
+    chunks = [DOCUMENT[i:i + 1] for i in range(len(DOCUMENT))]
+    assert list(bot.iter_json_array(chunks)) == json.loads(DOCUMENT)
+
+
+def test_number_split_before_its_last_digit():
+    assert list(bot.iter_json_array([b'[-4500.', b'0]'])) == [-4500.0]
+    assert list(bot.iter_json_array([b'[1', b'2, 3', b'4]'])) == [12, 34]
+
+
+def test_object_response_goes_through_extract():
+    data = {'items': [{'market_hash_name': 'A'}]}
+    chunks = _split(json.dumps(data).encode(), 5)
+    assert list(bot.iter_json_array(chunks, extract=lambda d: d['items'])) == data['items']
+
+
+def test_truncated_array_raises():
+    with pytest.raises(ValueError):
+        list(bot.iter_json_array([b'[1, 2', b', 3']))
@@ -0,0 +1,48 @@
+import math
+
+import pytest
+
+import sleaacs2calculator_clean as bot
+
+
+@pytest.fixture
+def price_history(monkeypatch):
+    monkeypatch.setitem(bot.PRICE_HISTORY_SETTINGS, 'enabled', True)
+    monkeypatch.setitem(bot.PRICE_HISTORY_SETTINGS, 'initial_capacity', 16)
+    monkeypatch.setitem(bot.PRICE_HISTORY_SETTINGS, 'capacity', 512)
+    bot._price_history.clear()
+    yield bot._price_history
+    bot._price_history.clear()
+
+
+@pytest.mark.parametrize('numpy_installed', [True, False])
+def test_growing_a_full_buffer_keeps_order_and_count(price_history, monkeypatch, numpy_installed):
+    if not numpy_installed:
+        monkeypatch.setattr(bot, '_optional_module', lambda name: None)
+    
+    skin = 'AK-47 | Redline (Field-Tested)'
+    now = 1_700_000_000.0
+    for i in range(17):
+        bot.record_price_observation(skin, 'steam', 10.0 + i, timestamp=now + i)
+    
+    series = price_history[skin]['steam']
+    assert len(series['ts']) == 32
+    assert series['count'] == 17
+    assert series['next'] == 17
+    
+    rows = bot.get_price_history(skin, 'steam')
+    assert [ts for ts, _, _, _ in rows] == [now + i for i in range(17)]
+    assert [price for _, _, price, _ in rows] == [10.0 + i for i in range(17)]
+    assert not any(math.isnan(ts) for ts, _, _, _ in rows)
+
+
+def test_rolling_reference_price_survives_a_grow(price_history):
+    skin = 'AWP | Asiimov (Field-Tested)'
+    source = bot.REFERENCE_PRICE_SOURCES[0][0]
+    now = bot.time.time()
+    for i in range(17):
+        bot.record_price_observation(skin, source, 100.0 + i, timestamp=now - 17 + i)
+    
+    reference = bot.get_rolling_reference_price(skin)
+    assert reference['samples'] == 17
+    assert reference['price_usd'] == 108.0
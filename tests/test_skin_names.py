@@ -0,0 +1,33 @@
+import pytest
+
+import sleaacs2calculator_clean as bot
+
+FADE = '★ Butterfly Knife | Fade (Factory New)'
+MARBLE_FADE = '★ Butterfly Knife | Marble Fade (Factory New)'
+CATALOGUE = [{'market_hash_name': MARBLE_FADE}, {'market_hash_name': 'AK-47 | Redline (Field-Tested)'}]
+
+
+@pytest.mark.parametrize('fuzzy', [False, True])
+def test_full_name_never_matches_a_longer_skin(monkeypatch, fuzzy):
+    monkeypatch.setitem(bot.SKIN_MATCH_SETTINGS, 'fuzzy', fuzzy)
+    
+    assert bot.match_skin_name(bot.build_skin_name_index(CATALOGUE), FADE) == []
+    assert not bot.build_skin_name_filter([FADE])(CATALOGUE[0])
+
+
+def test_full_name_matches_exactly():
+    index = bot.build_skin_name_index(CATALOGUE + [{'market_hash_name': FADE}])
+    
+    assert bot.match_skin_name(index, FADE) == [{'market_hash_name': FADE}]
+    assert bot.match_skin_name(index, 'ak 47 redline field tested') == [CATALOGUE[1]]
+
+
+def test_partial_names_are_fuzzy_only_when_enabled(monkeypatch):
+    index = bot.build_skin_name_index(CATALOGUE)
+    
+    assert bot.match_skin_name(index, 'AK-47 | Redline') == []
+    assert not bot.build_skin_name_filter(['AK-47 | Redline'])(CATALOGUE[1])
+    
+    monkeypatch.setitem(bot.SKIN_MATCH_SETTINGS, 'fuzzy', True)
+    assert bot.match_skin_name(index, 'AK-47 | Redline') == [CATALOGUE[1]]
+    assert bot.build_skin_name_filter(['AK-47 | Redline'])(CATALOGUE[1])